@@ -1,9 +1,11 @@
 import { api } from './client'
-import type { OverloadEvent } from '@/lib/types'
+import type { OverloadEvent, OverloadStats } from '@/lib/types'
 
 interface HistoryResponse {
   data: OverloadEvent[]
   count: number
+  /** Pass back as `cursor` for the next (older) page; null on the last one. */
+  next_cursor: string | null
 }
 
 export const historyApi = {
@@ -12,13 +14,30 @@ export const historyApi = {
     vehicle_id?: string
     from_date?: string
     to_date?: string
+    cursor?: string
   }) => {
     const qs = new URLSearchParams()
     if (params?.limit) qs.set('limit', String(params.limit))
     if (params?.vehicle_id) qs.set('vehicle_id', params.vehicle_id)
     if (params?.from_date) qs.set('from_date', params.from_date)
     if (params?.to_date) qs.set('to_date', params.to_date)
+    if (params?.cursor) qs.set('cursor', params.cursor)
     const query = qs.toString()
     return api.get<HistoryResponse>(`/api/v1/history${query ? `?${query}` : ''}`)
   },
+
+  stats: (params?: {
+    vehicle_id?: string
+    days?: number
+    weeks?: number
+    months?: number
+  }) => {
+    const qs = new URLSearchParams()
+    if (params?.vehicle_id) qs.set('vehicle_id', params.vehicle_id)
+    if (params?.days) qs.set('days', String(params.days))
+    if (params?.weeks) qs.set('weeks', String(params.weeks))
+    if (params?.months) qs.set('months', String(params.months))
+    const query = qs.toString()
+    return api.get<OverloadStats>(`/api/v1/history/stats${query ? `?${query}` : ''}`)
+  },
 }
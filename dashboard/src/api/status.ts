@@ -1,6 +1,23 @@
 import { api } from './client'
-import type { SystemStatus } from '@/lib/types'
+import type { StatusDelta, SystemStatus } from '@/lib/types'
+
+/** Merge a stream `delta` event into the last known status. */
+export function applyStatusDelta(
+  status: SystemStatus,
+  delta: StatusDelta
+): SystemStatus {
+  const { vehicles: changed = [], removedVehicles = [], ...fields } = delta
+  const byId = new Map(changed.map((v) => [v.id, v]))
+  const vehicles = status.vehicles
+    .filter((v) => !removedVehicles.includes(v.id))
+    .map((v) => byId.get(v.id) ?? v)
+  for (const v of changed) {
+    if (!status.vehicles.some((old) => old.id === v.id)) vehicles.push(v)
+  }
+  return { ...status, ...fields, vehicles }
+}
 
 export const statusApi = {
   get: () => api.get<SystemStatus>('/api/v1/status'),
+  streamUrl: '/api/v1/status/stream',
 }
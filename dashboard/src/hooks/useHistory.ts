@@ -6,6 +6,7 @@ interface HistoryParams {
   vehicle_id?: string
   from_date?: string
   to_date?: string
+  cursor?: string
 }
 
 export function useHistory(params?: HistoryParams) {
@@ -14,3 +15,17 @@ export function useHistory(params?: HistoryParams) {
     queryFn: () => historyApi.get(params),
   })
 }
+
+interface HistoryStatsParams {
+  vehicle_id?: string
+  days?: number
+  weeks?: number
+  months?: number
+}
+
+export function useHistoryStats(params?: HistoryStatsParams) {
+  return useQuery({
+    queryKey: ['history', 'stats', params],
+    queryFn: () => historyApi.stats(params),
+  })
+}
@@ -1,11 +1,36 @@
-import { useQuery } from '@tanstack/react-query'
-import { statusApi } from '@/api/status'
+import { useEffect, useState } from 'react'
+import { useQuery, useQueryClient } from '@tanstack/react-query'
+import { applyStatusDelta, statusApi } from '@/api/status'
+import type { StatusDelta, SystemStatus } from '@/lib/types'
 
 export function useStatus() {
+  const qc = useQueryClient()
+  const [streaming, setStreaming] = useState(false)
+
+  // Pushed updates from the status stream land straight in the query cache;
+  // polling only takes over while the stream is down.
+  useEffect(() => {
+    const source = new EventSource(statusApi.streamUrl)
+    source.addEventListener('snapshot', (e) => {
+      qc.setQueryData(['status'], JSON.parse((e as MessageEvent).data))
+      setStreaming(true)
+    })
+    source.addEventListener('delta', (e) => {
+      const delta: StatusDelta = JSON.parse((e as MessageEvent).data)
+      qc.setQueryData<SystemStatus>(['status'], (old) =>
+        old ? applyStatusDelta(old, delta) : old
+      )
+    })
+    // EventSource reconnects by itself; the first event after that is a
+    // fresh snapshot.
+    source.onerror = () => setStreaming(false)
+    return () => source.close()
+  }, [qc])
+
   return useQuery({
     queryKey: ['status'],
     queryFn: statusApi.get,
-    refetchInterval: 10_000, // poll every 10s
+    refetchInterval: streaming ? false : 10_000, // poll every 10s without the stream
     retry: 2,
   })
 }
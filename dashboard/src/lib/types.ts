@@ -2,7 +2,7 @@
 // and the JSON returned by the FastAPI routes.
 
 export type Region = 'eu' | 'na' | 'ap'
-export type OverloadStrategyType = 'proportional' | 'priority'
+export type OverloadStrategyType = 'proportional' | 'priority' | 'closed_loop'
 
 /** HTTP Basic Auth config. `passwordHash` is redacted by the backend. */
 export interface AuthConfig {
@@ -21,6 +21,7 @@ export interface SystemConfig {
   downStepPercentage: number
   upStepPercentage: number
   overloadStrategy: OverloadStrategyType
+  targetHeadroomAmps: number
   maxSessionDuration: number
   hostIp: string
   apiPort: number
@@ -55,6 +56,10 @@ export interface VehicleStatus {
   // True whenever a background refresh is in flight, unlike `pending` which
   // only covers the very first fetch.
   refreshing: boolean
+  // Fleet API requests left in this vehicle's budget, per endpoint class.
+  apiBudget: Record<'data' | 'command' | 'wake', number>
+  // 'open' while the vehicle is unreachable and its requests are skipped.
+  circuitState: 'closed' | 'open' | 'half_open'
 }
 
 /** Overall system status — GET /api/v1/status. */
@@ -72,6 +77,24 @@ export interface SystemStatus {
   vehicles: VehicleStatus[]
 }
 
+/**
+ * A `delta` event on GET /api/v1/status/stream: changed top-level fields,
+ * added or changed vehicles in full, and the ids of removed vehicles.
+ */
+export type StatusDelta = Partial<SystemStatus> & {
+  removedVehicles?: string[]
+}
+
+/** Per-vehicle telemetry cache TTLs; see TelemetryPolicy in models.py. */
+export interface TelemetryPolicy {
+  chargingTtlSecs: number
+  idleTtlSecs: number
+  asleepTtlSecs: number
+  asleepMaxTtlSecs: number
+  asleepBackoffFactor: number
+  refreshAfterCommand: boolean
+}
+
 /** A managed vehicle — /api/v1/vehicles (tokens redacted in responses). */
 export interface Vehicle {
   id: string
@@ -87,6 +110,7 @@ export interface Vehicle {
   chargerMinAmps: number
   priority: number
   enabled: boolean
+  telemetryPolicy: TelemetryPolicy
 }
 
 /** A vehicle as returned by the Tesla Fleet API (via the proxy). */
@@ -105,4 +129,31 @@ export interface OverloadEvent {
   end: string
   duration: number | string
   vehicle_id: string
+  /** `start` / `end` as epoch seconds (`end_ts` is null until the event ends). */
+  start_ts: number
+  end_ts: number | null
+}
+
+/** Event count and durations (p50 / p95 to two significant figures). */
+export interface OverloadSummary {
+  events: number
+  total_duration_secs: number
+  p50_duration_secs: number | null
+  p95_duration_secs: number | null
+}
+
+/** One day (YYYY-MM-DD), week (its Monday) or month (YYYY-MM). */
+export interface OverloadBucket {
+  period: string
+  events: number
+  total_duration_secs: number
+}
+
+/** GET /api/v1/history/stats — series are oldest bucket first. */
+export interface OverloadStats {
+  totals: OverloadSummary
+  by_day: OverloadBucket[]
+  by_week: OverloadBucket[]
+  by_month: OverloadBucket[]
+  by_vehicle: (OverloadSummary & { vehicle_id: string })[]
 }
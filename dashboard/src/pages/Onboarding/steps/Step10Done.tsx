@@ -7,6 +7,7 @@ import { configApi } from '@/api/config'
 import { vehiclesApi } from '@/api/vehicles'
 import { authApi } from '@/api/auth'
 import { CheckCircle, Zap } from 'lucide-react'
+import type { OverloadStrategyType } from '@/lib/types'
 
 interface Props {
   state: WizardState
@@ -36,7 +37,7 @@ export function Step10Done({ state, back, finish }: Props) {
         energyMonitorType: state.energyMonitorType,
         sleepTimeSecs: state.sleepTimeSecs,
         downStepPercentage: state.downStepPercentage,
-        overloadStrategy: state.overloadStrategy as 'proportional' | 'priority',
+        overloadStrategy: state.overloadStrategy as OverloadStrategyType,
         maxSessionDuration: state.maxSessionDuration,
       })
 
@@ -18,6 +18,10 @@ const strategyOptions = [
     value: 'priority',
     label: 'Priority — reduce lowest-priority vehicle first',
   },
+  {
+    value: 'closed_loop',
+    label: 'Closed loop — continuously regulate to just under the limit',
+  },
 ]
 
 export function Step8CircuitStrategy({ state, update, next, back }: Props) {
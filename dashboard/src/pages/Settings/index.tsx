@@ -9,7 +9,7 @@ import { Alert } from '@/components/ui/Alert'
 import { Spinner } from '@/components/ui/Spinner'
 import { authApi } from '@/api/auth'
 import { Save, ShieldCheck, ShieldOff } from 'lucide-react'
-import type { SystemConfig } from '@/lib/types'
+import type { OverloadStrategyType, SystemConfig } from '@/lib/types'
 
 export default function SettingsPage() {
   const { data: config, isLoading } = useConfig()
@@ -149,6 +149,7 @@ function CircuitSection({ config }: { config: SystemConfig }) {
     downStepPercentage: config.downStepPercentage,
     upStepPercentage: config.upStepPercentage,
     overloadStrategy: config.overloadStrategy,
+    targetHeadroomAmps: config.targetHeadroomAmps,
     maxSessionDuration: config.maxSessionDuration,
   })
   const [saved, setSaved] = useState(false)
@@ -162,6 +163,7 @@ function CircuitSection({ config }: { config: SystemConfig }) {
   const strategyOpts = [
     { value: 'proportional', label: 'Proportional' },
     { value: 'priority', label: 'Priority' },
+    { value: 'closed_loop', label: 'Closed loop' },
   ]
 
   return (
@@ -182,7 +184,7 @@ function CircuitSection({ config }: { config: SystemConfig }) {
           onChange={(e) =>
             setForm((f) => ({
               ...f,
-              overloadStrategy: e.target.value as 'proportional' | 'priority',
+              overloadStrategy: e.target.value as OverloadStrategyType,
             }))
           }
           options={strategyOpts}
@@ -204,6 +206,16 @@ function CircuitSection({ config }: { config: SystemConfig }) {
           value={form.downStepPercentage}
           onChange={(e) => setForm((f) => ({ ...f, downStepPercentage: toNum(e.target.valueAsNumber, f.downStepPercentage) }))}
         />
+        <Input
+          label="Target headroom (A)"
+          info="Closed-loop strategy only: how far below the home max amps the controller regulates total consumption."
+          type="number"
+          step={0.5}
+          min={0}
+          max={10}
+          value={form.targetHeadroomAmps}
+          onChange={(e) => setForm((f) => ({ ...f, targetHeadroomAmps: toNum(e.target.valueAsNumber, f.targetHeadroomAmps) }))}
+        />
         <Input
           label="Max session duration (seconds)"
           info="Maximum time a supervised overload session can run before ending. Prevents the car from staying stuck at a reduced limit if overload persists."
@@ -20,9 +20,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from tesla_smart_charger import constants, logger, security, utils
+from tesla_smart_charger import (
+    constants,
+    http_pool,
+    logger,
+    security,
+    timeseries,
+    utils,
+)
 from tesla_smart_charger.app_config import AppConfig
-from tesla_smart_charger.controllers import db_controller
+from tesla_smart_charger.controllers import db_controller, sqlite_pool
 from tesla_smart_charger.cron import em_cron, token_cron
 from tesla_smart_charger.handlers import overload_handler
 from tesla_smart_charger.models import VehicleConfig
@@ -30,6 +37,9 @@ from tesla_smart_charger.routes import (
     auth_routes,
     command_routes,
     config_routes,
+    consumption_routes,
+    energy_routes,
+    fleet_telemetry_routes,
     history_routes,
     status_routes,
     vehicle_routes,
@@ -78,6 +88,8 @@ def _init_db(db_type: str) -> None:
         ctrl = db_controller.create_database_controller(
             db_type, constants.DB_NAME, constants.DB_FILE_PATH
         )
+        # First open in the process: runs any pending schema migrations
+        # (controllers/sqlite_migrations.py) before the monitor or API start.
         ctrl.initialize_db()
         ctrl.close_connection()
         tsm_logger.info("Database initialised (%s).", db_type)
@@ -96,14 +108,23 @@ async def lifespan(_application: FastAPI) -> AsyncIterator[None]:
     """Start background cron threads on startup and join them on shutdown."""
     tsm_logger.info("Tesla Smart Charger starting up.")
     _start_thread(token_cron.start_cron_token, "tsc_token_cron_thread", app_config)
+    _start_thread(
+        timeseries.start_writer, "tsc_timeseries_thread", constants.DB_FILE_PATH
+    )
     yield
     tsm_logger.info("Tesla Smart Charger shutting down.")
     stop_event.set()
-    for tname in ("tsc_energy_monitor_thread", "tsc_token_cron_thread"):
+    for tname in (
+        "tsc_energy_monitor_thread",
+        "tsc_token_cron_thread",
+        "tsc_timeseries_thread",
+    ):
         t = _get_thread(tname)
         if t:
             t.join(timeout=10)
             tsm_logger.info("%s stopped.", tname)
+    await http_pool.aclose_all()
+    sqlite_pool.close_all()
     await asyncio.sleep(1)
 
 
@@ -129,6 +150,8 @@ config_routes.init(app_config)
 vehicle_routes.init(app_config)
 command_routes.init(app_config)
 auth_routes.init(app_config)
+energy_routes.init(app_config)
+fleet_telemetry_routes.init(app_config)
 status_routes.init(app_config, _monitor_active, overload_handler.is_session_active)
 
 app.include_router(status_routes.router)
@@ -137,6 +160,9 @@ app.include_router(vehicle_routes.router)
 app.include_router(command_routes.router)
 app.include_router(auth_routes.router)
 app.include_router(history_routes.router)
+app.include_router(energy_routes.router)
+app.include_router(fleet_telemetry_routes.router)
+app.include_router(consumption_routes.router)
 
 # ─── Legacy endpoints (kept for backward compatibility) ───────────────────────
 
@@ -37,6 +37,16 @@ class AppConfig:
         self._system: SystemConfig | None = None
         self._vehicles: list[VehicleConfig] = []
 
+    @classmethod
+    def in_memory(
+        cls, system: SystemConfig, vehicles: list[VehicleConfig]
+    ) -> "AppConfig":
+        """Return an already-loaded config that is never read from disk."""
+        config = cls()
+        config._system = system
+        config._vehicles = list(vehicles)
+        return config
+
     # ─── Properties ───────────────────────────────────────────────────────────
 
     @property
@@ -0,0 +1,244 @@
+"""
+Tesla Fleet API client for asyncio code — per-vehicle instance.
+
+Mirrors `TeslaAPI` method for method, but awaits ``httpx2`` instead of blocking
+on ``requests``.  ``async def`` route handlers use it so that a few slow or
+asleep cars (20 s timeouts, several retries) park coroutines on the event loop
+rather than occupying Starlette's small threadpool — which would otherwise stall
+unrelated sync endpoints such as ``GET /api/v1/status``.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import httpx2
+from fastapi import HTTPException
+
+from tesla_smart_charger import (
+    constants,
+    fleet_budget,
+    http_pool,
+    logger,
+    retry_policy,
+    timeseries,
+)
+from tesla_smart_charger.tesla_api import (
+    BaseTeslaClient,
+    VehicleData,
+    parse_vehicle_data,
+)
+
+tsc_logger = logger.get_logger()
+
+_T = TypeVar("_T")
+
+
+class AsyncTeslaAPI(BaseTeslaClient):
+    """
+    Asyncio Tesla Fleet API client for a single vehicle.
+
+    Routing, credentials and error mapping are shared with `TeslaAPI` via
+    `BaseTeslaClient`; connections come from the per-event-loop pool in
+    `http_pool`.
+    """
+
+    def _client(self, url: str, *, mtls: bool = False) -> httpx2.AsyncClient:
+        """Return the pooled async client for *url*'s host (see `TeslaAPI._session`)."""
+        return http_pool.get_async_client(url, self._tls() if mtls else None)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        label: str,
+        *,
+        mtls: bool = False,
+        timeout: float = 20,
+        **kwargs: object,
+    ) -> dict:
+        """Send one request and return its decoded JSON body."""
+        try:
+            r = await self._client(url, mtls=mtls).request(
+                method, url, timeout=timeout, **kwargs
+            )
+            r.raise_for_status()
+            self._reachable()
+            response = r.json()
+        except (httpx2.HTTPError, ValueError) as exc:
+            self._raise(exc, label)
+        if constants.VERBOSE:
+            tsc_logger.debug(response)
+        return response
+
+    async def _retrying(
+        self,
+        call: Callable[[float], Awaitable[_T]],
+        timeout: float,
+        deadline_secs: float | None,
+        *,
+        wake: bool = False,
+    ) -> _T:
+        """Await *call* with retries and a deadline — see `TeslaAPI._retrying`."""
+        deadline = self._deadline(deadline_secs)
+        attempt = 1
+        while True:
+            remaining = deadline - self._clock.time()
+            try:
+                return await call(max(min(timeout, remaining), 1.0))
+            except HTTPException as exc:
+                delay = retry_policy.next_delay(exc, attempt)
+                if delay is None or self._clock.time() + delay >= deadline:
+                    raise
+                if wake and exc.status_code == 408:
+                    try:
+                        await self.wake_up()
+                    except HTTPException as wake_exc:
+                        tsc_logger.debug(
+                            "Wake before retry failed: %s", wake_exc.detail
+                        )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ─── API methods ───────────────────────────────────────────────────────────
+
+    async def get_vehicles(self, *, deadline_secs: float | None = None) -> list:
+        """Return the list of Tesla vehicles linked to this OAuth token."""
+        return await self._retrying(self._get_vehicles, 20, deadline_secs)
+
+    async def _get_vehicles(self, timeout: float) -> list:
+        tsc_logger.info("Requesting vehicle list from Tesla API.")
+        self._spend(fleet_budget.DATA, wait=False)
+        url = f"{self._fleet_api_url}{constants.TESLA_API_VEHICLES_URL}"
+        response = await self._request(
+            "GET", url, "get_vehicles", timeout=timeout, headers=self._headers()
+        )
+        return response.get("response", [])
+
+    async def get_vehicle_data(
+        self,
+        *,
+        location: bool = False,
+        deadline_secs: float | None = None,
+        wake: bool = False,
+    ) -> VehicleData:
+        """Return state and charging telemetry — see `TeslaAPI.get_vehicle_data`."""
+        return await self._retrying(
+            lambda timeout: self._get_vehicle_data(timeout, location=location),
+            20,
+            deadline_secs,
+            wake=wake,
+        )
+
+    async def _get_vehicle_data(self, timeout: float, *, location: bool) -> VehicleData:
+        vehicle_id = self._data_vehicle_id()
+        tsc_logger.info("Requesting data for vehicle %s.", vehicle_id)
+        self._spend(fleet_budget.DATA, wait=False)
+        url = (
+            f"{self._proxy}{constants.TESLA_API_VEHICLE_DATA_URL.format(id=vehicle_id)}"
+        )
+        response = await self._request(
+            "GET",
+            url,
+            "get_vehicle_data",
+            mtls=True,
+            timeout=timeout,
+            params=self._vehicle_data_params(location=location),
+            headers=self._headers(),
+        )
+        return parse_vehicle_data(response.get("response", {}))
+
+    async def set_charge_amp_limit(
+        self, amp_limit: int, *, deadline_secs: float | None = None
+    ) -> dict:
+        """Command this vehicle to set its charging amp limit."""
+        return await self._retrying(
+            lambda timeout: self._set_charge_amp_limit(amp_limit, timeout),
+            10,
+            deadline_secs,
+        )
+
+    async def _set_charge_amp_limit(self, amp_limit: int, timeout: float) -> dict:
+        vehicle_id = self.vehicle.vin or self.vehicle.teslaVehicleId
+        tsc_logger.info(
+            "Setting charge limit → %sA for vehicle %s.", amp_limit, vehicle_id
+        )
+        path = constants.TESLA_API_CHARGE_AMP_LIMIT_URL.format(id=vehicle_id)
+        self._spend(fleet_budget.COMMAND, wait=False)
+        response = await self._request(
+            "POST",
+            f"{self._proxy}{path}",
+            "set_charge_amp_limit",
+            mtls=True,
+            timeout=timeout,
+            headers=self._headers(),
+            json={"charging_amps": amp_limit},
+        )
+        timeseries.record_setpoint(self.vehicle.id, amp_limit, self._clock)
+        return response
+
+    async def _send_command(self, command: str, payload: dict) -> dict:
+        """Send a signed vehicle command through the proxy (not retried)."""
+        vehicle_id = self._command_vehicle_id()
+        tsc_logger.info("Sending command %s to vehicle %s.", command, vehicle_id)
+        path = constants.TESLA_API_COMMAND_URL.format(id=vehicle_id, command=command)
+        self._spend(fleet_budget.COMMAND, wait=False)
+        response = await self._request(
+            "POST",
+            f"{self._proxy}{path}",
+            command,
+            mtls=True,
+            timeout=10,
+            headers=self._headers(),
+            json=payload,
+        )
+        self._raise_on_rejection(response, command)
+        return response
+
+    async def set_charge_limit(self, percent: int) -> dict:
+        """Command this vehicle to set its target state of charge."""
+        return await self._send_command("set_charge_limit", {"percent": percent})
+
+    async def wake_up(self) -> dict:
+        """Ask Tesla to wake this vehicle — see `TeslaAPI.wake_up`."""
+        vehicle_id = self._data_vehicle_id()
+        tsc_logger.info("Waking vehicle %s.", vehicle_id)
+        path = constants.TESLA_API_WAKE_UP_URL.format(id=vehicle_id)
+        self._spend(fleet_budget.WAKE, wait=False)
+        response = await self._request(
+            "POST",
+            f"{self._fleet_api_url}{path}",
+            "wake_up",
+            timeout=15,
+            headers=self._headers(),
+        )
+        return response.get("response", {})
+
+    async def start_charge(self) -> dict:
+        """Command this vehicle to start charging. Requires VIN."""
+        self._require_vin()
+        return await self._send_command("charge_start", {})
+
+    async def stop_charge(self) -> dict:
+        """Command this vehicle to stop charging. Requires VIN."""
+        self._require_vin()
+        return await self._send_command("charge_stop", {})
+
+    async def refresh_token(self, region: str = "eu") -> tuple[str, str] | None:
+        """
+        Exchange the vehicle's refresh_token for a new access/refresh token pair.
+
+        Returns ``(access_token, refresh_token)`` on success, ``None`` on failure.
+        """
+        try:
+            body = await self._request(
+                "POST",
+                constants.TESLA_API_TOKEN_URL,
+                "refresh_token",
+                data=self._token_request(region),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+        except HTTPException:
+            tsc_logger.exception("Token refresh failed for vehicle %s", self.vehicle.id)
+            return None
+        return self._store_tokens(body)
@@ -0,0 +1,134 @@
+"""
+Per-vehicle circuit breaker around Tesla Fleet API calls.
+
+A car whose proxy or Fleet endpoint is down costs every caller a full timeout
+and a round of retries — time the overload loop should spend on the cars that
+answer.  `CircuitBreakers` tracks each vehicle's recent outcomes:
+
+* ``CLOSED`` — requests flow.  ``CIRCUIT_FAILURE_THRESHOLD`` consecutive
+  server or transport failures (5xx, including the 502 that `_raise` maps
+  connection errors to) open the circuit.  Any other answer — even a 4xx —
+  means the car's endpoint is reachable and resets the count.
+* ``OPEN`` — requests fail instantly with `CircuitOpenError` for
+  ``CIRCUIT_OPEN_SECS``.
+* ``HALF_OPEN`` — the cool-down is over and a single trial request is let
+  through; its outcome closes the circuit or opens it for another cool-down.
+  Should the trial never report back, another is allowed after the same wait.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+
+from tesla_smart_charger import constants, logger
+from tesla_smart_charger.clock import Clock, system_clock
+from tesla_smart_charger.models import CircuitState
+
+tsc_logger = logger.get_logger()
+
+
+class CircuitOpenError(HTTPException):
+    """A request was refused locally because its vehicle's circuit is open."""
+
+    def __init__(self, vehicle_id: str, retry_after: float) -> None:
+        """Build the 503 for *vehicle_id*'s open circuit."""
+        super().__init__(
+            status_code=503,
+            detail=(
+                f"Vehicle {vehicle_id} is unreachable; "
+                f"next attempt in {retry_after:.0f}s"
+            ),
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+@dataclass
+class _Circuit:
+    state: CircuitState = CircuitState.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0  # when it opened, or when the current trial began
+
+
+class CircuitBreakers:
+    """Thread-safe circuit state keyed by vehicle id."""
+
+    def __init__(
+        self,
+        failure_threshold: int | None = None,
+        open_secs: float | None = None,
+        clock: Clock = system_clock,
+    ) -> None:
+        """Create closed circuits lazily (thresholds default to the constants)."""
+        self._failure_threshold = (
+            constants.CIRCUIT_FAILURE_THRESHOLD
+            if failure_threshold is None
+            else failure_threshold
+        )
+        self._open_secs = (
+            constants.CIRCUIT_OPEN_SECS if open_secs is None else open_secs
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: dict[str, _Circuit] = {}
+
+    def allow(self, vehicle_id: str) -> None:
+        """Let one request to *vehicle_id* through, or raise `CircuitOpenError`."""
+        with self._lock:
+            circuit = self._circuits.get(vehicle_id)
+            if circuit is None or circuit.state == CircuitState.CLOSED:
+                return
+            now = self._clock.time()
+            wait = circuit.opened_at + self._open_secs - now
+            if wait > 0:
+                raise CircuitOpenError(vehicle_id, wait)
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.opened_at = now
+        tsc_logger.info("Circuit for vehicle %s half-open; trying once.", vehicle_id)
+
+    def record_success(self, vehicle_id: str) -> None:
+        """Note that *vehicle_id*'s endpoint answered."""
+        with self._lock:
+            circuit = self._circuits.get(vehicle_id)
+            if circuit is None:
+                return
+            recovered = circuit.state != CircuitState.CLOSED
+            del self._circuits[vehicle_id]
+        if recovered:
+            tsc_logger.info("Circuit for vehicle %s closed.", vehicle_id)
+
+    def record_failure(self, vehicle_id: str) -> None:
+        """Note a server or transport failure for *vehicle_id*."""
+        with self._lock:
+            circuit = self._circuits.setdefault(vehicle_id, _Circuit())
+            circuit.failures += 1
+            if (
+                circuit.state == CircuitState.CLOSED
+                and circuit.failures < self._failure_threshold
+            ):
+                return
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = self._clock.time()
+            failures = circuit.failures
+        tsc_logger.warning(
+            "Circuit for vehicle %s open after %d failures; skipping it for %.0fs.",
+            vehicle_id,
+            failures,
+            self._open_secs,
+        )
+
+    def state(self, vehicle_id: str) -> CircuitState:
+        """Return *vehicle_id*'s current circuit state."""
+        with self._lock:
+            circuit = self._circuits.get(vehicle_id)
+            return CircuitState.CLOSED if circuit is None else circuit.state
+
+    def reset(self) -> None:
+        """Close every circuit — used between tests."""
+        with self._lock:
+            self._circuits.clear()
+
+
+# Process-wide breakers shared by every Tesla client.
+breakers = CircuitBreakers()
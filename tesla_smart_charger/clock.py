@@ -0,0 +1,44 @@
+"""
+Time source for code that sleeps between iterations.
+
+The overload engine and the energy bus read time and sleep through a `Clock`
+instead of calling the ``time`` module directly, so a session can be driven
+by a virtual clock — the simulator runs a fifteen-minute session in
+milliseconds, and tests need neither real sleeps nor patched globals.
+Production code uses `system_clock`.
+"""
+
+import time
+from typing import Protocol
+
+
+class Clock(Protocol):
+    """Wall-clock time and sleeping."""
+
+    def time(self) -> float:
+        """Return the current epoch time in seconds."""
+        ...
+
+    def sleep(self, secs: float) -> None:
+        """Wait *secs* seconds."""
+        ...
+
+
+class SystemClock:
+    """`Clock` backed by the ``time`` module."""
+
+    def time(self) -> float:
+        """Return `time.time()`."""
+        return time.time()
+
+    def sleep(self, secs: float) -> None:
+        """Block for *secs* seconds with `time.sleep`."""
+        time.sleep(secs)
+
+
+system_clock = SystemClock()
+
+
+def format_timestamp(epoch: float) -> str:
+    """Format *epoch* as local ``YYYY-MM-DD HH:MM:SS``, as stored for events."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(epoch))
@@ -20,6 +20,32 @@ REQUEST_DELAY_MS = 3000
 # Maximum number of queries to the Tesla API during overload handling session
 MAX_QUERIES = 5
 
+# Vehicle data for every enabled car is fetched in parallel during overload
+# handling.  Worker count bounds the fan-out (1 = sequential); the deadline is
+# how long a single control iteration waits before acting on whatever arrived.
+VEHICLE_FETCH_MAX_WORKERS = 4
+VEHICLE_FETCH_DEADLINE_SECS = 25.0
+
+# Background telemetry refreshes (telemetry_cache.py) run on this many shared
+# worker threads, however many vehicles are configured.
+TELEMETRY_REFRESH_WORKERS = 4
+
+# A vehicle streaming Fleet Telemetry (fleet_telemetry.py) is read from its
+# stream instead of polled while its last record is at most this old.
+FLEET_TELEMETRY_STALE_SECS = 30.0
+
+# GET /api/v1/status/stream (status_stream.py): the status is rebuilt on every
+# energy reading and at least this often; idle streams get a keepalive comment
+# this often; a client this many events behind is resynced with a snapshot.
+STATUS_STREAM_TICK_SECS = 2.0
+STATUS_STREAM_KEEPALIVE_SECS = 15.0
+STATUS_STREAM_QUEUE_SIZE = 32
+
+# An acknowledged amp setpoint is not re-sent for this long: the car is still
+# ramping towards it.  After that the same value may be sent again, in case
+# the driver changed the limit in the Tesla app meanwhile.
+AMP_COMMAND_HOLD_SECS = 90.0
+
 # ─── Config files ──────────────────────────────────────────────────────────────
 
 # New structured config directory.
@@ -62,6 +88,32 @@ TESLA_API_COMMAND_URL = "/api/1/vehicles/{id}/command/{command}"
 # API with a Bearer token, so it keeps working when the proxy is unavailable.
 TESLA_API_WAKE_UP_URL = "/api/1/vehicles/{id}/wake_up"
 
+# Per-vehicle Fleet API quotas, enforced locally by fleet_budget.py so we run
+# out of budget before Tesla answers 429: endpoint class → (requests, per secs).
+FLEET_BUDGETS: dict[str, tuple[int, float]] = {
+    "data": (60, 60.0),
+    "command": (30, 60.0),
+    "wake": (3, 60.0),
+}
+# How long an overload request may queue for budget before it is rejected.
+FLEET_BUDGET_MAX_WAIT_SECS = 5.0
+
+# Default overall deadline for a Tesla API call, retries included.  Callers
+# with a tighter loop (the overload session) pass their own.
+TESLA_API_DEADLINE_SECS = 45.0
+
+# Per-vehicle circuit breaker (circuit_breaker.py): this many consecutive
+# server or transport failures open a vehicle's circuit; its requests then
+# fail instantly for CIRCUIT_OPEN_SECS, after which one trial request decides
+# whether it closes again.
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("TESLA_CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_OPEN_SECS = float(os.getenv("TESLA_CIRCUIT_OPEN_SECS", "60"))
+
+# Keep-alive session pool for outbound Tesla calls (see http_pool.py).  One
+# pool per proxy / Fleet API host; idle sessions are closed after the timeout.
+HTTP_POOL_MAXSIZE = int(os.getenv("TESLA_HTTP_POOL_MAXSIZE", "10"))
+HTTP_POOL_IDLE_SECS = float(os.getenv("TESLA_HTTP_POOL_IDLE_SECS", "300"))
+
 # Accepted charge-limit range (Tesla reports charge_limit_soc_min = 50 on all
 # current vehicles).
 TESLA_CHARGE_LIMIT_MIN = 50
@@ -76,6 +128,16 @@ TESLA_OAUTH_SCOPES = (
 
 SUPPORTED_EM_TYPES = ["shelly_em"]
 
+# Readings kept by the shared energy bus (one hour at the default 15 s rate).
+ENERGY_BUS_CAPACITY = 240
+
+# In-memory consumption history served by /api/v1/consumption: 24 h at 1 s,
+# with a per-emeter breakdown for up to two channels (Shelly EM).
+CONSUMPTION_HISTORY_CAPACITY = 24 * 60 * 60
+CONSUMPTION_HISTORY_CHANNELS = 2
+# Upper bound on buckets per response; coarser resolutions are used beyond it.
+CONSUMPTION_MAX_BUCKETS = 2000
+
 EM_CONTROLLER_STATE_IDLE = "IDLE"
 EM_CONTROLLER_STATE_OVERLOAD = "OVERLOAD"
 EM_CONTROLLER_STATE_UNDERLOAD = "UNDERLOAD"
@@ -85,6 +147,23 @@ EM_CONTROLLER_STATE_UNDERLOAD = "UNDERLOAD"
 DB_NAME = "tesla_smart_charger"
 DB_FILE_PATH = "tesla_smart_charger.db"
 DB_TYPE = "sqlite"
+# Connections to the history database are opened once per process and shared
+# (controllers/sqlite_pool.py): one writer plus up to this many readers.
+DB_READER_POOL_SIZE = 3
+# Rows rewritten per transaction by data-backfill migrations
+# (controllers/sqlite_migrations.py), so the write lock is released often.
+DB_MIGRATION_BATCH_SIZE = 500
+# GET /api/v1/history/export reads this many rows per query, then releases
+# its reader connection until the client has taken them.
+DB_EXPORT_BATCH_SIZE = 500
+
+# Time-series store (consumption and amp setpoints), kept in the same file.
+TIMESERIES_FLUSH_SECS = 5.0
+TIMESERIES_ROLLUP_SECS = 60.0
+TIMESERIES_MAX_PENDING = 10_000
+TIMESERIES_RAW_RETENTION_SECS = 2 * 24 * 60 * 60  # 2 days
+TIMESERIES_1M_RETENTION_SECS = 30 * 24 * 60 * 60  # 30 days
+TIMESERIES_15M_RETENTION_SECS = 5 * 365 * 24 * 60 * 60  # 5 years
 DB_HOST = "localhost"
 DB_PORT = "5432"
 
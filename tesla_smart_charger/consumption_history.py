@@ -0,0 +1,174 @@
+"""
+In-memory consumption history behind ``GET /api/v1/consumption``.
+
+A fixed-size ring of (timestamp, total watts, watts per emeter) samples held
+in flat ``array('d')`` columns — 24 h at 1 s resolution costs a few MB and no
+per-sample Python objects.  Every reading published on the energy bus lands
+here; readings within the same second overwrite each other, so the capacity
+always spans at least ``capacity`` seconds however fast a device pushes.
+
+`buckets` downsamples a window server-side into min / max / mean buckets, so
+the dashboard can draw load curves without keeping raw samples itself.
+"""
+
+import math
+import threading
+from array import array
+from collections.abc import Sequence
+
+from tesla_smart_charger import constants
+
+_NAN = float("nan")
+
+
+class ConsumptionHistory:
+    """Thread-safe, array-backed ring buffer of consumption samples."""
+
+    def __init__(
+        self,
+        capacity: int = constants.CONSUMPTION_HISTORY_CAPACITY,
+        channels: int = constants.CONSUMPTION_HISTORY_CHANNELS,
+    ) -> None:
+        """Preallocate room for *capacity* samples of *channels* emeters each."""
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._channels = channels
+        self._ts = array("d", [_NAN]) * capacity
+        self._total = array("d", [_NAN]) * capacity
+        # Row-major: sample i's emeters live at [i * channels, (i + 1) * channels).
+        self._emeters = array("d", [_NAN]) * (capacity * channels)
+        self._next = 0  # slot the next sample is written to
+        self._size = 0
+
+    @property
+    def channels(self) -> int:
+        """Number of per-emeter columns kept for each sample."""
+        return self._channels
+
+    def __len__(self) -> int:
+        """Return the number of samples currently held."""
+        with self._lock:
+            return self._size
+
+    def append(self, timestamp: float, watts: float, emeters: Sequence[float]) -> None:
+        """
+        Record one reading.
+
+        *emeters* beyond the configured channel count are dropped from the
+        breakdown (the total still includes them); missing ones are stored as
+        NaN and skipped by `buckets`.
+        """
+        with self._lock:
+            last = (self._next - 1) % self._capacity
+            if self._size and int(self._ts[last]) == int(timestamp):
+                slot = last  # same second — keep only the latest reading
+            else:
+                slot = self._next
+                self._next = (self._next + 1) % self._capacity
+                self._size = min(self._size + 1, self._capacity)
+            self._ts[slot] = timestamp
+            self._total[slot] = watts
+            base = slot * self._channels
+            for channel in range(self._channels):
+                self._emeters[base + channel] = (
+                    emeters[channel] if channel < len(emeters) else _NAN
+                )
+
+    def clear(self) -> None:
+        """Forget every sample — used between tests."""
+        with self._lock:
+            self._next = 0
+            self._size = 0
+
+    def _slot(self, index: int) -> int:
+        """Map a logical index (0 = oldest held) to its array slot."""
+        return (self._next - self._size + index) % self._capacity
+
+    def _first_after(self, since: float) -> int:
+        """Logical index of the first sample newer than *since* (binary search)."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[self._slot(mid)] <= since:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _copy_since(self, since: float) -> tuple[array, array, array]:
+        """Copy the samples newer than *since*, oldest first.  Hold ``_lock``."""
+        index = self._first_after(since)
+        first = self._slot(index)
+        stop = first + self._size - index
+        channels = self._channels
+
+        def _take(column: array, width: int) -> array:
+            # Two C-level slices when the window wraps round the ring.
+            if stop <= self._capacity:
+                return column[first * width : stop * width]
+            wrapped = (stop - self._capacity) * width
+            return column[first * width :] + column[:wrapped]
+
+        return _take(self._ts, 1), _take(self._total, 1), _take(self._emeters, channels)
+
+    def buckets(self, since: float, resolution: float) -> list[dict]:
+        """
+        Downsample the samples newer than *since* into *resolution*-second buckets.
+
+        Buckets are aligned to multiples of *resolution* and only non-empty
+        ones are returned, oldest first.  Each carries the min / max / mean
+        total watts, the sample count and the mean watts per emeter (``None``
+        for a channel with no readings).
+
+        The window is copied under the lock and aggregated after releasing
+        it, so `append` — on the overload-detection path — never waits for
+        a dashboard query to walk a day of samples.
+        """
+        with self._lock:
+            timestamps, totals, emeters = self._copy_since(since)
+        channels = self._channels
+        out: list[dict] = []
+        current: dict | None = None
+        sums: list[float] = []
+        counts: list[int] = []
+        for index, (ts, watts) in enumerate(zip(timestamps, totals, strict=True)):
+            start = math.floor(ts / resolution) * resolution
+            if current is None or current["timestamp"] != start:
+                if current is not None:
+                    out.append(_finish(current, sums, counts))
+                current = {
+                    "timestamp": start,
+                    "count": 0,
+                    "sum": 0.0,
+                    "min": watts,
+                    "max": watts,
+                }
+                sums = [0.0] * channels
+                counts = [0] * channels
+            current["count"] += 1
+            current["sum"] += watts
+            current["min"] = min(current["min"], watts)
+            current["max"] = max(current["max"], watts)
+            base = index * channels
+            for channel in range(channels):
+                value = emeters[base + channel]
+                if not math.isnan(value):
+                    sums[channel] += value
+                    counts[channel] += 1
+        if current is not None:
+            out.append(_finish(current, sums, counts))
+        return out
+
+
+def _finish(bucket: dict, sums: list[float], counts: list[int]) -> dict:
+    """Turn a bucket's running sums into means."""
+    bucket["mean"] = bucket.pop("sum") / bucket["count"]
+    bucket["emeters"] = [
+        total / count if count else None
+        for total, count in zip(sums, counts, strict=True)
+    ]
+    return bucket
+
+
+# Process-wide history fed by the energy bus.
+history = ConsumptionHistory()
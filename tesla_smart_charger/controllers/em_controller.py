@@ -27,6 +27,15 @@ class EnergyMonitorController(ABC):
     def get_consumption(self) -> float:
         """Return the current consumption of the house."""
 
+    def get_emeter_powers(self) -> tuple[float, ...]:
+        """
+        Read the device and return the power of each of its emeters.
+
+        The house consumption is their sum.  Devices without a per-channel
+        breakdown report a single channel — the default.
+        """
+        return (self.get_consumption(),)
+
 
 """Energy Monitor Controller Factory."""
 
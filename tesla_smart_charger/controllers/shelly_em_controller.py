@@ -83,3 +83,17 @@ class ShellyEMController(EnergyMonitorController):
         self.consumption = self.emeter0 + self.emeter1
 
         return self.consumption
+
+    def get_emeter_powers(self) -> tuple[float, ...]:
+        """
+        Get the power of each of the Shelly EM's two meters.
+
+        Returns:
+            tuple[float, ...]: The readings in watts, emeter 0 first.
+
+        Raises:
+            ValueError: If there is an error retrieving the consumption data.
+
+        """
+        self.get_consumption()
+        return (self.emeter0, self.emeter1)
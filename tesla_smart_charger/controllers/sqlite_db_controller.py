@@ -2,16 +2,81 @@
 SQLite DB Controller.
 
 Stores and retrieves overload event records.
-Supports schema migration to add the vehicle_id column introduced in v2.
+
+Controllers are cheap to create: they share the process-wide connections of
+`sqlite_pool`, and the schema is migrated (see `sqlite_migrations`) only when
+a database file is first opened, not per controller.
+
+Every row also carries its start and end as integer epoch seconds
+(``start_ts`` / ``end_ts``), written alongside the text columns.  History
+queries filter and sort on those, over the ``(vehicle_id, start_ts)`` and
+``(start_ts)`` indexes, and page with a keyset cursor rather than an offset,
+so a page deep into a long history costs the same as the first one.
+
+`get_stats` never reads the events at all: it answers from the summary
+tables that ``sqlite_migrations`` keeps current with triggers.
 """
 
+import math
 import sqlite3
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from itertools import accumulate
 
-from tesla_smart_charger import logger
+from tesla_smart_charger import constants, logger
+from tesla_smart_charger.controllers import sqlite_migrations, sqlite_pool
 from tesla_smart_charger.controllers.db_controller import DatabaseController
 
 tsc_logger = logger.get_logger()
 
+_EPOCH = sqlite_migrations.EPOCH_SQL
+
+_HISTORY_COLUMNS = "id, start, end, duration, vehicle_id, start_ts, end_ts"
+
+
+def encode_cursor(start_ts: int, event_id: int) -> str:
+    """Return the cursor of the page that follows the row (*start_ts*, *id*)."""
+    return f"{start_ts}:{event_id}"
+
+
+def _percentile(histogram: Counter[int], q: float) -> int | None:
+    # Nearest-rank percentile over a {duration: events} histogram.
+    total = sum(histogram.values())
+    if total == 0:
+        return None
+    rank = max(1, math.ceil(q * total))
+    durations = sorted(histogram)
+    # rank <= total, the last running count, so bisect always lands in range.
+    running = list(accumulate(histogram[duration] for duration in durations))
+    return durations[bisect_left(running, rank)]
+
+
+def _summary(events: int, total_secs: int, histogram: Counter[int]) -> dict:
+    return {
+        "events": events,
+        "total_duration_secs": total_secs,
+        "p50_duration_secs": _percentile(histogram, 0.5),
+        "p95_duration_secs": _percentile(histogram, 0.95),
+    }
+
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """Split a cursor from `encode_cursor`; raise ValueError if malformed."""
+    start_ts, sep, event_id = cursor.partition(":")
+    if not sep:
+        msg = f"Invalid history cursor: {cursor!r}"
+        raise ValueError(msg)
+    parts = int(start_ts), int(event_id)
+    # sqlite3 raises OverflowError binding anything outside a signed 64-bit int.
+    if not all(_INT64_MIN <= part <= _INT64_MAX for part in parts):
+        msg = f"Invalid history cursor: {cursor!r}"
+        raise ValueError(msg)
+    return parts
+
 
 class SqliteDatabaseController(DatabaseController):
     """SQLite-backed implementation of DatabaseController."""
@@ -21,56 +86,22 @@ class SqliteDatabaseController(DatabaseController):
         self.type = "sqlite"
         self.file_path = file_path
         self.database = database
-        self.connection = None
-        self.cursor = None
+        self.pool: sqlite_pool.SqlitePool | None = None
 
     def initialize_db(self) -> None:
-        """Open the database and create / migrate the schema."""
-        if self.connection is not None:
+        """Attach to the file's shared connections, opening them on first use."""
+        if self.pool is not None:
             tsc_logger.warning("Database connection already initialised.")
             return
         try:
-            self.connection = sqlite3.connect(self.file_path)
-            self.connection.row_factory = sqlite3.Row  # named-column access
-            self.cursor = self.connection.cursor()
-            tsc_logger.debug("Connected to SQLite: %s", self.file_path)
-
-            # Create table if it does not exist (original schema)
-            self.cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS overloads (
-                    id        INTEGER PRIMARY KEY AUTOINCREMENT,
-                    start     TEXT NOT NULL,
-                    end       TEXT,
-                    duration  INTEGER,
-                    vehicle_id TEXT DEFAULT ''
-                )
-                """
-            )
-            self.connection.commit()
-
-            # Migrate: add vehicle_id column if missing (databases created before v2)
-            existing_cols = {
-                row[1] for row in self.cursor.execute("PRAGMA table_info(overloads)")
-            }
-            if "vehicle_id" not in existing_cols:
-                tsc_logger.info("Migrating overloads table: adding vehicle_id column.")
-                self.cursor.execute(
-                    "ALTER TABLE overloads ADD COLUMN vehicle_id TEXT DEFAULT ''"
-                )
-                self.connection.commit()
-
+            self.pool = sqlite_pool.get(self.file_path, setup=sqlite_migrations.migrate)
         except sqlite3.Error:
             tsc_logger.exception("SQLite init error")
             raise
 
     def close_connection(self) -> None:
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            self.cursor = None
-            tsc_logger.debug("SQLite connection closed.")
+        """Detach from the shared connections, which stay open for reuse."""
+        self.pool = None
 
     def insert_data(self, data: dict) -> None:
         """
@@ -79,20 +110,25 @@ class SqliteDatabaseController(DatabaseController):
         Expected keys: start, end, duration, vehicle_id (optional).
         """
         try:
-            self._ensure_open()
-            self.cursor.execute(
-                """
-                INSERT INTO overloads (start, end, duration, vehicle_id)
-                VALUES (:start, :end, :duration, :vehicle_id)
-                """,
-                {
-                    "start": data.get("start", ""),
-                    "end": data.get("end", ""),
-                    "duration": data.get("duration", 0),
-                    "vehicle_id": data.get("vehicle_id", ""),
-                },
-            )
-            self.connection.commit()
+            with self._ensure_open().writer() as connection:
+                connection.execute(
+                    """
+                    INSERT INTO overloads
+                        (start, end, duration, vehicle_id, start_ts, end_ts)
+                    VALUES (
+                        :start, :end, :duration, :vehicle_id,
+                        COALESCE({start_ts}, 0), {end_ts}
+                    )
+                    """.format(  # noqa: S608
+                        start_ts=_EPOCH.format(":start"), end_ts=_EPOCH.format(":end")
+                    ),
+                    {
+                        "start": data.get("start", ""),
+                        "end": data.get("end", ""),
+                        "duration": data.get("duration", 0),
+                        "vehicle_id": data.get("vehicle_id", ""),
+                    },
+                )
             tsc_logger.info("Overload event inserted.")
         except sqlite3.Error:
             tsc_logger.exception("SQLite insert error")
@@ -101,17 +137,16 @@ class SqliteDatabaseController(DatabaseController):
     def get_data(self, num_records: int = 10) -> list:
         """Return the most recent *num_records* overload events as dicts."""
         try:
-            self._ensure_open()
-            self.cursor.execute(
-                """
-                SELECT id, start, end, duration, vehicle_id
-                FROM overloads
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (num_records,),
-            )
-            rows = self.cursor.fetchall()
+            with self._ensure_open().reader() as connection:
+                rows = connection.execute(
+                    """
+                    SELECT id, start, end, duration, vehicle_id
+                    FROM overloads
+                    ORDER BY id DESC
+                    LIMIT ?
+                    """,
+                    (num_records,),
+                ).fetchall()
             return [dict(row) for row in rows]
         except sqlite3.Error:
             tsc_logger.exception("SQLite query error")
@@ -124,8 +159,20 @@ class SqliteDatabaseController(DatabaseController):
         from_date: str = "",
         to_date: str = "",
     ) -> list:
+        """Return the first page of `get_page`, without its cursor."""
+        rows, _next_cursor = self.get_page(num_records, vehicle_id, from_date, to_date)
+        return rows
+
+    def get_page(
+        self,
+        num_records: int = 100,
+        vehicle_id: str = "",
+        from_date: str = "",
+        to_date: str = "",
+        cursor: str = "",
+    ) -> tuple[list, str | None]:
         """
-        Return filtered overload events.
+        Return one page of filtered overload events, newest first.
 
         Parameters
         ----------
@@ -134,54 +181,186 @@ class SqliteDatabaseController(DatabaseController):
         vehicle_id : str
             If non-empty, filter to this vehicle only.
         from_date : str
-            Inclusive lower bound (``YYYY-MM-DD HH:MM:SS``).
+            Inclusive lower bound on the start (``YYYY-MM-DD[ HH:MM:SS]``).
         to_date : str
-            Inclusive upper bound (``YYYY-MM-DD HH:MM:SS``).
+            Inclusive upper bound on the start (``YYYY-MM-DD[ HH:MM:SS]``).
+        cursor : str
+            ``next_cursor`` of the previous page; empty for the first page.
+
+        Returns
+        -------
+        tuple[list, str | None]
+            The rows, and the cursor of the next page (None on the last one).
+
+        Raises
+        ------
+        ValueError
+            If *cursor* was not produced by this method.
 
         """
+        conditions = []
+        params: list = []
+
+        if vehicle_id:
+            conditions.append("vehicle_id = ?")
+            params.append(vehicle_id)
+        if from_date:
+            conditions.append(f"start_ts >= {_EPOCH.format('?')}")
+            params.append(from_date)
+        if to_date:
+            conditions.append(f"start_ts <= {_EPOCH.format('?')}")
+            params.append(to_date)
+        if cursor:
+            # Rows strictly after the previous page's last one, in
+            # (start_ts, id) order — an index seek, however deep the page.
+            conditions.append("(start_ts, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        # `where` is built only from the fixed condition strings above
+        # (never from user input); all actual values are bound via the
+        # `?` placeholders in `params`, so this isn't a SQL-injection risk.
+        # It also means at most sixteen distinct statements, each of which
+        # stays in the connection's prepared-statement cache.
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # One extra row tells whether another page follows.
+        params.append(num_records + 1)
+
         try:
-            self._ensure_open()
-            conditions = []
-            params: list = []
-
-            if vehicle_id:
-                conditions.append("vehicle_id = ?")
-                params.append(vehicle_id)
-            if from_date:
-                conditions.append("start >= ?")
-                params.append(from_date)
-            if to_date:
-                conditions.append("start <= ?")
-                params.append(to_date)
-
-            # `where` is built only from the fixed condition strings above
-            # (never from user input); all actual values are bound via the
-            # `?` placeholders in `params`, so this isn't a SQL-injection risk.
-            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-            params.append(num_records)
-
-            self.cursor.execute(
-                f"""
-                SELECT id, start, end, duration, vehicle_id
-                FROM overloads
-                {where}
-                ORDER BY id DESC
-                LIMIT ?
-                """,  # noqa: S608
-                params,
-            )
-            rows = self.cursor.fetchall()
-            return [dict(row) for row in rows]
+            with self._ensure_open().reader() as connection:
+                rows = connection.execute(
+                    f"""
+                    SELECT {_HISTORY_COLUMNS}
+                    FROM overloads
+                    {where}
+                    ORDER BY start_ts DESC, id DESC
+                    LIMIT ?
+                    """,  # noqa: S608
+                    params,
+                ).fetchall()
         except sqlite3.Error:
             tsc_logger.exception("SQLite filtered query error")
             raise
 
+        page = [dict(row) for row in rows[:num_records]]
+        if len(rows) <= num_records or not page:
+            return page, None
+        last = page[-1]
+        return page, encode_cursor(last["start_ts"], last["id"])
+
+    def iter_pages(
+        self,
+        vehicle_id: str = "",
+        from_date: str = "",
+        to_date: str = "",
+        batch_size: int = constants.DB_EXPORT_BATCH_SIZE,
+    ) -> Iterator[list]:
+        """
+        Yield every filtered overload event, newest first, a page at a time.
+
+        Each page is one `get_page` query, so at most *batch_size* rows are in
+        memory and no reader connection is held between pages, however long
+        the consumer takes over each.  Rows inserted meanwhile are included
+        only if they sort after the page being read.
+        """
+        cursor = ""
+        while True:
+            rows, next_cursor = self.get_page(
+                batch_size, vehicle_id, from_date, to_date, cursor
+            )
+            if rows:
+                yield rows
+            if next_cursor is None:
+                return
+            cursor = next_cursor
+
+    def get_stats(
+        self, vehicle_id: str = "", days: int = 30, weeks: int = 12, months: int = 12
+    ) -> dict:
+        """
+        Return overload counts and durations, overall and per vehicle.
+
+        Parameters
+        ----------
+        vehicle_id : str
+            If non-empty, summarise this vehicle only.
+        days, weeks, months : int
+            How many of the most recent day / week / month buckets to return.
+
+        Returns
+        -------
+        dict
+            ``totals`` and ``by_vehicle`` (events, total seconds, p50 / p95
+            duration to two significant figures) plus the ``by_day``,
+            ``by_week`` and ``by_month`` series, oldest bucket first.
+
+        """
+        vehicle_filter = "AND vehicle_id = :vehicle_id" if vehicle_id else ""
+        params = {"vehicle_id": vehicle_id}
+        try:
+            with self._ensure_open().reader() as connection:
+                series = {
+                    f"by_{period}": self._stats_series(
+                        connection, period, limit, vehicle_filter, params
+                    )
+                    for period, limit in (
+                        ("day", days),
+                        ("week", weeks),
+                        ("month", months),
+                    )
+                }
+                vehicles = connection.execute(
+                    f"""
+                    SELECT vehicle_id, events, total_secs
+                    FROM overload_stats
+                    WHERE period = 'all' AND bucket = '' AND events > 0
+                    {vehicle_filter}
+                    ORDER BY vehicle_id
+                    """,  # noqa: S608
+                    params,
+                ).fetchall()
+                durations = connection.execute(
+                    f"""
+                    SELECT vehicle_id, duration_secs, events
+                    FROM overload_durations
+                    WHERE events > 0 {vehicle_filter}
+                    """,  # noqa: S608
+                    params,
+                ).fetchall()
+        except sqlite3.Error:
+            tsc_logger.exception("SQLite stats query error")
+            raise
+
+        histograms: dict[str, Counter[int]] = {}
+        for row in durations:
+            histograms.setdefault(row["vehicle_id"], Counter())[
+                row["duration_secs"]
+            ] = row["events"]
+        by_vehicle = [
+            {
+                "vehicle_id": row["vehicle_id"],
+                **_summary(
+                    row["events"],
+                    row["total_secs"],
+                    histograms.get(row["vehicle_id"], Counter()),
+                ),
+            }
+            for row in vehicles
+        ]
+        return {
+            "totals": _summary(
+                sum(row["events"] for row in vehicles),
+                sum(row["total_secs"] for row in vehicles),
+                sum(histograms.values(), Counter()),
+            ),
+            **series,
+            "by_vehicle": by_vehicle,
+        }
+
     def delete_data(self) -> None:
         """Delete all overload records."""
         try:
-            self._ensure_open()
-            self.cursor.execute("DELETE FROM overloads")
-            self.connection.commit()
+            with self._ensure_open().writer() as connection:
+                connection.execute("DELETE FROM overloads")
             tsc_logger.info("All overload records deleted.")
         except sqlite3.Error:
             tsc_logger.exception("SQLite delete error")
@@ -190,22 +369,53 @@ class SqliteDatabaseController(DatabaseController):
     def update_data(self, data: dict) -> None:
         """Update the end/duration of an existing record by id."""
         try:
-            self._ensure_open()
-            self.cursor.execute(
-                """
-                UPDATE overloads
-                SET end = :end, duration = :duration
-                WHERE id = :id
-                """,
-                data,
-            )
-            self.connection.commit()
+            with self._ensure_open().writer() as connection:
+                connection.execute(
+                    """
+                    UPDATE overloads
+                    SET end = :end, duration = :duration, end_ts = {end_ts}
+                    WHERE id = :id
+                    """.format(end_ts=_EPOCH.format(":end")),  # noqa: S608
+                    data,
+                )
         except sqlite3.Error:
             tsc_logger.exception("SQLite update error")
             raise
 
     # ─── Internal helpers ──────────────────────────────────────────────────────
 
-    def _ensure_open(self) -> None:
-        if self.connection is None or self.cursor is None:
+    @staticmethod
+    def _stats_series(
+        connection: sqlite3.Connection,
+        period: str,
+        limit: int,
+        vehicle_filter: str,
+        params: dict,
+    ) -> list[dict]:
+        # Walks the (period, bucket, vehicle_id) primary key newest first and
+        # stops after *limit* buckets.
+        rows = connection.execute(
+            f"""
+            SELECT bucket, SUM(events) AS events, SUM(total_secs) AS total_secs
+            FROM overload_stats
+            WHERE period = :period {vehicle_filter}
+            GROUP BY bucket
+            HAVING SUM(events) > 0
+            ORDER BY bucket DESC
+            LIMIT :limit
+            """,  # noqa: S608
+            {**params, "period": period, "limit": limit},
+        ).fetchall()
+        return [
+            {
+                "period": row["bucket"],
+                "events": row["events"],
+                "total_duration_secs": row["total_secs"],
+            }
+            for row in reversed(rows)
+        ]
+
+    def _ensure_open(self) -> sqlite_pool.SqlitePool:
+        if self.pool is None:
             self.initialize_db()
+        return self.pool
@@ -0,0 +1,354 @@
+"""
+Versioned schema migrations for the overload history database.
+
+``schema_version`` holds the number of the last step applied; `migrate` runs
+every later step of `MIGRATIONS` in order and records each as it completes.
+It runs once per process, when `sqlite_pool` first opens the file — at boot,
+from ``__main__._init_db``.
+
+A step is either a schema change, recorded as soon as it has been applied,
+or a data backfill.  A backfill walks the table by id, at most
+``DB_MIGRATION_BATCH_SIZE`` rows per transaction, so upgrading a large history
+never holds the write lock for long; an interrupted one simply runs again, as
+it only rewrites rows still in the old form.  Databases from before this
+module have no ``schema_version`` and start at 0, so every step must also
+accept a schema it has already been applied to.
+"""
+
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from tesla_smart_charger import constants, logger
+
+tsc_logger = logger.get_logger()
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One numbered schema change or batched data backfill."""
+
+    version: int
+    description: str
+    # Schema change: must tolerate a schema it was already applied to.
+    apply: Callable[[sqlite3.Connection], None] | None = None
+    # Backfill: called with the last id done (0 at first) and a batch size;
+    # converts the next batch and returns its last id, or None when done.
+    backfill: Callable[[sqlite3.Connection, int, int], int | None] | None = None
+
+
+def _create_overloads(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS overloads (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            start     TEXT NOT NULL,
+            end       TEXT,
+            duration  INTEGER,
+            vehicle_id TEXT DEFAULT ''
+        )
+        """
+    )
+
+
+def _add_vehicle_id(connection: sqlite3.Connection) -> None:
+    # Tables created before v2 lack the column; newer ones already have it.
+    existing_cols = {
+        row[1] for row in connection.execute("PRAGMA table_info(overloads)")
+    }
+    if "vehicle_id" not in existing_cols:
+        connection.execute(
+            "ALTER TABLE overloads ADD COLUMN vehicle_id TEXT DEFAULT ''"
+        )
+
+
+def _duration_to_seconds(
+    connection: sqlite3.Connection, after_id: int, batch_size: int
+) -> int | None:
+    # Durations used to be saved as text such as "90.0"; the column's INTEGER
+    # affinity stored most as integers, but fractions stayed REAL and anything
+    # unparsable stayed TEXT.  CAST turns the latter into 0, as the writer
+    # itself falls back to.
+    (last_id,) = connection.execute(
+        "SELECT MAX(id) FROM "
+        "(SELECT id FROM overloads WHERE id > ? ORDER BY id LIMIT ?)",
+        (after_id, batch_size),
+    ).fetchone()
+    if last_id is None:
+        return None
+    connection.execute(
+        """
+        UPDATE overloads
+        SET duration = CAST(ROUND(CAST(duration AS REAL)) AS INTEGER)
+        WHERE id > ? AND id <= ?
+          AND duration IS NOT NULL AND typeof(duration) != 'integer'
+        """,
+        (after_id, last_id),
+    )
+    return last_id
+
+
+def _add_epoch_columns(connection: sqlite3.Connection) -> None:
+    existing_cols = {
+        row[1] for row in connection.execute("PRAGMA table_info(overloads)")
+    }
+    for column in ("start_ts", "end_ts"):
+        if column not in existing_cols:
+            connection.execute(f"ALTER TABLE overloads ADD COLUMN {column} INTEGER")
+
+
+# ``start`` / ``end`` hold local time, as `clock.format_timestamp` writes it;
+# the 'utc' modifier converts from local time, as time.mktime does.  Text that
+# is not a timestamp (an unfinished event's empty ``end``) becomes NULL.
+EPOCH_SQL = "CAST(strftime('%s', {}, 'utc') AS INTEGER)"
+
+
+def _backfill_epochs(
+    connection: sqlite3.Connection, after_id: int, batch_size: int
+) -> int | None:
+    (last_id,) = connection.execute(
+        "SELECT MAX(id) FROM "
+        "(SELECT id FROM overloads WHERE id > ? ORDER BY id LIMIT ?)",
+        (after_id, batch_size),
+    ).fetchone()
+    if last_id is None:
+        return None
+    connection.execute(
+        f"""
+        UPDATE overloads
+        SET start_ts = COALESCE({EPOCH_SQL.format("start")}, 0),
+            end_ts = {EPOCH_SQL.format("end")}
+        WHERE id > ? AND id <= ? AND start_ts IS NULL
+        """,  # noqa: S608
+        (after_id, last_id),
+    )
+    return last_id
+
+
+def _index_epochs(connection: sqlite3.Connection) -> None:
+    # GET /api/v1/history filters by vehicle and start date, newest first.
+    # Every index also orders by rowid, so (vehicle_id, start_ts) serves
+    # "WHERE vehicle_id = ? ORDER BY start_ts DESC, id DESC" without a sort.
+    # Databases that ran v3 before it became a no-op have text-start indexes.
+    connection.execute("DROP INDEX IF EXISTS idx_overloads_vehicle_start")
+    connection.execute("DROP INDEX IF EXISTS idx_overloads_start")
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_overloads_vehicle_start_ts "
+        "ON overloads (vehicle_id, start_ts)"
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_overloads_start_ts ON overloads (start_ts)"
+    )
+
+
+# ─── History summaries ────────────────────────────────────────────────────────
+#
+# GET /api/v1/history/stats reads two summary tables instead of the events:
+#
+#   overload_stats      events and total seconds per (period, bucket, vehicle),
+#                       period being day / week (its Monday) / month, plus one
+#                       "all" row per vehicle;
+#   overload_durations  how many finished events per vehicle had each duration,
+#                       rounded down to two significant figures — a bounded
+#                       histogram the p50 / p95 are read from.
+#
+# Triggers on overloads keep both current on every insert, update and delete,
+# so their size depends on the calendar and the number of vehicles, never on
+# the number of events.  Buckets are local dates of start_ts, matching the
+# local ``start`` text the dashboard shows.
+
+STATS_PERIODS: dict[str, str] = {
+    "day": "date({ts}, 'unixepoch', 'localtime')",
+    "week": "date({ts}, 'unixepoch', 'localtime', 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m', {ts}, 'unixepoch', 'localtime')",
+    "all": "''",
+}
+
+_DURATION_BUCKET = """
+    CASE
+        WHEN {d} < 100 THEN {d}
+        WHEN {d} < 1000 THEN {d} / 10 * 10
+        WHEN {d} < 10000 THEN {d} / 100 * 100
+        WHEN {d} < 100000 THEN {d} / 1000 * 1000
+        ELSE {d} / 10000 * 10000
+    END
+"""
+
+
+def _duration_bucket(duration: str) -> str:
+    return _DURATION_BUCKET.format(d=f"CAST(MAX({duration}, 0) AS INTEGER)")
+
+
+def _stats_upserts(row: str, events: str, total: str, *, grouped: bool) -> list[str]:
+    # One upsert per summary table and period.  *row* prefixes the overloads
+    # columns ("NEW." / "OLD." in triggers, "" in the backfill); *events* and
+    # *total* are the amounts added — aggregates when *grouped*.
+    vehicle = f"COALESCE({row}vehicle_id, '')"
+    duration = f"{row}duration"
+    # An upsert's SELECT needs a WHERE clause, or SQLite reads ON as a join.
+    source, group = "WHERE true", ""
+    statements = []
+    for period, bucket_sql in STATS_PERIODS.items():
+        bucket = bucket_sql.format(ts=f"{row}start_ts")
+        if grouped:
+            source = "FROM overloads WHERE id > :after AND id <= :last"
+            group = "GROUP BY 2, 3"
+        statements.append(
+            f"""
+            INSERT INTO overload_stats (period, bucket, vehicle_id, events, total_secs)
+            SELECT '{period}', {bucket}, {vehicle}, {events}, {total}
+            {source} {group}
+            ON CONFLICT (period, bucket, vehicle_id) DO UPDATE SET
+                events = events + excluded.events,
+                total_secs = total_secs + excluded.total_secs
+            """
+        )
+    finished = f"{duration} IS NOT NULL"
+    if grouped:
+        source = f"FROM overloads WHERE id > :after AND id <= :last AND {finished}"
+        group = "GROUP BY 1, 2"
+    else:
+        source, group = f"WHERE {finished}", ""
+    statements.append(
+        f"""
+        INSERT INTO overload_durations (vehicle_id, duration_secs, events)
+        SELECT {vehicle}, {_duration_bucket(duration)}, {events}
+        {source} {group}
+        ON CONFLICT (vehicle_id, duration_secs) DO UPDATE SET
+            events = events + excluded.events
+        """
+    )
+    return statements
+
+
+def _create_stats_tables(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS overload_stats (
+            period     TEXT NOT NULL,
+            bucket     TEXT NOT NULL,
+            vehicle_id TEXT NOT NULL,
+            events     INTEGER NOT NULL,
+            total_secs INTEGER NOT NULL,
+            PRIMARY KEY (period, bucket, vehicle_id)
+        ) WITHOUT ROWID
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS overload_durations (
+            vehicle_id    TEXT NOT NULL,
+            duration_secs INTEGER NOT NULL,
+            events        INTEGER NOT NULL,
+            PRIMARY KEY (vehicle_id, duration_secs)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _backfill_stats(
+    connection: sqlite3.Connection, after_id: int, batch_size: int
+) -> int | None:
+    # Additive, so a backfill that was interrupted starts over from empty
+    # tables rather than counting its first batches twice.
+    if after_id == 0:
+        connection.execute("DELETE FROM overload_stats")
+        connection.execute("DELETE FROM overload_durations")
+    (last_id,) = connection.execute(
+        "SELECT MAX(id) FROM "
+        "(SELECT id FROM overloads WHERE id > ? ORDER BY id LIMIT ?)",
+        (after_id, batch_size),
+    ).fetchone()
+    if last_id is None:
+        return None
+    for statement in _stats_upserts(
+        "", "COUNT(*)", "SUM(COALESCE(duration, 0))", grouped=True
+    ):
+        connection.execute(statement, {"after": after_id, "last": last_id})
+    return last_id
+
+
+def _stats_trigger_body(row: str, sign: str) -> str:
+    total = f"{sign}COALESCE({row}duration, 0)"
+    return ";".join(_stats_upserts(row, f"{sign}1", total, grouped=False)) + ";"
+
+
+def _create_stats_triggers(connection: sqlite3.Connection) -> None:
+    # Emptied buckets keep a zero row; readers skip those.
+    connection.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS overloads_stats_insert
+        AFTER INSERT ON overloads
+        BEGIN {_stats_trigger_body("NEW.", "")} END
+        """
+    )
+    connection.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS overloads_stats_update
+        AFTER UPDATE OF start_ts, duration, vehicle_id ON overloads
+        BEGIN
+            {_stats_trigger_body("OLD.", "-")}
+            {_stats_trigger_body("NEW.", "")}
+        END
+        """
+    )
+    connection.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS overloads_stats_delete
+        AFTER DELETE ON overloads
+        BEGIN {_stats_trigger_body("OLD.", "-")} END
+        """
+    )
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "create overloads table", apply=_create_overloads),
+    Migration(2, "add overloads.vehicle_id", apply=_add_vehicle_id),
+    # Used to index the text start column; v7 builds the final indexes.
+    Migration(3, "index overloads by vehicle and start (superseded by v7)"),
+    Migration(4, "store durations as integer seconds", backfill=_duration_to_seconds),
+    Migration(5, "add epoch start_ts / end_ts columns", apply=_add_epoch_columns),
+    Migration(6, "fill start_ts / end_ts from start / end", backfill=_backfill_epochs),
+    Migration(7, "index history filters by start_ts", apply=_index_epochs),
+    Migration(8, "add history summary tables", apply=_create_stats_tables),
+    Migration(9, "summarise existing history", backfill=_backfill_stats),
+    Migration(10, "keep history summaries current", apply=_create_stats_triggers),
+)
+
+
+def current_version(connection: sqlite3.Connection) -> int:
+    """Return the last applied step, creating ``schema_version`` if missing."""
+    with connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"
+        )
+        row = connection.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(
+    connection: sqlite3.Connection,
+    migrations: tuple[Migration, ...] = MIGRATIONS,
+    batch_size: int = constants.DB_MIGRATION_BATCH_SIZE,
+) -> int:
+    """Apply every step newer than the database's version; return the new one."""
+    version = current_version(connection)
+    for step in migrations:
+        if step.version <= version:
+            continue
+        tsc_logger.info(
+            "Migrating database to v%d: %s.", step.version, step.description
+        )
+        position: int | None = 0
+        while step.backfill is not None and position is not None:
+            with connection:
+                position = step.backfill(connection, position, batch_size)
+        with connection:
+            if step.apply is not None:
+                step.apply(connection)
+            connection.execute("DELETE FROM schema_version")
+            connection.execute(
+                "INSERT INTO schema_version (version) VALUES (?)", (step.version,)
+            )
+        version = step.version
+    return version
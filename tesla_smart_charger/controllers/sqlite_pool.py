@@ -0,0 +1,139 @@
+"""
+Process-wide SQLite connections, shared by every `SqliteDatabaseController`.
+
+Opening a connection and re-running schema DDL on every history request or
+saved overload event costs far more than the query itself.  `get` instead
+opens each database file once per process: one writer connection, serialised
+by a lock, plus a small pool of reader connections that WAL mode lets run
+alongside it.  Schema setup runs once per setup function, on the first `get`
+that passes it — so every module storing tables in the same file (the event
+history, the time series) shares its single writer instead of opening a
+second one that would fail with "database is locked".
+
+Connections live as long as the process, so each keeps its own compiled
+statement cache — repeated queries reuse their prepared statements instead
+of being parsed again.
+"""
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from tesla_smart_charger import constants, logger
+
+tsc_logger = logger.get_logger()
+
+_MEMORY = ":memory:"
+
+
+class SqlitePool:
+    """One writer and up to *readers* reader connections to a SQLite file."""
+
+    def __init__(
+        self,
+        file_path: str,
+        setup: Callable[[sqlite3.Connection], None] | None = None,
+        readers: int = constants.DB_READER_POOL_SIZE,
+    ) -> None:
+        """Open the writer in WAL mode and run *setup* on it; readers open lazily."""
+        self.file_path = file_path
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        if file_path != _MEMORY:
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL only syncs at checkpoints: a power cut can lose the
+            # last few transactions but never corrupts the file.
+            self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._setups: set[Callable[[sqlite3.Connection], None]] = set()
+        if setup is not None:
+            self.run_setup(setup)
+        self._max_readers = max(1, readers)
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened_readers = 0
+        self._readers_lock = threading.Lock()
+
+    def run_setup(self, setup: Callable[[sqlite3.Connection], None]) -> None:
+        """Run *setup* on the writer in one transaction, unless it already ran."""
+        with self._write_lock:
+            if setup in self._setups:
+                return
+            with self._writer:
+                setup(self._writer)
+            self._setups.add(setup)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer for one transaction, committed unless it raises."""
+        with self._write_lock, self._writer:
+            yield self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection, waiting for one if all are in use."""
+        if self.file_path == _MEMORY:
+            # Every connection to ":memory:" is a separate, empty database.
+            with self.writer() as conn:
+                yield conn
+            return
+        conn = self._take_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def close(self) -> None:
+        """Close the writer and every idle reader."""
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    # ─── Internal helpers ──────────────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        # Shared across request threads; the pool hands each connection to
+        # one thread at a time.
+        conn = sqlite3.connect(self.file_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # named-column access
+        return conn
+
+    def _take_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if self._opened_readers < self._max_readers:
+                self._opened_readers += 1
+                return self._connect()
+        return self._readers.get()
+
+
+_pools: dict[str, SqlitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get(
+    file_path: str, setup: Callable[[sqlite3.Connection], None] | None = None
+) -> SqlitePool:
+    """Return the pool for *file_path*, opening it and running *setup* once."""
+    with _pools_lock:
+        pool = _pools.get(file_path)
+        if pool is None:
+            pool = SqlitePool(file_path, setup)
+            _pools[file_path] = pool
+            tsc_logger.debug("Opened SQLite pool: %s", file_path)
+        elif setup is not None:
+            pool.run_setup(setup)
+        return pool
+
+
+def close_all() -> None:
+    """Close every pool — at shutdown, and between tests."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,24 +1,26 @@
-"""Energy-monitor polling cron — triggers overload handling when needed."""
+"""Energy-monitor cron — triggers overload handling when needed."""
 
+import math
 import threading
+import time
 
 from retrying import retry
 
-from tesla_smart_charger import constants, logger
+from tesla_smart_charger import constants, energy_bus, logger
 from tesla_smart_charger.app_config import AppConfig
 from tesla_smart_charger.controllers import em_controller as _em_controller
 from tesla_smart_charger.controllers.em_controller import EnergyMonitorController
+from tesla_smart_charger.energy_bus import EnergySample
 from tesla_smart_charger.handlers import overload_handler
+from tesla_smart_charger.models import EnergyMonitorMode
 
 tsc_logger = logger.get_logger()
 
 # Global overload flag (toggled by this module only)
 OVERLOAD = False
-
-# Latest consumption reading in amps — written by the cron on each poll,
-# read by the status endpoint so the dashboard shows live home consumption.
-# Initialised to None so the dashboard shows "—" until the first poll.
-LAST_CONSUMPTION_AMPS: float | None = None
+# time.monotonic() before which a failed trigger isn't retried: every attempt
+# fetches every car's vehicle_data, and pushed readings can arrive each second.
+_retrigger_after = -math.inf
 
 
 def _toggle_overload(*, overload: bool) -> bool:
@@ -55,27 +57,37 @@ def _get_em_controller(app_config: AppConfig) -> EnergyMonitorController | None:
     wait_exponential_max=10000,
     stop_max_attempt_number=3,
 )
-def _check_power_consumption(
-    em_ctrl: EnergyMonitorController, app_config: AppConfig
-) -> None:
-    """Poll the energy monitor and trigger overload handling if needed."""
-    cfg = app_config.system
-
+def _poll_energy_monitor(em_ctrl: EnergyMonitorController) -> None:
+    """Read the energy monitor and publish the reading to the energy bus."""
     try:
-        watts = em_ctrl.get_consumption()
-        if watts is None:
+        emeters = em_ctrl.get_emeter_powers()
+        if not emeters or None in emeters:
             # Unify with the RequestException path below via one except block.
             msg = "EM returned None"
             raise ValueError(msg)  # noqa: TRY301
-        em_amps = float(watts) / max(cfg.voltage, 1.0)
-        tsc_logger.debug("Consumption: %.2f A (%.1f W)", em_amps, watts)
-        global LAST_CONSUMPTION_AMPS
-        LAST_CONSUMPTION_AMPS = em_amps
+        emeters = tuple(float(watts) for watts in emeters)
+        energy_bus.bus.publish(sum(emeters), energy_bus.SOURCE_POLL, emeters)
     except (ValueError, TypeError):
         tsc_logger.exception("Error reading consumption")
-        return
 
-    if em_amps > cfg.homeMaxAmps and _toggle_overload(overload=True):
+
+def _check_power_consumption(sample: EnergySample, app_config: AppConfig) -> None:
+    """
+    Evaluate one reading and trigger overload handling if needed.
+
+    After a trigger that did not start a session, further overloaded readings
+    are ignored for ``energyMonitorPollSecs`` rather than each retrying it.
+    """
+    global _retrigger_after
+    cfg = app_config.system
+    em_amps = sample.watts / max(cfg.voltage, 1.0)
+    tsc_logger.debug(
+        "Consumption: %.2f A (%.1f W, %s)", em_amps, sample.watts, sample.source
+    )
+
+    if em_amps > cfg.homeMaxAmps and time.monotonic() < _retrigger_after:
+        tsc_logger.debug("Overload persists — retrying the trigger after cooldown.")
+    elif em_amps > cfg.homeMaxAmps and _toggle_overload(overload=True):
         tsc_logger.warning(
             "Overload detected! %.2f A > %.2f A", em_amps, cfg.homeMaxAmps
         )
@@ -83,13 +95,23 @@ def _check_power_consumption(
         started, msg = overload_handler.trigger_overload(app_config)
         if not started:
             tsc_logger.info("Overload trigger skipped: %s", msg)
-            _toggle_overload(overload=False)  # Reset so next poll can retry
+            _toggle_overload(overload=False)  # Reset so a later reading can retry
+            _retrigger_after = time.monotonic() + max(cfg.energyMonitorPollSecs, 1)
     else:
         _toggle_overload(overload=False)
 
 
 def start_cron_monitor(stop_event: threading.Event, app_config: AppConfig) -> None:
-    """Cron thread: polls the energy monitor every 15 seconds."""
+    """
+    Cron thread: runs overload detection on every energy-monitor reading.
+
+    Readings arrive on the energy bus.  In poll mode this thread produces them
+    itself every ``energyMonitorPollSecs``; in push mode the device pushes them
+    through the API and the thread only polls when no reading has arrived for
+    that long — so a silent device still gets watched.  A reading published
+    by anyone else (an overload session polling a stale bus) also counts, so
+    the device is never read twice in one interval.
+    """
     tsc_logger.info("Energy monitor cron started.")
 
     em_ctrl = _get_em_controller(app_config)
@@ -98,19 +120,28 @@ def start_cron_monitor(stop_event: threading.Event, app_config: AppConfig) -> No
         return
 
     sleep_tick = 1
-    check_interval = 15
-    countdown = check_interval
+    seen_seq = energy_bus.bus.sequence
+    # Last time a reading was requested or received; starting at -inf makes
+    # the first iteration poll immediately.
+    last_activity = -math.inf
 
     while not stop_event.is_set():
-        if countdown <= 0:
-            try:
-                _check_power_consumption(em_ctrl, app_config)
-            # Deliberately broad: this is the cron loop's top-level guard —
-            # any unexpected error here must be logged, not crash the thread.
-            except Exception:
-                tsc_logger.exception("Unhandled error in energy monitor poll")
-            countdown = check_interval
-        stop_event.wait(sleep_tick)
-        countdown -= sleep_tick
+        cfg = app_config.system
+        sample = energy_bus.bus.wait_for_sample(seen_seq, timeout=sleep_tick)
+        now = time.monotonic()
+        try:
+            if sample is not None:
+                seen_seq = sample.seq
+                last_activity = now
+                _check_power_consumption(sample, app_config)
+            elif now - last_activity >= max(cfg.energyMonitorPollSecs, 1):
+                if cfg.energyMonitorMode == EnergyMonitorMode.PUSH:
+                    tsc_logger.debug("No pushed reading — polling the device.")
+                last_activity = now
+                _poll_energy_monitor(em_ctrl)
+        # Deliberately broad: this is the cron loop's top-level guard —
+        # any unexpected error here must be logged, not crash the thread.
+        except Exception:
+            tsc_logger.exception("Unhandled error in energy monitor poll")
 
     tsc_logger.info("Energy monitor cron stopped.")
@@ -0,0 +1,127 @@
+"""
+In-process bus for energy-monitor readings.
+
+Producers — the polling cron or the push endpoint the energy monitor calls —
+`publish` samples; the monitor cron blocks in `wait_for_sample` and runs
+overload detection on every one.  With push ingestion that means a reading is
+evaluated the moment the device reports it, instead of up to a full poll
+interval later.
+
+The bus is the single source of consumption for the whole app: the overload
+session and ``GET /api/v1/status`` read the same ring buffer of timestamped
+samples the cron evaluates, instead of each polling the device on its own.
+Only when nobody has published recently does a reader poll the device itself
+(see `fresh`), and it publishes what it reads so others can reuse it.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from tesla_smart_charger import constants
+from tesla_smart_charger.clock import Clock, system_clock
+from tesla_smart_charger.consumption_history import ConsumptionHistory, history
+
+SOURCE_POLL = "poll"
+SOURCE_PUSH = "push"
+
+
+@dataclass(frozen=True)
+class EnergySample:
+    """One whole-house power reading."""
+
+    seq: int  # monotonically increasing per bus; 0 means "nothing yet"
+    timestamp: float  # epoch seconds
+    watts: float
+    source: str  # SOURCE_POLL or SOURCE_PUSH
+    emeters: tuple[float, ...] = ()  # per-channel watts, when the device reports them
+
+
+class EnergyBus:
+    """Thread-safe ring buffer of recent samples, with blocking waits for the next."""
+
+    def __init__(
+        self,
+        capacity: int = constants.ENERGY_BUS_CAPACITY,
+        long_history: ConsumptionHistory | None = None,
+        clock: Clock = system_clock,
+    ) -> None:
+        """
+        Create an empty bus keeping the last *capacity* samples.
+
+        Every published sample is also appended to *long_history*, if given.
+        Samples are stamped, and judged fresh, by *clock*.
+        """
+        self._cond = threading.Condition()
+        self._samples: deque[EnergySample] = deque(maxlen=capacity)
+        self._seq = 0
+        self._history = long_history
+        self._clock = clock
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest sample (0 before the first)."""
+        with self._cond:
+            return self._seq
+
+    def publish(
+        self, watts: float, source: str, emeters: tuple[float, ...] = ()
+    ) -> EnergySample:
+        """Record a reading (total and optional per-emeter watts) and wake waiters."""
+        with self._cond:
+            self._seq += 1
+            sample = EnergySample(
+                seq=self._seq,
+                timestamp=self._clock.time(),
+                watts=watts,
+                source=source,
+                emeters=emeters,
+            )
+            self._samples.append(sample)
+            self._cond.notify_all()
+        if self._history is not None:
+            self._history.append(sample.timestamp, watts, emeters)
+        return sample
+
+    def latest(self) -> EnergySample | None:
+        """Return the most recent sample, or None if nothing was published."""
+        with self._cond:
+            return self._samples[-1] if self._samples else None
+
+    def fresh(self, max_age: float) -> EnergySample | None:
+        """Return the latest sample if it is at most *max_age* seconds old."""
+        sample = self.latest()
+        if sample is None or self._clock.time() - sample.timestamp > max_age:
+            return None
+        return sample
+
+    def samples(self, since: float = 0.0) -> list[EnergySample]:
+        """Return the buffered samples taken after epoch *since*, oldest first."""
+        with self._cond:
+            return [s for s in self._samples if s.timestamp > since]
+
+    def wait_for_sample(self, after_seq: int, timeout: float) -> EnergySample | None:
+        """
+        Block until a sample newer than *after_seq* exists, up to *timeout* s.
+
+        Returns the latest sample — readings published in between are
+        coalesced, since only the current load matters for detection — or None
+        on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > after_seq, timeout):
+                return None
+            return self._samples[-1]
+
+    def reset(self) -> None:
+        """Forget every sample, including the long history — used between tests."""
+        with self._cond:
+            self._samples.clear()
+            self._seq = 0
+        if self._history is not None:
+            self._history.clear()
+
+
+# Process-wide bus shared by the cron, the push endpoint and the status route;
+# it feeds the 24 h history behind /api/v1/consumption.
+bus = EnergyBus(long_history=history)
@@ -0,0 +1,162 @@
+"""
+Per-vehicle Fleet API request budget.
+
+Tesla meters each vehicle's data requests, commands and wake-ups separately
+and answers 429 once a quota is spent.  `FleetBudget` keeps one token bucket
+per vehicle and endpoint class, sized by ``constants.FLEET_BUDGETS``, and every
+request a `BaseTeslaClient` makes spends a token first — retries included.
+
+Callers are ranked by `Priority`.  Lower priorities may only spend down to a
+reserve, so a dashboard refreshing telemetry runs out long before the overload
+session does:
+
+* ``OVERLOAD`` may use the whole bucket, and queues for up to
+  ``FLEET_BUDGET_MAX_WAIT_SECS`` for a token rather than fail a safety cut;
+* ``INTERACTIVE`` (user commands, onboarding) keeps a quarter in reserve;
+* ``BACKGROUND`` (telemetry refresh) keeps half in reserve.
+
+A request that can't be served is rejected with `BudgetExceededError` — a 429
+carrying ``Retry-After`` — without touching the network.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from enum import IntEnum
+
+from fastapi import HTTPException
+
+from tesla_smart_charger import constants
+from tesla_smart_charger.clock import Clock, system_clock
+
+DATA = "data"
+COMMAND = "command"
+WAKE = "wake"
+
+
+class Priority(IntEnum):
+    """Who is asking — lower values are served first."""
+
+    OVERLOAD = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+# Fraction of each bucket a priority must leave untouched.
+_RESERVE = {
+    Priority.OVERLOAD: 0.0,
+    Priority.INTERACTIVE: 0.25,
+    Priority.BACKGROUND: 0.5,
+}
+
+
+class BudgetExceededError(HTTPException):
+    """A request was refused locally because its budget is spent."""
+
+    def __init__(self, vehicle_id: str, endpoint: str, retry_after: float) -> None:
+        """Build the 429 for *vehicle_id*'s *endpoint* budget."""
+        super().__init__(
+            status_code=429,
+            detail=(
+                f"Fleet API {endpoint} budget exhausted for vehicle {vehicle_id}; "
+                f"retry in {retry_after:.0f}s"
+            ),
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+@dataclass
+class _Bucket:
+    capacity: float
+    rate: float  # tokens per second
+    tokens: float
+    updated: float
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - self.updated, 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+
+class FleetBudget:
+    """Thread-safe token buckets keyed by (vehicle id, endpoint class)."""
+
+    def __init__(
+        self,
+        budgets: dict[str, tuple[int, float]] | None = None,
+        clock: Clock = system_clock,
+    ) -> None:
+        """Create full buckets lazily from *budgets* (default: the constants)."""
+        self._budgets = constants.FLEET_BUDGETS if budgets is None else budgets
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+
+    def _bucket(self, vehicle_id: str, endpoint: str) -> _Bucket:
+        key = (vehicle_id, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            requests, per_secs = self._budgets[endpoint]
+            bucket = _Bucket(
+                capacity=requests,
+                rate=requests / per_secs,
+                tokens=requests,
+                updated=self._clock.time(),
+            )
+            self._buckets[key] = bucket
+        return bucket
+
+    def acquire(
+        self,
+        vehicle_id: str,
+        endpoint: str,
+        priority: Priority = Priority.INTERACTIVE,
+        *,
+        wait: bool = True,
+    ) -> None:
+        """
+        Spend one *endpoint* token for *vehicle_id*, or raise `BudgetExceededError`.
+
+        ``OVERLOAD`` requests sleep until a token frees up, if that is within
+        ``FLEET_BUDGET_MAX_WAIT_SECS`` and *wait* is set — async callers pass
+        ``wait=False`` since they must not block the event loop.
+        """
+        max_wait = (
+            constants.FLEET_BUDGET_MAX_WAIT_SECS
+            if wait and priority == Priority.OVERLOAD
+            else 0.0
+        )
+        deadline = self._clock.time() + max_wait
+        while True:
+            with self._lock:
+                bucket = self._bucket(vehicle_id, endpoint)
+                now = self._clock.time()
+                bucket.refill(now)
+                floor = _RESERVE[priority] * bucket.capacity
+                if bucket.tokens - 1 >= floor:
+                    bucket.tokens -= 1
+                    return
+                delay = (floor + 1 - bucket.tokens) / bucket.rate
+            if now + delay > deadline:
+                raise BudgetExceededError(vehicle_id, endpoint, delay)
+            self._clock.sleep(delay)
+
+    def remaining(self, vehicle_id: str) -> dict[str, int]:
+        """Return the whole tokens left per endpoint class for *vehicle_id*."""
+        with self._lock:
+            now = self._clock.time()
+            result = {}
+            for endpoint in self._budgets:
+                bucket = self._bucket(vehicle_id, endpoint)
+                bucket.refill(now)
+                result[endpoint] = math.floor(bucket.tokens)
+            return result
+
+    def reset(self) -> None:
+        """Refill every bucket — used between tests."""
+        with self._lock:
+            self._buckets.clear()
+
+
+# Process-wide budget shared by every Tesla client.
+budget = FleetBudget()
@@ -0,0 +1,146 @@
+"""
+Streamed vehicle signals from Tesla Fleet Telemetry.
+
+Polling ``vehicle_data`` is slow, billed and rate limited.  With Fleet
+Telemetry configured the car streams the signals it was asked for to a
+telemetry server instead — Tesla's ``fleet-telemetry``, relaying its decoded
+JSON records (``{"vin": ..., "data": [{"key": ..., "value": {...}}]}``) to
+``POST /api/v1/fleet-telemetry``.  `TelemetryStream` keeps the latest value of
+each charging signal per vehicle; records only carry the signals that changed,
+so they are merged into what is already known.
+
+While a vehicle's last record is at most ``FLEET_TELEMETRY_STALE_SECS`` old
+(configure the server's resend interval below that), `vehicle_data` answers
+with a ``vehicle_data``-shaped dict and the telemetry cache and the overload
+session use it instead of polling.  Otherwise they poll as before.
+"""
+
+import threading
+from dataclasses import dataclass, field
+
+from tesla_smart_charger import constants
+from tesla_smart_charger.clock import Clock, system_clock
+
+# Fleet Telemetry field → ``charge_state`` key of ``vehicle_data``.
+SIGNALS = {
+    "ChargeState": "charging_state",
+    "DetailedChargeState": "charging_state",
+    "ChargeAmps": "charger_actual_current",
+    "ChargeCurrentRequest": "charge_current_request",
+    "BatteryLevel": "battery_level",
+    "ChargeLimitSoc": "charge_limit_soc",
+}
+# Keys that ``vehicle_data`` reports as whole numbers.
+_INTEGER_KEYS = {"charge_current_request", "battery_level", "charge_limit_soc"}
+# The overload strategies can't act on a vehicle without these.
+_REQUIRED_KEYS = ("charging_state", "charger_actual_current")
+
+
+def _charging_state(value: object) -> str:
+    """Map ``DetailedChargeStateCharging`` and the like to ``Charging``."""
+    text = str(value)
+    for prefix in ("DetailedChargeState", "ChargeState"):
+        if text.startswith(prefix) and len(text) > len(prefix):
+            return text[len(prefix) :]
+    return text
+
+
+def decode(data: list[dict]) -> dict[str, object]:
+    """
+    Return the ``charge_state`` values carried by a record's *data* list.
+
+    Each datum's ``value`` holds one typed entry (``stringValue``,
+    ``doubleValue``, ``detailedChargeStateValue``, …); ``invalid`` ones and
+    fields other than `SIGNALS` are skipped.
+    """
+    decoded: dict[str, object] = {}
+    for datum in data:
+        key = SIGNALS.get(datum.get("key", ""))
+        value = datum.get("value") or {}
+        if key is None or value.get("invalid") or not value:
+            continue
+        raw = next(iter(value.values()))
+        if key == "charging_state":
+            decoded[key] = _charging_state(raw)
+            continue
+        try:
+            number = float(raw)
+        except (TypeError, ValueError):
+            continue
+        decoded[key] = round(number) if key in _INTEGER_KEYS else number
+    return decoded
+
+
+@dataclass
+class _Signals:
+    charge_state: dict[str, object] = field(default_factory=dict)
+    received_at: float = 0.0
+
+
+class TelemetryStream:
+    """Thread-safe latest streamed signals, keyed by vehicle id."""
+
+    def __init__(
+        self, stale_secs: float | None = None, clock: Clock = system_clock
+    ) -> None:
+        """Treat a vehicle as streaming while its last record is *stale_secs* old."""
+        self._stale_secs = (
+            constants.FLEET_TELEMETRY_STALE_SECS if stale_secs is None else stale_secs
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._vehicles: dict[str, _Signals] = {}
+
+    def ingest(self, vehicle_id: str, charge_state: dict[str, object]) -> None:
+        """Merge decoded *charge_state* values into *vehicle_id*'s signals."""
+        with self._lock:
+            signals = self._vehicles.setdefault(vehicle_id, _Signals())
+            signals.charge_state.update(charge_state)
+            signals.received_at = self._clock.time()
+
+    def age(self, vehicle_id: str) -> float | None:
+        """Seconds since *vehicle_id*'s last record, or None if it never sent one."""
+        with self._lock:
+            signals = self._vehicles.get(vehicle_id)
+            if signals is None:
+                return None
+            return self._clock.time() - signals.received_at
+
+    def vehicle_data(self, vehicle_id: str) -> dict | None:
+        """
+        Return *vehicle_id*'s streamed state shaped like ``vehicle_data``.
+
+        None unless the vehicle is streaming and has reported at least its
+        charging state and current — callers then poll instead.
+        """
+        latest = self.latest(vehicle_id)
+        return None if latest is None else latest[0]
+
+    def latest(self, vehicle_id: str) -> tuple[dict, float] | None:
+        """
+        Return `vehicle_data` together with its age in seconds, read atomically.
+
+        The age is that of the last record, so a caller can date the state by
+        when it was received rather than when it was read.
+        """
+        with self._lock:
+            signals = self._vehicles.get(vehicle_id)
+            if signals is None:
+                return None
+            age = self._clock.time() - signals.received_at
+            if age > self._stale_secs or any(
+                key not in signals.charge_state for key in _REQUIRED_KEYS
+            ):
+                return None
+            data = {"state": "online", "charge_state": dict(signals.charge_state)}
+            return data, age
+
+    def reset(self) -> None:
+        """Forget every vehicle's signals — used between tests."""
+        with self._lock:
+            self._vehicles.clear()
+
+
+# Process-wide stream fed by the ingestion route and read by the telemetry
+# cache and the overload session.
+stream = TelemetryStream()
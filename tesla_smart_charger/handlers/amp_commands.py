@@ -0,0 +1,122 @@
+"""
+Per-vehicle layer in front of ``set_charge_amp_limit``.
+
+Fleet API commands are billed and rate limited, and the overload strategies
+compute a limit from ``charger_actual_current`` — which lags the limit by the
+car's ramp — so on their own they would re-send the setpoint they sent one
+iteration ago while the car is still getting there.  `send` remembers the
+last acknowledged setpoint per vehicle and drops a command when
+
+* the vehicle's snapshot already reports it as the requested current, or
+* it was acknowledged less than ``AMP_COMMAND_HOLD_SECS`` ago and no
+  snapshot fetched since then reports a different requested current.
+
+Commands for one vehicle are also coalesced: while one is in flight, later
+setpoints only replace the value waiting behind it, and the sending thread
+delivers the latest once its own call returns — intermediate values that were
+already superseded are never sent.
+"""
+
+import threading
+from dataclasses import dataclass
+
+from tesla_smart_charger import constants, logger, telemetry_cache
+from tesla_smart_charger.clock import Clock, system_clock
+from tesla_smart_charger.handlers.charge_snapshot import ChargeSnapshot
+from tesla_smart_charger.models import VehicleConfig
+from tesla_smart_charger.tesla_api import TeslaAPI
+
+tsc_logger = logger.get_logger()
+
+
+@dataclass
+class _VehicleCommands:
+    """Command bookkeeping for one vehicle; guarded by ``_lock``."""
+
+    acked_amps: int | None = None
+    acked_at: float = 0.0
+    wanted: int | None = None  # latest setpoint asked for
+    in_flight: bool = False
+
+
+_lock = threading.Lock()
+_vehicles: dict[str, _VehicleCommands] = {}
+
+
+def reset() -> None:
+    """Forget every vehicle's setpoints — used between sessions in tests."""
+    with _lock:
+        _vehicles.clear()
+
+
+def _is_redundant(
+    entry: _VehicleCommands, amps: int, snapshot: ChargeSnapshot | None, now: float
+) -> bool:
+    if snapshot is not None and snapshot.requested_current == amps:
+        return True
+    # A snapshot newer than the acknowledgement that disagrees means the
+    # limit was changed since (e.g. in the Tesla app): the hold no longer
+    # says anything about what the car has.
+    if snapshot is not None and snapshot.fetched_at > entry.acked_at:
+        return False
+    return (
+        entry.acked_amps == amps
+        and now - entry.acked_at < constants.AMP_COMMAND_HOLD_SECS
+    )
+
+
+def send(
+    vehicle: VehicleConfig,
+    api: TeslaAPI,
+    amps: int,
+    snapshot: ChargeSnapshot | None = None,
+    clock: Clock = system_clock,
+) -> bool:
+    """
+    Set *vehicle*'s amp limit to *amps* unless that would be redundant.
+
+    *snapshot* is what the setpoint was computed from; its requested current
+    tells whether the car already has this limit.
+
+    Returns True if this call issued at least one command, False if it was
+    suppressed or handed to a command already in flight.  Raises the
+    ``HTTPException`` of a failed command, like ``set_charge_amp_limit``.
+    """
+    with _lock:
+        entry = _vehicles.setdefault(vehicle.id, _VehicleCommands())
+        entry.wanted = amps
+        if entry.in_flight:
+            tsc_logger.debug(
+                "Command for %s in flight — %sA will follow it.", vehicle.id, amps
+            )
+            return False
+        entry.in_flight = True
+
+    sent = False
+    try:
+        while True:
+            with _lock:
+                target = entry.wanted
+                if _is_redundant(entry, target, snapshot, clock.time()):
+                    break
+            api.set_charge_amp_limit(target)
+            telemetry_cache.invalidate(vehicle.id)
+            sent = True
+            with _lock:
+                entry.acked_amps = target
+                entry.acked_at = clock.time()
+                if entry.wanted == target:
+                    break
+            # A newer setpoint arrived while this one was in flight; the
+            # snapshot predates both, so only the acknowledgement can
+            # suppress it now.
+            snapshot = None
+    finally:
+        with _lock:
+            entry.in_flight = False
+
+    if not sent:
+        tsc_logger.debug(
+            "Skipping redundant %sA command for %s.", amps, vehicle.name or vehicle.id
+        )
+    return sent
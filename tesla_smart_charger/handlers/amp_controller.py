@@ -0,0 +1,104 @@
+"""
+Closed-loop amp controller used by the ``closed_loop`` overload strategy.
+
+The controlled quantity is the *total* current the charging vehicles may draw.
+Each iteration computes it from one meter reading:
+
+    setpoint = measured vehicle current        (feed-forward)
+             + KP * error                      (proportional)
+             + integral                        (integral)
+
+with ``error = (homeMaxAmps - headroom) - measured house current``.
+
+Feed-forward from the cars' measured current means the proportional term only
+has to move the operating point by the error itself, so with ``KP`` close to 1
+a step in house load is absorbed in a single iteration instead of the many
+30 s steps the percentage heuristics need.  The integral trims what the cars
+don't track exactly (a car drawing a little under its limit, meter offset).
+
+Anti-windup: the integral only accumulates while the error is inside a small
+band — large errors are transients the proportional path handles — is clamped
+to ``±INTEGRAL_LIMIT_AMPS``, and stops growing in a direction the vehicles'
+min / max limits no longer allow.
+"""
+
+from dataclasses import dataclass
+
+# Proportional gain.  Slightly below 1 so a noisy reading can't overshoot.
+KP = 0.9
+# Integral gain, applied per iteration.
+KI = 0.3
+# The integral only accumulates while |error| is within this band (amps).
+INTEGRAL_BAND_AMPS = 3.0
+# Hard clamp on the integral term (amps).
+INTEGRAL_LIMIT_AMPS = 5.0
+
+
+@dataclass
+class AmpController:
+    """PI + feed-forward controller for the total vehicle charging current."""
+
+    target_amps: float
+    integral: float = 0.0
+
+    def update(
+        self,
+        house_amps: float,
+        vehicle_amps: float,
+        min_amps: float,
+        max_amps: float,
+    ) -> float:
+        """
+        Return the new total vehicle setpoint, clamped to [min_amps, max_amps].
+
+        Parameters
+        ----------
+        house_amps : float
+            Whole-house current from the energy monitor, vehicles included.
+        vehicle_amps : float
+            Current the charging vehicles are measured to draw right now.
+        min_amps, max_amps : float
+            Sum of the vehicles' minimum and maximum (ceiling) amp limits.
+
+        """
+        error = self.target_amps - house_amps
+        unclamped = vehicle_amps + KP * error + self.integral
+        saturated_low = unclamped <= min_amps and error < 0
+        saturated_high = unclamped >= max_amps and error > 0
+        if (
+            abs(error) <= INTEGRAL_BAND_AMPS
+            and not saturated_low
+            and not saturated_high
+        ):
+            self.integral = max(
+                -INTEGRAL_LIMIT_AMPS,
+                min(self.integral + KI * error, INTEGRAL_LIMIT_AMPS),
+            )
+        setpoint = vehicle_amps + KP * error + self.integral
+        return max(min_amps, min(setpoint, max_amps))
+
+
+def allocate(total_amps: float, limits: list[tuple[float, float]]) -> list[int]:
+    """
+    Split *total_amps* across vehicles, each within its (min, max) limits.
+
+    Water-filling: every vehicle gets its minimum, then the remainder is
+    shared evenly, with any share a vehicle can't take (it hit its max)
+    passed on to the others.  Results are floored to whole amps, so the sum
+    never exceeds *total_amps* unless the minimums alone do.
+    """
+    amps = [low for low, _ in limits]
+    remaining = total_amps - sum(amps)
+    open_idx = [i for i, (low, high) in enumerate(limits) if high > low]
+    while remaining > 1e-9 and open_idx:
+        share = remaining / len(open_idx)
+        still_open = []
+        for i in open_idx:
+            room = limits[i][1] - amps[i]
+            give = min(share, room)
+            amps[i] += give
+            remaining -= give
+            if room > share:
+                still_open.append(i)
+        open_idx = still_open
+    return [int(a) for a in amps]
@@ -0,0 +1,105 @@
+"""
+Typed view of one vehicle's charging state for the overload loop.
+
+`ChargeSnapshot.from_vehicle_data` parses a ``vehicle_data``-shaped dict —
+polled or streamed — once per fetch.  The strategies then read plain
+attributes instead of re-walking the dict and converting its values on every
+use, and a payload the loop can't act on is rejected here, in one place,
+rather than failing halfway through a strategy.
+"""
+
+from tesla_smart_charger.tesla_api import VehicleData
+
+
+def _number(value: object) -> float | None:
+    """Return *value* as a float, or None when it is missing or not numeric."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ChargeSnapshot:
+    """What one fetch reported about a vehicle's charging."""
+
+    __slots__ = (
+        "actual_current",
+        "battery_level",
+        "charging_state",
+        "fetched_at",
+        "requested_current",
+        "state",
+    )
+
+    def __init__(  # noqa: PLR0913 — one argument per reported field
+        self,
+        state: str | None,
+        charging_state: str | None,
+        actual_current: float,
+        *,
+        requested_current: float | None = None,
+        battery_level: int | None = None,
+        fetched_at: float = 0.0,
+    ) -> None:
+        """Hold already-validated values; see `from_vehicle_data`."""
+        self.state = state
+        self.charging_state = charging_state
+        self.actual_current = actual_current
+        self.requested_current = requested_current
+        self.battery_level = battery_level
+        self.fetched_at = fetched_at
+
+    @classmethod
+    def from_vehicle_data(
+        cls, data: VehicleData | dict, fetched_at: float = 0.0
+    ) -> "ChargeSnapshot":
+        """
+        Parse *data*, raising ValueError if the loop couldn't act on it.
+
+        A charging vehicle must report a numeric ``charger_actual_current``.
+        ``requested_current`` is the driver's ``charge_current_request``,
+        falling back to ``charge_amps`` on firmware that lacks it.
+        """
+        charge = data.get("charge_state") or {}
+        if not isinstance(charge, dict):
+            msg = f"charge_state is not an object: {charge!r}"
+            raise ValueError(msg)  # noqa: TRY004 — payload errors are ValueErrors
+        charging_state = charge.get("charging_state")
+        actual_current = _number(charge.get("charger_actual_current"))
+        if actual_current is None:
+            if charging_state == "Charging":
+                msg = (
+                    "charging vehicle reported no numeric charger_actual_current: "
+                    f"{charge.get('charger_actual_current')!r}"
+                )
+                raise ValueError(msg)
+            actual_current = 0.0
+        requested_current = _number(charge.get("charge_current_request"))
+        if requested_current is None:
+            requested_current = _number(charge.get("charge_amps"))
+        battery_level = _number(charge.get("battery_level"))
+        return cls(
+            state=data.get("state"),
+            charging_state=charging_state,
+            actual_current=actual_current,
+            requested_current=requested_current,
+            battery_level=None if battery_level is None else round(battery_level),
+            fetched_at=fetched_at,
+        )
+
+    @property
+    def is_charging(self) -> bool:
+        """Whether the vehicle is online and drawing current."""
+        return self.state == "online" and self.charging_state == "Charging"
+
+    def __repr__(self) -> str:
+        """Show the fields, for logs and test failures."""
+        return (
+            f"ChargeSnapshot(state={self.state!r}, "
+            f"charging_state={self.charging_state!r}, "
+            f"actual_current={self.actual_current!r}, "
+            f"requested_current={self.requested_current!r}, "
+            f"battery_level={self.battery_level!r}, fetched_at={self.fetched_at!r})"
+        )
@@ -4,15 +4,22 @@ import math
 import sqlite3
 import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 
 from fastapi import HTTPException
 
-from tesla_smart_charger import constants, logger, telemetry_cache
+from tesla_smart_charger import constants, energy_bus, fleet_telemetry, logger
 from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.clock import Clock, format_timestamp, system_clock
 from tesla_smart_charger.controllers import db_controller
 from tesla_smart_charger.controllers import em_controller as _em_controller
 from tesla_smart_charger.controllers.em_controller import EnergyMonitorController
+from tesla_smart_charger.energy_bus import EnergyBus
+from tesla_smart_charger.fleet_budget import Priority
+from tesla_smart_charger.handlers import amp_commands, amp_controller
+from tesla_smart_charger.handlers.charge_snapshot import ChargeSnapshot
 from tesla_smart_charger.models import OverloadStrategy, SystemConfig, VehicleConfig
 from tesla_smart_charger.tesla_api import TeslaAPI
 
@@ -53,17 +60,19 @@ def _init_db() -> object | None:
         return ctrl
 
 
-def _save_event(start_time: str, vehicle_id: str | None = None) -> None:
+def _save_event(
+    start_time: str, vehicle_id: str | None = None, clock: Clock = system_clock
+) -> None:
     ctrl = _init_db()
     if ctrl is None:
         return
-    end_time = time.strftime("%Y-%m-%d %H:%M:%S")
+    end_time = format_timestamp(clock.time())
     try:
         s = time.mktime(time.strptime(start_time, "%Y-%m-%d %H:%M:%S"))
         e = time.mktime(time.strptime(end_time, "%Y-%m-%d %H:%M:%S"))
-        duration = str(e - s)
+        duration = round(e - s)
     except ValueError:
-        duration = "0"
+        duration = 0
     try:
         ctrl.insert_data(
             {
@@ -117,23 +126,17 @@ def _calculate_new_charge_limit(
     return math.floor(new_limit)
 
 
-def _intended_amp_limit(data: dict, vehicle: VehicleConfig) -> float:
+def _intended_amp_limit(snapshot: ChargeSnapshot, vehicle: VehicleConfig) -> float:
     """
     Return the user-requested charge amp limit, else the configured max.
 
     ``charge_current_request`` is what the driver asked for in the vehicle app;
     the smart charger must never ramp back above it after clearing an overload.
     ``charge_amps`` reports the measured line current, not the setpoint, so it
-    is only kept as a compatibility fallback.
+    is only kept as a compatibility fallback (see `ChargeSnapshot`).
     """
-    for key in ("charge_current_request", "charge_amps"):
-        value = data.get("charge_state", {}).get(key)
-        if value is None:
-            continue
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            continue
+    if snapshot.requested_current is not None:
+        return snapshot.requested_current
     return float(vehicle.chargerMaxAmps)
 
 
@@ -151,14 +154,42 @@ def _ramp_up_ceiling(
     return min(intended, configured_max)
 
 
-def _get_consumption(em_ctrl: EnergyMonitorController, app_config: AppConfig) -> float:
-    """Return current consumption in amps, 0.0 on error."""
-    voltage = app_config.system.voltage
+def _sample_max_age(cfg: SystemConfig) -> float:
+    """Age beyond which a bus sample is stale: the cron missed a whole poll."""
+    return 2 * max(cfg.energyMonitorPollSecs, 1)
+
+
+def _get_consumption(
+    em_ctrl: EnergyMonitorController,
+    app_config: AppConfig,
+    bus: EnergyBus | None = None,
+) -> float:
+    """
+    Return current consumption in amps, 0.0 on error.
+
+    Reuses the monitor cron's latest reading from the energy bus (*bus*,
+    the process-wide one by default).  Only when that reading is stale — the
+    cron is stopped or the device went quiet — is the device polled here, and
+    the result published so the cron and the status endpoint see the same
+    value.
+    """
+    cfg = app_config.system
+    voltage = cfg.voltage
+    if bus is None:
+        bus = energy_bus.bus
     try:
-        watts = em_ctrl.get_consumption()
-        amps = float(watts) / voltage
+        sample = bus.fresh(_sample_max_age(cfg))
+        if sample is None:
+            tsc_logger.debug("No fresh energy sample — polling the device.")
+            emeters = tuple(float(watts) for watts in em_ctrl.get_emeter_powers())
+            sample = bus.publish(sum(emeters), energy_bus.SOURCE_POLL, emeters)
+        amps = sample.watts / voltage
         tsc_logger.debug(
-            "Current consumption: %.2f A (%.1f W / %.0f V)", amps, watts, voltage
+            "Current consumption: %.2f A (%.1f W / %.0f V, %s)",
+            amps,
+            sample.watts,
+            voltage,
+            sample.source,
         )
     except (ValueError, TypeError, ZeroDivisionError):
         tsc_logger.exception("Error reading consumption")
@@ -170,33 +201,112 @@ def _get_consumption(em_ctrl: EnergyMonitorController, app_config: AppConfig) ->
 # ─── Multi-vehicle overload strategies ────────────────────────────────────────
 
 
-def _get_charging_vehicles(
+def _fetch_vehicle_data(
     apis: list[tuple[VehicleConfig, TeslaAPI]],
-) -> list[tuple[VehicleConfig, TeslaAPI, dict]]:
-    """Return (vehicle, api, vehicle_data) tuples for all actively charging vehicles."""
-    charging = []
-    for vehicle, api in apis:
-        if not vehicle.enabled:
-            continue
+    deadline_secs: float,
+    clock: Clock = system_clock,
+) -> list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]]:
+    """
+    Fetch a snapshot of every enabled vehicle in parallel.
+
+    Vehicles streaming Fleet Telemetry are read from the stream; the rest are
+    polled.  Waits at most *deadline_secs* for the whole batch, so an
+    iteration costs as much as the slowest car rather than the sum of all of
+    them.  Vehicles whose fetch failed, missed the deadline or returned data
+    the loop can't act on are left out; late requests finish in the
+    background and their results are dropped.  Input order is preserved.
+
+    Snapshots are dated by when their record was received, or when the poll
+    was requested — not when the batch completed — so state older than a
+    command acknowledged meanwhile never looks newer than it.
+    """
+    enabled = [(vehicle, api) for vehicle, api in apis if vehicle.enabled]
+    streamed: dict[str, tuple[dict, float]] = {}
+    for vehicle, _ in enabled:
+        latest = fleet_telemetry.stream.latest(vehicle.id)
+        if latest is not None:
+            # The stream keeps its own clock; only the record's age carries over.
+            data, age = latest
+            streamed[vehicle.id] = (data, clock.time() - age)
+    polled = [(vehicle, api) for vehicle, api in enabled if vehicle.id not in streamed]
+    futures = {}
+    requested_at = clock.time()
+    if polled:
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(len(polled), constants.VEHICLE_FETCH_MAX_WORKERS)),
+            thread_name_prefix="tsc_vehicle_fetch",
+        )
         try:
-            data = api.get_vehicle_data()
-        except HTTPException:
+            # The same deadline bounds each client's retries, so a car that
+            # keeps failing stops costing requests once its result can't be used.
+            futures = {
+                vehicle.id: pool.submit(
+                    api.get_vehicle_data, deadline_secs=deadline_secs
+                )
+                for vehicle, api in polled
+            }
+            wait(futures.values(), timeout=deadline_secs)
+        finally:
+            # Never block on a straggler — that is exactly the delay this avoids.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    fetched = []
+    for vehicle, api in enabled:
+        if vehicle.id in streamed:
+            data, fetched_at = streamed[vehicle.id]
+        else:
+            fetched_at = requested_at
+            future = futures[vehicle.id]
+            if not future.done() or future.cancelled():
+                tsc_logger.warning(
+                    "No data for vehicle %s within %.0fs — skipping this iteration.",
+                    vehicle.id,
+                    deadline_secs,
+                )
+                continue
+            try:
+                data = future.result()
+            except HTTPException:
+                tsc_logger.warning(
+                    "Could not fetch data for vehicle %s — skipping.", vehicle.id
+                )
+                continue
+        try:
+            snapshot = ChargeSnapshot.from_vehicle_data(data, fetched_at)
+        except ValueError as exc:
             tsc_logger.warning(
-                "Could not fetch data for vehicle %s — skipping.", vehicle.id
+                "Unusable data for vehicle %s — skipping: %s", vehicle.id, exc
             )
             continue
-        if (
-            data.get("state") == "online"
-            and data.get("charge_state", {}).get("charging_state") == "Charging"
-        ):
-            charging.append((vehicle, api, data))
-    return charging
+        fetched.append((vehicle, api, snapshot))
+    return fetched
+
+
+def _overload_api(vehicle: VehicleConfig) -> TeslaAPI:
+    """Return a client whose requests rank first for the Fleet API budget."""
+    return TeslaAPI(vehicle, priority=Priority.OVERLOAD)
+
+
+def _get_charging_vehicles(
+    apis: list[tuple[VehicleConfig, TeslaAPI]],
+    deadline_secs: float | None = None,
+    clock: Clock = system_clock,
+) -> list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]]:
+    """Return (vehicle, api, snapshot) tuples for all actively charging vehicles."""
+    if deadline_secs is None:
+        deadline_secs = constants.VEHICLE_FETCH_DEADLINE_SECS
+    return [
+        (vehicle, api, snapshot)
+        for vehicle, api, snapshot in _fetch_vehicle_data(apis, deadline_secs, clock)
+        if snapshot.is_charging
+    ]
 
 
 def _apply_proportional(
-    charging: list[tuple[VehicleConfig, TeslaAPI, dict]],
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
     em_amps: float,
     home_max_amps: float,
+    clock: Clock = system_clock,
 ) -> bool:
     """
     Reduce each charging vehicle proportionally to clear the overload.
@@ -205,7 +315,9 @@ def _apply_proportional(
     charging vehicles in proportion to how much each is currently drawing, then
     clamped to each vehicle's [min, max] range.
 
-    Returns True if at least one vehicle's limit was changed.
+    Returns True if at least one vehicle's limit was changed or is already on
+    its way to the reduced value; False if none needed to or every command
+    failed.
     """
     if not charging:
         return False
@@ -214,15 +326,13 @@ def _apply_proportional(
     if excess <= 0:
         return False
 
-    total_current = sum(
-        float(d["charge_state"]["charger_actual_current"]) for _, _, d in charging
-    )
+    total_current = sum(s.actual_current for _, _, s in charging)
     if total_current <= 0:
         return False
 
     changed = False
-    for vehicle, api, data in charging:
-        current = float(data["charge_state"]["charger_actual_current"])
+    for vehicle, api, snapshot in charging:
+        current = snapshot.actual_current
         # This vehicle absorbs a share of the excess proportional to its draw
         reduction = excess * (current / total_current)
         new_limit = math.floor(current - reduction)
@@ -231,35 +341,47 @@ def _apply_proportional(
         )
         if new_limit != math.floor(current):
             try:
-                api.set_charge_amp_limit(new_limit)
-                telemetry_cache.invalidate(vehicle.id)
-                changed = True
+                sent = amp_commands.send(vehicle, api, new_limit, snapshot, clock)
             except HTTPException:
                 tsc_logger.exception("Failed to set charge limit for %s", vehicle.id)
+                continue
+            if sent:
+                tsc_logger.info(
+                    "Reducing %s: %.0fA → %dA",
+                    vehicle.name or vehicle.id,
+                    current,
+                    new_limit,
+                )
+            # A suppressed cut is already requested and the car is still
+            # ramping down to it — it is an adjustment in effect all the same.
+            changed = True
     return changed
 
 
 def _apply_priority(
-    charging: list[tuple[VehicleConfig, TeslaAPI, dict]],
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
     em_amps: float,
     home_max_amps: float,
+    clock: Clock = system_clock,
 ) -> bool:
     """
     Reduce vehicles one at a time in reverse priority order.
 
     Order is lowest priority to highest priority, until overload is resolved.
 
-    Returns True if at least one vehicle's limit was changed.
+    Returns True if at least one vehicle's limit was changed or is already on
+    its way to the reduced value; False if none needed to or every command
+    failed.
     """
     # Sort ascending priority number: higher number = lower priority = reduce first
     sorted_charging = sorted(charging, key=lambda x: -x[0].priority)
     remaining_excess = em_amps - home_max_amps
     changed = False
 
-    for vehicle, api, data in sorted_charging:
+    for vehicle, api, snapshot in sorted_charging:
         if remaining_excess <= 0:
             break
-        current = float(data["charge_state"]["charger_actual_current"])
+        current = snapshot.actual_current
         # How much can we reduce this vehicle?
         reducible = current - vehicle.chargerMinAmps
         if reducible <= 0:
@@ -271,18 +393,73 @@ def _apply_priority(
 
         if new_limit != math.floor(current):
             try:
-                api.set_charge_amp_limit(new_limit)
-                telemetry_cache.invalidate(vehicle.id)
-                remaining_excess -= reduction
-                changed = True
+                sent = amp_commands.send(vehicle, api, new_limit, snapshot, clock)
             except HTTPException:
                 tsc_logger.exception("Failed to set charge limit for %s", vehicle.id)
+                continue
+            if sent:
+                tsc_logger.info(
+                    "Reducing %s: %.0fA → %dA",
+                    vehicle.name or vehicle.id,
+                    current,
+                    new_limit,
+                )
+            # Suppressed or not, this car is heading to new_limit, so a
+            # higher-priority car must not be cut for the same excess.
+            remaining_excess -= reduction
+            changed = True
     return changed
 
 
 # ─── Public trigger (called by em_cron and the /overload HTTP endpoint) ────────
 
 
+def _apply_initial_step(
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
+    cfg: SystemConfig,
+    em_amps: float | None,
+    clock: Clock = system_clock,
+) -> tuple[bool, dict[str, float]]:
+    """
+    Apply the first response to an overload.
+
+    Returns whether any vehicle accepted a new limit, and each vehicle's
+    intended amp limit for the session's ramp-up ceiling.  *em_amps* is the
+    reading that raised the overload, if known.
+    """
+    # Capture the driver's requested limits while they're still visible in
+    # the vehicle data — the first step below overwrites them immediately.
+    intended_limits = {
+        vehicle.id: _intended_amp_limit(snapshot, vehicle)
+        for vehicle, _, snapshot in charging
+    }
+
+    # The closed-loop controller computes its first setpoint from the reading
+    # that raised the overload instead of applying a blind downstep.
+    if cfg.overloadStrategy == OverloadStrategy.CLOSED_LOOP and em_amps is not None:
+        state = _AdjustmentState(intended_amperage=dict(intended_limits))
+        _apply_closed_loop(charging, em_amps, cfg, state, clock)
+        return bool(state.setpoints), intended_limits
+
+    applied = False
+    for vehicle, api, snapshot in charging:
+        current = snapshot.actual_current
+        new_limit = round(current * cfg.downStepPercentage)
+        new_limit = max(int(vehicle.chargerMinAmps), new_limit)
+        try:
+            if amp_commands.send(vehicle, api, new_limit, snapshot, clock):
+                tsc_logger.info(
+                    "Initial downstep for %s: %.0fA → %dA",
+                    vehicle.name or vehicle.id,
+                    current,
+                    new_limit,
+                )
+                applied = True
+        except HTTPException:
+            tsc_logger.exception("Initial downstep failed for %s", vehicle.id)
+    return applied, intended_limits
+
+
 def trigger_overload(app_config: AppConfig) -> tuple[bool, str]:
     """
     Attempt to start an overload handling session.
@@ -300,37 +477,19 @@ def trigger_overload(app_config: AppConfig) -> tuple[bool, str]:
         return False, "no vehicles configured"
 
     cfg = app_config.system
-    initial_applied = False
-    intended_limits: dict[str, float] = {}
-
-    for vehicle in app_config.vehicles:
-        if not vehicle.enabled:
-            continue
-        try:
-            api = TeslaAPI(vehicle)
-            data = api.get_vehicle_data()
-        except HTTPException:
-            continue
-
-        if (
-            data.get("state") == "online"
-            and data.get("charge_state", {}).get("charging_state") == "Charging"
-        ):
-            # Capture the driver's requested limit while it's still visible in
-            # the vehicle data — the downstep below overwrites it immediately.
-            intended_limits[vehicle.id] = _intended_amp_limit(data, vehicle)
-            current = float(data["charge_state"]["charger_actual_current"])
-            new_limit = round(current * cfg.downStepPercentage)
-            new_limit = max(int(vehicle.chargerMinAmps), new_limit)
-            try:
-                api.set_charge_amp_limit(new_limit)
-                telemetry_cache.invalidate(vehicle.id)
-                initial_applied = True
-            except HTTPException:
-                tsc_logger.exception("Initial downstep failed for %s", vehicle.id)
+    apis = [(v, _overload_api(v)) for v in app_config.vehicles if v.enabled]
+    sample = energy_bus.bus.latest()
+    charging = _get_charging_vehicles(apis)
+    if not charging:
+        return False, "no vehicles are currently charging"
+    initial_applied, intended_limits = _apply_initial_step(
+        charging,
+        cfg,
+        sample.watts / cfg.voltage if sample is not None else None,
+    )
 
     if not initial_applied:
-        return False, "no vehicles are currently charging"
+        return False, "no charge limit needed changing"
 
     t = threading.Thread(
         target=handle_overload,
@@ -368,10 +527,16 @@ class _AdjustmentState:
     # vehicle id → user's requested amp limit, captured before any reduction so
     # ramp-up can restore it without overshooting a manual app setting.
     intended_amperage: dict[str, float] = field(default_factory=dict)
+    # closed_loop only: the controller and the last limit sent per vehicle.
+    controller: amp_controller.AmpController | None = None
+    setpoints: dict[str, int] = field(default_factory=dict)
 
 
 def _run_stabilisation_phase(
-    em_ctrl: EnergyMonitorController, app_config: AppConfig
+    em_ctrl: EnergyMonitorController,
+    app_config: AppConfig,
+    clock: Clock = system_clock,
+    bus: EnergyBus | None = None,
 ) -> None:
     """
     Wait for consumption to stabilise after the first downstep.
@@ -388,9 +553,9 @@ def _run_stabilisation_phase(
     consecutive_ok = 0
     max_iterations = _STABILISATION_BASE_ITERATIONS + _STABLE_READINGS_NEEDED - 1
     for _ in range(max_iterations):
-        time.sleep(cfg.sleepTimeSecs)
+        clock.sleep(cfg.sleepTimeSecs)
         cfg = app_config.system  # refresh
-        em_amps = _get_consumption(em_ctrl, app_config)
+        em_amps = _get_consumption(em_ctrl, app_config, bus)
         if em_amps <= cfg.homeMaxAmps:
             consecutive_ok += 1
             if consecutive_ok >= _STABLE_READINGS_NEEDED:
@@ -406,10 +571,11 @@ def _run_stabilisation_phase(
 
 
 def _apply_overload_reduction(
-    charging: list[tuple[VehicleConfig, TeslaAPI, dict]],
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
     em_amps: float,
     cfg: SystemConfig,
     state: _AdjustmentState,
+    clock: Clock = system_clock,
 ) -> bool:
     """Apply one overload-reduction iteration. Returns True to end the session."""
     state.ramp_up = False
@@ -423,10 +589,7 @@ def _apply_overload_reduction(
         return True
 
     # Check whether all vehicles are already at minimum before applying
-    all_at_min = all(
-        float(d["charge_state"]["charger_actual_current"]) <= v.chargerMinAmps
-        for v, _, d in charging
-    )
+    all_at_min = all(s.actual_current <= v.chargerMinAmps for v, _, s in charging)
     if all_at_min:
         tsc_logger.info("All vehicles at minimum charge limit — ending session.")
         return True
@@ -441,9 +604,9 @@ def _apply_overload_reduction(
     )
 
     if strategy == OverloadStrategy.PRIORITY:
-        changed = _apply_priority(charging, em_amps, cfg.homeMaxAmps)
+        changed = _apply_priority(charging, em_amps, cfg.homeMaxAmps, clock)
     else:
-        changed = _apply_proportional(charging, em_amps, cfg.homeMaxAmps)
+        changed = _apply_proportional(charging, em_amps, cfg.homeMaxAmps, clock)
 
     # Only count iterations where no adjustment could be made
     if not changed:
@@ -454,15 +617,16 @@ def _apply_overload_reduction(
 
 
 def _apply_ramp_up(
-    charging: list[tuple[VehicleConfig, TeslaAPI, dict]],
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
     em_amps: float,
     cfg: SystemConfig,
     state: _AdjustmentState,
+    clock: Clock = system_clock,
 ) -> bool:
     """Apply one ramp-up iteration. Returns True to end the session."""
     if not state.ramp_up:
         state.ramp_up = True
-        state.ramp_up_start = time.time()
+        state.ramp_up_start = clock.time()
         state.at_max_count = 0
         tsc_logger.info(
             "Consumption within limits (%.2fA ≤ %.2fA) — ramping up.",
@@ -471,14 +635,14 @@ def _apply_ramp_up(
         )
 
     # Ramp-up phase duration guard (cannot exceed maxSessionDuration)
-    if time.time() - state.ramp_up_start > cfg.maxSessionDuration:
+    if clock.time() - state.ramp_up_start > cfg.maxSessionDuration:
         tsc_logger.info("Ramp-up phase max duration reached — ending session.")
         return True
 
     # Try to increase charge limit for each vehicle, never past its intended
     # ceiling so a manual app limit (e.g. 20A) is restored, not overridden.
-    for vehicle, api, data in charging:
-        current = float(data["charge_state"]["charger_actual_current"])
+    for vehicle, api, snapshot in charging:
+        current = snapshot.actual_current
         ceiling = _ramp_up_ceiling(vehicle, state.intended_amperage)
         if current >= ceiling:
             continue
@@ -487,22 +651,20 @@ def _apply_ramp_up(
         new_limit = max(int(vehicle.chargerMinAmps), math.floor(new_limit))
         if new_limit > math.floor(current):
             try:
-                api.set_charge_amp_limit(new_limit)
-                telemetry_cache.invalidate(vehicle.id)
-                tsc_logger.info(
-                    "Ramping up %s: %.0fA → %.0fA",
-                    vehicle.name or vehicle.id,
-                    current,
-                    new_limit,
-                )
+                if amp_commands.send(vehicle, api, new_limit, snapshot, clock):
+                    tsc_logger.info(
+                        "Ramping up %s: %.0fA → %.0fA",
+                        vehicle.name or vehicle.id,
+                        current,
+                        new_limit,
+                    )
             except HTTPException:
                 tsc_logger.exception("Failed to ramp up %s", vehicle.id)
 
     # Check if all vehicles are at their intended ceiling
     all_at_max = all(
-        float(d["charge_state"]["charger_actual_current"])
-        >= _ramp_up_ceiling(v, state.intended_amperage) - 1.0
-        for v, _, d in charging
+        s.actual_current >= _ramp_up_ceiling(v, state.intended_amperage) - 1.0
+        for v, _, s in charging
     )
     if all_at_max:
         state.at_max_count += 1
@@ -519,8 +681,101 @@ def _apply_ramp_up(
     return False
 
 
-def handle_overload(
-    app_config: AppConfig, intended_limits: dict[str, float] | None = None
+def _apply_closed_loop(
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
+    em_amps: float,
+    cfg: SystemConfig,
+    state: _AdjustmentState,
+    clock: Clock = system_clock,
+) -> bool:
+    """
+    Apply one closed-loop iteration. Returns True to end the session.
+
+    A single controller handles both directions — cutting on overload and
+    giving current back once it clears — so there is no separate ramp-up
+    phase.  The total setpoint is shared across vehicles by
+    `amp_controller.allocate`, never above each one's ramp-up ceiling.
+    """
+    target = cfg.homeMaxAmps - cfg.targetHeadroomAmps
+    if state.controller is None:
+        state.controller = amp_controller.AmpController(target_amps=target)
+    state.controller.target_amps = target  # follow config changes mid-session
+
+    currents = [s.actual_current for _, _, s in charging]
+    limits = []
+    for vehicle, _, _ in charging:
+        low = float(vehicle.chargerMinAmps)
+        limits.append(
+            (low, max(low, _ramp_up_ceiling(vehicle, state.intended_amperage)))
+        )
+    total = state.controller.update(
+        em_amps,
+        sum(currents),
+        sum(low for low, _ in limits),
+        sum(high for _, high in limits),
+    )
+    tsc_logger.info(
+        "Closed loop | em=%.2fA | target=%.2fA | vehicles=%.2fA → %.2fA",
+        em_amps,
+        target,
+        sum(currents),
+        total,
+    )
+
+    for (vehicle, api, snapshot), current, new_limit in zip(
+        charging, currents, amp_controller.allocate(total, limits), strict=True
+    ):
+        if new_limit == state.setpoints.get(vehicle.id, math.floor(current)):
+            continue
+        try:
+            if amp_commands.send(vehicle, api, new_limit, snapshot, clock):
+                state.setpoints[vehicle.id] = new_limit
+        except HTTPException:
+            tsc_logger.exception("Failed to set charge limit for %s", vehicle.id)
+
+    at_ceiling = total >= sum(high for _, high in limits) - 1.0
+    at_floor = total <= sum(low for low, _ in limits)
+    if at_ceiling and em_amps <= cfg.homeMaxAmps:
+        state.at_max_count += 1
+        if state.at_max_count >= _CONSECUTIVE_MAX_NEEDED:
+            tsc_logger.info("Overload resolved — ending session.")
+            return True
+    else:
+        state.at_max_count = 0
+    if at_floor and em_amps > cfg.homeMaxAmps:
+        state.no_change_count += 1
+        if state.no_change_count >= constants.MAX_QUERIES:
+            tsc_logger.info("All vehicles at minimum charge limit — ending session.")
+            return True
+    else:
+        state.no_change_count = 0
+    return False
+
+
+def _apply_iteration(
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]],
+    em_amps: float,
+    cfg: SystemConfig,
+    state: _AdjustmentState,
+    clock: Clock = system_clock,
+) -> bool:
+    """Run one adjustment iteration of the configured strategy. True ends it."""
+    if cfg.overloadStrategy == OverloadStrategy.CLOSED_LOOP:
+        return _apply_closed_loop(charging, em_amps, cfg, state, clock)
+    if em_amps > cfg.homeMaxAmps:
+        return _apply_overload_reduction(charging, em_amps, cfg, state, clock)
+    return _apply_ramp_up(charging, em_amps, cfg, state, clock)
+
+
+def handle_overload(  # noqa: PLR0913 — the extras are keyword-only injections
+    app_config: AppConfig,
+    intended_limits: dict[str, float] | None = None,
+    *,
+    em_ctrl: EnergyMonitorController | None = None,
+    api_factory: Callable[[VehicleConfig], TeslaAPI] = _overload_api,
+    persist: bool = True,
+    clock: Clock = system_clock,
+    bus: EnergyBus | None = None,
 ) -> None:
     """
     Top-level overload handler — runs in a dedicated thread.
@@ -528,39 +783,51 @@ def handle_overload(
     Reads the current overload strategy from AppConfig and applies it
     to all actively-charging vehicles.  Logs the event to the database.
     The session flag is always cleared in a finally block, even on error.
+
+    *em_ctrl*, *api_factory* and *persist* let the simulator run a session
+    against fake devices without touching the database; by default the
+    configured energy monitor and the real Tesla API are used.  All waiting
+    and timing goes through *clock* and readings through *bus*, so a session
+    can run in virtual time against a private bus.
     """
     _set_session(active=True)
-    start_time = time.strftime("%Y-%m-%d %H:%M:%S")
+    start_time = format_timestamp(clock.time())
     tsc_logger.info("Overload handler started. Supervised session begun.")
 
     # Keep a reference to the last known charging set so _save_event can use it
-    charging: list[tuple[VehicleConfig, TeslaAPI, dict]] = []
+    charging: list[tuple[VehicleConfig, TeslaAPI, ChargeSnapshot]] = []
 
     try:
         cfg = app_config.system
 
         # Instantiate energy monitor
-        try:
-            em_ctrl = _em_controller.create_energy_monitor_controller(
-                cfg.energyMonitorType, cfg.energyMonitorIp
-            )
-        except ValueError:
-            tsc_logger.exception(
-                "Invalid energy monitor type '%s'.", cfg.energyMonitorType
-            )
-            return
+        if em_ctrl is None:
+            try:
+                em_ctrl = _em_controller.create_energy_monitor_controller(
+                    cfg.energyMonitorType, cfg.energyMonitorIp
+                )
+            except ValueError:
+                tsc_logger.exception(
+                    "Invalid energy monitor type '%s'.", cfg.energyMonitorType
+                )
+                return
 
-        _run_stabilisation_phase(em_ctrl, app_config)
+        if cfg.overloadStrategy == OverloadStrategy.CLOSED_LOOP:
+            # The controller settles in an iteration or two; just give its
+            # first setpoint time to take effect.
+            clock.sleep(cfg.sleepTimeSecs)
+        else:
+            _run_stabilisation_phase(em_ctrl, app_config, clock, bus)
 
         # ── Supervised adjustment loop ───────────────────────────────────────
         state = _AdjustmentState(intended_amperage=intended_limits or {})
-        session_start_ts = time.time()
+        session_start_ts = clock.time()
 
         while True:
             cfg = app_config.system  # always act on fresh config
 
             # Max total session duration guard
-            elapsed = time.time() - session_start_ts
+            elapsed = clock.time() - session_start_ts
             if elapsed > cfg.maxSessionDuration:
                 tsc_logger.info(
                     "Session max duration reached (%.0fs) — ending session.",
@@ -569,26 +836,22 @@ def handle_overload(
                 break
 
             # Refresh vehicle API references in case tokens were updated
-            apis = [(v, TeslaAPI(v)) for v in app_config.vehicles if v.enabled]
+            apis = [(v, api_factory(v)) for v in app_config.vehicles if v.enabled]
 
-            charging = _get_charging_vehicles(apis)
+            charging = _get_charging_vehicles(apis, clock=clock)
             if not charging:
                 tsc_logger.info("No vehicles actively charging — ending session.")
                 break
 
-            em_amps = _get_consumption(em_ctrl, app_config)
+            em_amps = _get_consumption(em_ctrl, app_config, bus)
             if em_amps == 0.0:
                 tsc_logger.warning("Consumption read returned 0 — ending session.")
                 break
 
-            if em_amps > cfg.homeMaxAmps:
-                session_ended = _apply_overload_reduction(charging, em_amps, cfg, state)
-            else:
-                session_ended = _apply_ramp_up(charging, em_amps, cfg, state)
-            if session_ended:
+            if _apply_iteration(charging, em_amps, cfg, state, clock):
                 break
 
-            time.sleep(cfg.sleepTimeSecs)
+            clock.sleep(cfg.sleepTimeSecs)
 
     # Deliberately broad: this is the thread's top-level guard — any
     # unexpected error must be logged, not crash the thread silently.
@@ -596,7 +859,8 @@ def handle_overload(
         tsc_logger.exception("Unhandled error in overload handler")
     finally:
         # Always persist the event and release the session lock
-        first_vid = charging[0][0].id if charging else None
-        _save_event(start_time, first_vid)
+        if persist:
+            first_vid = charging[0][0].id if charging else None
+            _save_event(start_time, first_vid, clock)
         _set_session(active=False)
         tsc_logger.info("Overload handler finished. Supervised session ended.")
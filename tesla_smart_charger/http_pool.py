@@ -0,0 +1,206 @@
+"""
+Process-wide pool of keep-alive HTTP sessions for outbound Tesla calls.
+
+Every ``TeslaAPI`` instance borrows its ``requests.Session`` from here, keyed by
+the target's base URL and the client certificate used for mutual TLS.  Reusing
+the session reuses its TCP + TLS connections, so a telemetry poll or a
+``set_charging_amps`` command no longer pays a fresh mTLS handshake with the
+tesla-http-proxy — and it doesn't matter that the overload loop builds new
+``TeslaAPI`` objects every iteration.
+
+Sessions that sit unused for longer than ``constants.HTTP_POOL_IDLE_SECS`` are
+closed on the next lookup, so a proxy that was reconfigured away doesn't keep
+sockets open forever.
+
+`AsyncTeslaAPI` gets the same treatment from `get_async_client`, with one
+difference: an ``httpx2.AsyncClient`` is bound to the event loop that first used
+it, so async clients are additionally keyed by the running loop.  Evicted
+async clients are closed on their own loop; `aclose_all` closes the rest at
+shutdown.
+"""
+
+import asyncio
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx2
+import requests
+from requests.adapters import HTTPAdapter
+
+from tesla_smart_charger import constants, logger
+
+tsc_logger = logger.get_logger()
+
+# (base_url, cert) → (last_used monotonic time, session)
+_PoolKey = tuple[str, tuple[str, str] | None]
+_sessions: dict[_PoolKey, tuple[float, requests.Session]] = {}
+_lock = threading.Lock()
+
+
+def base_url(url: str) -> str:
+    """Return the ``scheme://host[:port]`` part of *url* — the pool key."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _new_session(cert: tuple[str, str] | None, *, verify: bool) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=constants.HTTP_POOL_MAXSIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.cert = cert
+    session.verify = verify
+    if not verify:
+        # requests lets REQUESTS_CA_BUNDLE / CURL_CA_BUNDLE override a session's
+        # verify=False on every request unless it ignores the environment.
+        session.trust_env = False
+    return session
+
+
+def _evict_idle(now: float) -> None:
+    """Close sessions idle past the limit.  Caller must hold ``_lock``."""
+    idle_limit = constants.HTTP_POOL_IDLE_SECS
+    for key, (last_used, session) in list(_sessions.items()):
+        if now - last_used > idle_limit:
+            del _sessions[key]
+            session.close()
+            tsc_logger.debug("Closed idle HTTP session for %s", key[0])
+
+
+def get_session(url: str, tls: dict | None = None) -> requests.Session:
+    """
+    Return the shared session for *url*'s host and the given TLS settings.
+
+    *tls* takes the same ``verify`` / ``cert`` keys ``requests`` accepts; they
+    are baked into the session, so callers don't pass them per request.
+    """
+    tls = tls or {}
+    cert = tls.get("cert")
+    key = (base_url(url), cert)
+    now = time.monotonic()
+    with _lock:
+        _evict_idle(now)
+        entry = _sessions.get(key)
+        session = (
+            entry[1]
+            if entry is not None
+            else _new_session(cert, verify=tls.get("verify", True))
+        )
+        _sessions[key] = (now, session)
+    return session
+
+
+def close_all() -> None:
+    """
+    Close every pooled session — called between tests.
+
+    Async clients are closed on their own loops; one on the calling thread's
+    running loop only once it next yields, so coroutines use `aclose_all`.
+    """
+    with _lock:
+        sessions = [session for _, session in _sessions.values()]
+        _sessions.clear()
+        clients = list(_async_clients.items())
+        _async_clients.clear()
+    for session in sessions:
+        session.close()
+    for (loop, _, _), (_, client) in clients:
+        _close_async_client(loop, client)
+
+
+async def aclose_all() -> None:
+    """Close every pooled session and async client — called on shutdown."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        own = [key for key in _async_clients if key[0] is loop]
+        clients = [_async_clients.pop(key)[1] for key in own]
+    close_all()
+    await asyncio.gather(
+        *(client.aclose() for client in clients),
+        *[task for task in _closing if task.get_loop() is loop],
+    )
+
+
+# ─── asyncio ──────────────────────────────────────────────────────────────────
+
+# (loop, base_url, cert) → (last_used monotonic time, client)
+_AsyncPoolKey = tuple[asyncio.AbstractEventLoop, str, tuple[str, str] | None]
+_async_clients: dict[_AsyncPoolKey, tuple[float, httpx2.AsyncClient]] = {}
+# Close tasks in flight; the loop itself only holds weak references to them.
+_closing: set[asyncio.Future] = set()
+
+
+def _close_async_client(
+    loop: asyncio.AbstractEventLoop, client: httpx2.AsyncClient
+) -> None:
+    """Close *client* on the loop it is bound to, without waiting for it."""
+    if loop.is_closed():
+        # Nothing can run on it any more; its sockets go with the client.
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if loop is running:
+        task: asyncio.Future = loop.create_task(client.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    else:
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+def _ssl_context(cert: tuple[str, str] | None, *, verify: bool) -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    if not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if cert is not None:
+        context.load_cert_chain(*cert)
+    return context
+
+
+def _new_async_client(url: str, tls: dict) -> httpx2.AsyncClient:
+    limits = httpx2.Limits(
+        max_connections=constants.HTTP_POOL_MAXSIZE,
+        max_keepalive_connections=constants.HTTP_POOL_MAXSIZE,
+        keepalive_expiry=constants.HTTP_POOL_IDLE_SECS,
+    )
+    verify: ssl.SSLContext | bool = True
+    # Plain-http proxies never load the client cert — it may not even exist.
+    if urlsplit(url).scheme == "https" and tls:
+        verify = _ssl_context(tls.get("cert"), verify=tls.get("verify", True))
+    return httpx2.AsyncClient(verify=verify, limits=limits)
+
+
+def get_async_client(url: str, tls: dict | None = None) -> httpx2.AsyncClient:
+    """
+    Return the shared async client for *url*'s host on the running event loop.
+
+    *tls* takes the same ``verify`` / ``cert`` keys as `get_session`.  Must be
+    called from a coroutine.
+    """
+    tls = tls or {}
+    loop = asyncio.get_running_loop()
+    key = (loop, base_url(url), tls.get("cert"))
+    now = time.monotonic()
+    evicted = []
+    with _lock:
+        for stale_key, (last_used, stale) in list(_async_clients.items()):
+            if (
+                stale_key[0].is_closed()
+                or now - last_used > constants.HTTP_POOL_IDLE_SECS
+            ):
+                del _async_clients[stale_key]
+                evicted.append((stale_key[0], stale))
+        entry = _async_clients.get(key)
+        client = entry[1] if entry is not None else _new_async_client(url, tls)
+        _async_clients[key] = (now, client)
+    for stale_loop, stale in evicted:
+        _close_async_client(stale_loop, stale)
+        tsc_logger.debug("Closed idle async HTTP client.")
+    return client
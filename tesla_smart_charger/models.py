@@ -23,6 +23,22 @@ class OverloadStrategy(str, Enum):
     PRIORITY = (
         "priority"  # Vehicles reduced in priority order (1 = highest, reduce last)
     )
+    CLOSED_LOOP = "closed_loop"  # PI + feed-forward on total vehicle current
+
+
+class EnergyMonitorMode(str, Enum):
+    """How readings get from the energy monitor into the app."""
+
+    POLL = "poll"  # The app polls the device every energyMonitorPollSecs
+    PUSH = "push"  # The device pushes readings; polling only when they stop
+
+
+class CircuitState(str, Enum):
+    """Per-vehicle circuit breaker state (see circuit_breaker.py)."""
+
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # The vehicle is unreachable; requests fail instantly
+    HALF_OPEN = "half_open"  # One trial request decides whether it closes
 
 
 class AuthConfig(BaseModel):
@@ -33,6 +49,23 @@ class AuthConfig(BaseModel):
     passwordHash: str = ""  # bcrypt hash, empty means no auth
 
 
+class TelemetryPolicy(BaseModel):
+    """How long a vehicle's cached telemetry is served before it is refetched."""
+
+    # Charging, or any vehicle while an overload session is active.
+    chargingTtlSecs: float = 30.0
+    # Online but not charging — parked and idle.
+    idleTtlSecs: float = 120.0
+    # Asleep or unreachable: the TTL starts here and is multiplied by
+    # asleepBackoffFactor after every fetch that still finds it asleep, up to
+    # asleepMaxTtlSecs, so a car parked overnight is polled (and woken) rarely.
+    asleepTtlSecs: float = 300.0
+    asleepMaxTtlSecs: float = 3600.0
+    asleepBackoffFactor: float = 2.0
+    # Refetch straight after a command instead of on the next read.
+    refreshAfterCommand: bool = True
+
+
 class VehicleConfig(BaseModel):
     """Configuration and credentials for a single managed Tesla vehicle."""
 
@@ -49,6 +82,7 @@ class VehicleConfig(BaseModel):
     chargerMinAmps: float = 6.0
     priority: int = 1  # 1 = highest priority (reduced last in priority strategy)
     enabled: bool = True
+    telemetryPolicy: TelemetryPolicy = Field(default_factory=TelemetryPolicy)
 
 
 class SystemConfig(BaseModel):
@@ -59,10 +93,16 @@ class SystemConfig(BaseModel):
     region: TeslaRegion = TeslaRegion.EU
     energyMonitorIp: str = ""
     energyMonitorType: str = "shelly_em"
+    energyMonitorMode: EnergyMonitorMode = EnergyMonitorMode.POLL
+    # Poll interval in poll mode; in push mode, how long to go without a pushed
+    # reading before falling back to polling the device.
+    energyMonitorPollSecs: int = 15
     sleepTimeSecs: int = 30
     downStepPercentage: float = 0.5
     upStepPercentage: float = 0.25
     overloadStrategy: OverloadStrategy = OverloadStrategy.PROPORTIONAL
+    # closed_loop only: amps below homeMaxAmps the controller aims for.
+    targetHeadroomAmps: float = 1.0
     maxSessionDuration: int = (
         600  # Maximum supervised session duration in seconds (default 10 min)
     )
@@ -70,6 +110,9 @@ class SystemConfig(BaseModel):
     apiPort: int = 8000
     corsOrigins: list[str] = Field(default_factory=lambda: ["*"])
     auth: AuthConfig = Field(default_factory=AuthConfig)
+    # Shared secret that devices pushing readings or telemetry must present as
+    # "Authorization: Bearer <token>"; empty refuses every push.
+    ingestToken: str = ""
     configured: bool = False  # Set to True after completing the onboarding wizard
 
 
@@ -105,6 +148,10 @@ class VehicleStatus(BaseModel):
     # True whenever a background refresh is in flight, unlike `pending` which
     # only covers the very first fetch.
     refreshing: bool = False
+    # Fleet API requests left in this vehicle's budget per endpoint class
+    # ("data", "command", "wake"); see fleet_budget.py.
+    apiBudget: dict[str, int] = Field(default_factory=dict)
+    circuitState: CircuitState = CircuitState.CLOSED
 
 
 class SystemStatus(BaseModel):
@@ -0,0 +1,133 @@
+"""
+Due-time ordered refresh queue served by a fixed pool of worker threads.
+
+`telemetry_cache` used to start a thread per refresh.  `RefreshScheduler`
+instead keeps at most one queued entry per key in a heap ordered by due time,
+and ``workers`` long-lived threads take whichever entry falls due first — so
+the thread count stays flat however many vehicles there are and however
+often they are read.
+
+Requests for the same key collapse: scheduling a key that is already queued
+only ever moves it earlier, and scheduling one that is running queues a
+single re-run for when it finishes.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+
+from tesla_smart_charger import constants, logger
+
+tsc_logger = logger.get_logger()
+
+
+class RefreshScheduler:
+    """Run ``run(key)`` for each scheduled key once it falls due."""
+
+    def __init__(
+        self,
+        run: Callable[[str], None],
+        workers: int = constants.TELEMETRY_REFRESH_WORKERS,
+        name: str = "tsc_refresh",
+    ) -> None:
+        """Serve *run* with up to *workers* threads, started on first use."""
+        self._run = run
+        self._workers = max(1, workers)
+        self._name = name
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, str]] = []
+        self._due: dict[str, float] = {}  # queued key → its (earliest) due time
+        self._running: set[str] = set()
+        self._rerun: dict[str, float] = {}  # running key → due time of its next run
+        self._seq = itertools.count()  # heap tie-breaker
+        self._threads: list[threading.Thread] = []
+
+    def schedule(self, key: str, delay: float = 0.0) -> bool:
+        """
+        Run *key* in *delay* seconds, unless it is already due by then.
+
+        Returns True if this call queued or brought forward a run.
+        """
+        due = time.monotonic() + delay
+        with self._cond:
+            pending = self._rerun if key in self._running else self._due
+            current = pending.get(key)
+            if current is not None and current <= due:
+                return False
+            if key in self._running:
+                self._rerun[key] = due
+                return True
+            self._push(key, due)
+            self._start_workers()
+        return True
+
+    def is_pending(self, key: str) -> bool:
+        """Whether *key* is running, or queued and already due."""
+        with self._cond:
+            if key in self._running:
+                return True
+            due = self._due.get(key)
+            return due is not None and due <= time.monotonic()
+
+    def reset(self) -> None:
+        """Drop every queued run — used between tests."""
+        with self._cond:
+            self._heap.clear()
+            self._due.clear()
+            self._rerun.clear()
+
+    # ─── Internal helpers ──────────────────────────────────────────────────────
+
+    def _push(self, key: str, due: float) -> None:
+        """Queue *key* at *due* and wake a worker; call with the lock held."""
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, next(self._seq), key))
+        self._cond.notify()
+
+    def _start_workers(self) -> None:
+        """Start the worker threads not yet running; call with the lock held."""
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self._name}_{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _take_due(self) -> str:
+        """Block until a queued key is due, then dequeue it; lock held."""
+        while True:
+            # Entries superseded by an earlier due time are skipped lazily.
+            while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._cond.wait()
+                continue
+            due, _, key = self._heap[0]
+            wait = due - time.monotonic()
+            if wait <= 0:
+                heapq.heappop(self._heap)
+                del self._due[key]
+                self._running.add(key)
+                return key
+            self._cond.wait(wait)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                key = self._take_due()
+            try:
+                self._run(key)
+            # Deliberately broad: a failed run must not take a shared worker
+            # down with it.
+            except Exception:
+                tsc_logger.exception("Scheduled refresh failed for %s", key)
+            finally:
+                with self._cond:
+                    self._running.discard(key)
+                    due = self._rerun.pop(key, None)
+                    if due is not None:
+                        self._push(key, due)
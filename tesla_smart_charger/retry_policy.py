@@ -0,0 +1,75 @@
+"""
+When to retry a failed Tesla Fleet API call, and after how long.
+
+Retrying blindly wastes the overload loop's time and the vehicle's request
+budget on errors that can't succeed on a second try, so failures are
+classified by the status `BaseTeslaClient._raise` mapped them to:
+
+* 401 / 403 / 404 and other client errors — never retried; the token, the
+  scopes or the vehicle id is wrong and stays wrong.
+* 408 — the car is asleep or out of reach.  One quick retry, after which the
+  caller may choose to wake it (see ``wake`` on the client methods).
+* 429 — retried after the ``Retry-After`` Tesla sent, if any.  A refusal by
+  our own `fleet_budget` is not retried: it would be refused again.
+* 5xx and transport errors (mapped to 502) — exponential backoff, until the
+  vehicle's `circuit_breaker` opens; its `CircuitOpenError` is final.
+
+Every call also has an overall deadline from its caller; a retry whose wait
+would overrun it is not attempted.
+"""
+
+import email.utils
+import time
+
+from fastapi import HTTPException
+
+from tesla_smart_charger import constants
+from tesla_smart_charger.circuit_breaker import CircuitOpenError
+from tesla_smart_charger.fleet_budget import BudgetExceededError
+
+MAX_ATTEMPTS = 5
+# Wait before the single retry of a 408.
+TIMEOUT_RETRY_SECS = 1.0
+# Backoff for server errors: REQUEST_DELAY_MS, doubling, capped at this.
+MAX_BACKOFF_SECS = 5.0
+
+_REQUEST_TIMEOUT = 408
+_TOO_MANY_REQUESTS = 429
+
+
+def _retry_after_secs(exc: HTTPException) -> float | None:
+    """Parse ``Retry-After`` (delta seconds or an HTTP date), if present."""
+    value = (exc.headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def next_delay(exc: Exception, attempt: int) -> float | None:
+    """
+    Return how long to wait before retrying after failed attempt *attempt*.
+
+    ``None`` means give up and re-raise *exc*.  Attempts are numbered from 1.
+    """
+    if attempt >= MAX_ATTEMPTS or not isinstance(exc, HTTPException):
+        return None
+    status = exc.status_code
+    if isinstance(exc, (BudgetExceededError, CircuitOpenError)):
+        return None
+    if status == _REQUEST_TIMEOUT:
+        return TIMEOUT_RETRY_SECS if attempt == 1 else None
+    if status == _TOO_MANY_REQUESTS:
+        retry_after = _retry_after_secs(exc)
+        if retry_after is not None:
+            return retry_after
+    elif status < 500:  # every other 4xx is final
+        return None
+    return min(constants.REQUEST_DELAY_MS / 1000 * 2 ** (attempt - 1), MAX_BACKOFF_SECS)
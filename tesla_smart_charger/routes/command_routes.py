@@ -1,13 +1,17 @@
 """
 Vehicle command endpoints — /api/v1/vehicles/{id}/...
 
-Commands that change vehicle state invalidate the telemetry cache so the
-dashboard refetches instead of showing pre-command values for up to the
+Commands that change vehicle state invalidate the telemetry cache and start
+a refetch, so the dashboard doesn't show pre-command values for up to the
 cache TTL.
 
 Every route here has physical-world effects, so the whole router sits behind
 ``security.require_auth`` — which fails closed when Basic Auth has not been
 configured.  See `tesla_smart_charger/security.py`.
+
+Handlers that talk to Tesla are ``async def`` and use `AsyncTeslaAPI`, so a
+slow or sleeping car waits on the event loop instead of holding one of the
+threadpool workers that serve the sync routes.
 """
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -16,11 +20,15 @@ from pydantic import BaseModel, Field
 
 from tesla_smart_charger import constants, logger, security, telemetry_cache
 from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.async_tesla_api import AsyncTeslaAPI
 from tesla_smart_charger.models import VehicleConfig
-from tesla_smart_charger.tesla_api import TeslaAPI
 
 tsc_logger = logger.get_logger()
 
+# A woken car takes a few seconds to come online; refetching sooner would
+# only find it asleep and back its telemetry TTL off.
+_WAKE_SETTLE_SECS = 10.0
+
 router = APIRouter(
     prefix="/api/v1/vehicles",
     tags=["commands"],
@@ -56,7 +64,7 @@ def _require_vehicle(vehicle_id: str) -> VehicleConfig:
 
 
 @router.post("/{vehicle_id}/wake")
-def wake_vehicle(vehicle_id: str) -> JSONResponse:
+async def wake_vehicle(vehicle_id: str) -> JSONResponse:
     """
     Ask Tesla to wake a vehicle.
 
@@ -64,8 +72,8 @@ def wake_vehicle(vehicle_id: str) -> JSONResponse:
     seconds to actually come online.
     """
     vehicle = _require_vehicle(vehicle_id)
-    data = TeslaAPI(vehicle).wake_up()
-    telemetry_cache.invalidate(vehicle.id)
+    data = await AsyncTeslaAPI(vehicle).wake_up()
+    telemetry_cache.after_command(vehicle, delay=_WAKE_SETTLE_SECS)
     return JSONResponse(
         {"message": "Wake requested", "state": data.get("state")},
         status_code=202,
@@ -73,11 +81,11 @@ def wake_vehicle(vehicle_id: str) -> JSONResponse:
 
 
 @router.post("/{vehicle_id}/charge-limit")
-def set_charge_limit(vehicle_id: str, body: ChargeLimitBody) -> JSONResponse:
+async def set_charge_limit(vehicle_id: str, body: ChargeLimitBody) -> JSONResponse:
     """Set a vehicle's target state of charge."""
     vehicle = _require_vehicle(vehicle_id)
-    TeslaAPI(vehicle).set_charge_limit(body.percent)
-    telemetry_cache.invalidate(vehicle.id)
+    await AsyncTeslaAPI(vehicle).set_charge_limit(body.percent)
+    telemetry_cache.after_command(vehicle)
     return JSONResponse(
         {"message": f"Charge limit set to {body.percent}%", "percent": body.percent},
         status_code=200,
@@ -102,11 +110,11 @@ def refresh_vehicle(vehicle_id: str) -> JSONResponse:
 
 
 @router.post("/{vehicle_id}/charge/start")
-def start_charge(vehicle_id: str) -> JSONResponse:
+async def start_charge(vehicle_id: str) -> JSONResponse:
     """Start charging the vehicle."""
     vehicle = _require_vehicle(vehicle_id)
-    TeslaAPI(vehicle).start_charge()
-    telemetry_cache.invalidate(vehicle.id)
+    await AsyncTeslaAPI(vehicle).start_charge()
+    telemetry_cache.after_command(vehicle)
     return JSONResponse(
         {"message": "Charge start requested"},
         status_code=200,
@@ -114,11 +122,11 @@ def start_charge(vehicle_id: str) -> JSONResponse:
 
 
 @router.post("/{vehicle_id}/charge/stop")
-def stop_charge(vehicle_id: str) -> JSONResponse:
+async def stop_charge(vehicle_id: str) -> JSONResponse:
     """Stop charging the vehicle."""
     vehicle = _require_vehicle(vehicle_id)
-    TeslaAPI(vehicle).stop_charge()
-    telemetry_cache.invalidate(vehicle.id)
+    await AsyncTeslaAPI(vehicle).stop_charge()
+    telemetry_cache.after_command(vehicle)
     return JSONResponse(
         {"message": "Charge stop requested"},
         status_code=200,
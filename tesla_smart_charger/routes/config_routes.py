@@ -10,7 +10,11 @@ from pydantic import BaseModel
 
 from tesla_smart_charger import logger
 from tesla_smart_charger.app_config import AppConfig
-from tesla_smart_charger.models import OverloadStrategy, TeslaRegion
+from tesla_smart_charger.models import (
+    EnergyMonitorMode,
+    OverloadStrategy,
+    TeslaRegion,
+)
 
 tsc_logger = logger.get_logger()
 
@@ -40,13 +44,17 @@ class SystemConfigUpdate(BaseModel):
     region: TeslaRegion | None = None
     energyMonitorIp: str | None = None
     energyMonitorType: str | None = None
+    energyMonitorMode: EnergyMonitorMode | None = None
+    energyMonitorPollSecs: int | None = None
     sleepTimeSecs: int | None = None
     downStepPercentage: float | None = None
     upStepPercentage: float | None = None
     overloadStrategy: OverloadStrategy | None = None
+    targetHeadroomAmps: float | None = None
     maxSessionDuration: int | None = None
     hostIp: str | None = None
     apiPort: int | None = None
+    ingestToken: str | None = None
     configured: bool | None = None
 
 
@@ -103,9 +111,10 @@ def get_config() -> JSONResponse:
     if _app_config is None:
         raise HTTPException(status_code=503, detail="Not initialised")
     data = _app_config.system.model_dump()
-    # Redact password hash from the response
+    # Redact password hash and ingest token from the response
     if "auth" in data:
         data["auth"].pop("passwordHash", None)
+    data.pop("ingestToken", None)
     return JSONResponse(data, status_code=200)
 
 
@@ -126,4 +135,5 @@ def update_config(body: SystemConfigUpdate) -> JSONResponse:
     data = new_cfg.model_dump()
     if "auth" in data:
         data["auth"].pop("passwordHash", None)
+    data.pop("ingestToken", None)
     return JSONResponse(data, status_code=200)
@@ -0,0 +1,51 @@
+"""GET /api/v1/consumption — downsampled live consumption history."""
+
+import math
+import time
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from tesla_smart_charger import constants, consumption_history, logger
+
+tsc_logger = logger.get_logger()
+
+router = APIRouter(prefix="/api/v1", tags=["consumption"])
+
+
+@router.get("/consumption")
+def get_consumption(
+    since: Annotated[
+        float | None,
+        Query(description="Epoch seconds; only newer samples (default: last hour)"),
+    ] = None,
+    resolution: Annotated[int, Query(ge=1, description="Bucket width in seconds")] = 60,
+) -> JSONResponse:
+    """
+    Return recent home consumption as min / max / mean buckets.
+
+    Samples come from the in-memory 24 h history fed by the energy bus.  When
+    the window would yield more than ``CONSUMPTION_MAX_BUCKETS`` buckets the
+    resolution is coarsened; the response reports the one actually used.
+    """
+    if since is not None and not math.isfinite(since):
+        # NaN would survive max() below and make math.ceil raise.
+        raise HTTPException(status_code=400, detail="since must be a finite number")
+    now = time.time()
+    if since is None:
+        since = now - 3600
+    since = max(since, now - constants.CONSUMPTION_HISTORY_CAPACITY)
+    span = max(now - since, 0.0)
+    resolution = max(resolution, math.ceil(span / constants.CONSUMPTION_MAX_BUCKETS))
+    history = consumption_history.history
+    buckets = history.buckets(since, resolution)
+    return JSONResponse(
+        {
+            "since": since,
+            "resolution": resolution,
+            "channels": history.channels,
+            "buckets": buckets,
+        },
+        status_code=200,
+    )
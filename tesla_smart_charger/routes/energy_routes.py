@@ -0,0 +1,72 @@
+"""
+Energy-monitor push ingestion — /api/v1/energy-monitor/push.
+
+In push mode the energy monitor reports each reading here (a webhook or any
+local script) instead of waiting to be polled.  Readings go straight onto the
+energy bus, where the monitor cron evaluates them at once — so a forged one
+could hide a real overload, and every push must carry the ``ingestToken``.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from tesla_smart_charger import energy_bus, logger, security
+from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.models import EnergyMonitorMode
+
+tsc_logger = logger.get_logger()
+
+router = APIRouter(prefix="/api/v1/energy-monitor", tags=["energy"])
+
+_app_config: AppConfig | None = None
+
+
+def init(app_config: AppConfig) -> None:
+    """Inject the shared AppConfig instance used by this router."""
+    global _app_config
+    _app_config = app_config
+
+
+class EmeterReading(BaseModel):
+    """One channel of a Shelly-style status document."""
+
+    power: float = 0.0
+
+
+class PushBody(BaseModel):
+    """
+    A pushed reading.
+
+    Either a total ``power`` in watts, or the ``emeters`` list of a Shelly
+    ``/status`` document, whose channels are summed like a polled reading.
+    """
+
+    power: float | None = None
+    emeters: list[EmeterReading] = Field(default_factory=list)
+
+
+def _accept(emeters: tuple[float, ...]) -> JSONResponse:
+    """Publish a pushed per-channel reading, or refuse it when push mode is off."""
+    if _app_config is None:
+        raise HTTPException(status_code=503, detail="Not initialised")
+    if _app_config.system.energyMonitorMode != EnergyMonitorMode.PUSH:
+        raise HTTPException(
+            status_code=409,
+            detail="Energy monitor is not in push mode (energyMonitorMode).",
+        )
+    sample = energy_bus.bus.publish(sum(emeters), energy_bus.SOURCE_PUSH, emeters)
+    return JSONResponse({"seq": sample.seq, "watts": sample.watts}, status_code=202)
+
+
+@router.post("/push", dependencies=[Depends(security.require_ingest_token)])
+def push_reading(body: PushBody) -> JSONResponse:
+    """Accept a JSON reading pushed by the energy monitor."""
+    if body.power is None and not body.emeters:
+        raise HTTPException(status_code=422, detail="Provide power or emeters.")
+    emeters = (
+        (body.power,)
+        if body.power is not None
+        else tuple(emeter.power for emeter in body.emeters)
+    )
+    return _accept(emeters)
@@ -0,0 +1,59 @@
+"""
+Fleet Telemetry ingestion — /api/v1/fleet-telemetry.
+
+The telemetry server relays each decoded record a vehicle streams to it here.
+Records are matched to a configured vehicle by VIN and merged into
+`fleet_telemetry.stream`, which the telemetry cache and the overload session
+read instead of polling ``vehicle_data``.  A forged record could claim a car
+has stopped charging, so the relay must present the ``ingestToken``.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from tesla_smart_charger import fleet_telemetry, logger, security
+from tesla_smart_charger.app_config import AppConfig
+
+tsc_logger = logger.get_logger()
+
+router = APIRouter(prefix="/api/v1/fleet-telemetry", tags=["telemetry"])
+
+_app_config: AppConfig | None = None
+
+
+def init(app_config: AppConfig) -> None:
+    """Inject the shared AppConfig instance used by this router."""
+    global _app_config
+    _app_config = app_config
+
+
+class TelemetryDatum(BaseModel):
+    """One signal of a record, e.g. ``{"key": "ChargeAmps", "value": {...}}``."""
+
+    key: str
+    value: dict[str, object] = Field(default_factory=dict)
+
+
+class TelemetryRecord(BaseModel):
+    """A decoded Fleet Telemetry record, as the telemetry server emits it."""
+
+    vin: str
+    createdAt: str | None = None
+    data: list[TelemetryDatum] = Field(default_factory=list)
+
+
+@router.post("", dependencies=[Depends(security.require_ingest_token)])
+def ingest_record(record: TelemetryRecord) -> JSONResponse:
+    """Merge a streamed record into its vehicle's signals."""
+    if _app_config is None:
+        raise HTTPException(status_code=503, detail="Not initialised")
+    vehicle = next((v for v in _app_config.vehicles if v.vin == record.vin), None)
+    if vehicle is None:
+        raise HTTPException(
+            status_code=404, detail=f"No vehicle configured with VIN {record.vin}."
+        )
+    charge_state = fleet_telemetry.decode([d.model_dump() for d in record.data])
+    fleet_telemetry.stream.ingest(vehicle.id, charge_state)
+    tsc_logger.debug("Streamed telemetry for %s: %s", vehicle.id, charge_state)
+    return JSONResponse({"signals": len(charge_state)}, status_code=202)
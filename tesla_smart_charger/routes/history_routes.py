@@ -1,10 +1,21 @@
-"""GET /api/v1/history — paginated, filterable overload event history."""
+"""
+GET /api/v1/history — paginated, filterable overload event history.
 
+Pages are keyset-paginated: each response carries ``next_cursor``, which the
+client passes back as ``cursor`` for the following page (null on the last).
+GET /api/v1/history/export streams every matching event as CSV or NDJSON.
+"""
+
+import csv
+import io
+import json
 import sqlite3
-from typing import Annotated
+import time
+from collections.abc import Iterator
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from tesla_smart_charger import constants, logger
 from tesla_smart_charger.controllers import db_controller
@@ -13,6 +24,31 @@ tsc_logger = logger.get_logger()
 
 router = APIRouter(prefix="/api/v1", tags=["history"])
 
+_DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+def _date_bound(name: str, value: str) -> str:
+    """
+    Validate a from_date/to_date filter, raising 400 if it is malformed.
+
+    SQLite turns an unparseable date into NULL, which would silently match
+    nothing (or everything) instead of telling the caller about the typo.
+    It only reads zero-padded fields, so the value must round-trip exactly.
+    """
+    if not value:
+        return value
+    for fmt in _DATE_FORMATS:
+        try:
+            parsed = time.strptime(value, fmt)
+        except ValueError:
+            continue
+        if time.strftime(fmt, parsed) == value:
+            return value
+    raise HTTPException(
+        status_code=400,
+        detail=f"Invalid {name}: expected YYYY-MM-DD or YYYY-MM-DD HH:MM:SS",
+    )
+
 
 @router.get("/history")
 def get_history(
@@ -26,24 +62,33 @@ def get_history(
     to_date: Annotated[
         str, Query(description="Upper bound (YYYY-MM-DD HH:MM:SS)")
     ] = "",
+    cursor: Annotated[str, Query(description="next_cursor of the previous page")] = "",
 ) -> JSONResponse:
-    """Return filtered overload event history."""
+    """Return one page of filtered overload event history, newest first."""
+    from_date = _date_bound("from_date", from_date)
+    to_date = _date_bound("to_date", to_date)
     ctrl = None
     try:
         ctrl = db_controller.create_database_controller(
             constants.DB_TYPE, constants.DB_NAME, constants.DB_FILE_PATH
         )
         ctrl.initialize_db()
-        if hasattr(ctrl, "get_data_filtered"):
-            data = ctrl.get_data_filtered(
+        if hasattr(ctrl, "get_page"):
+            data, next_cursor = ctrl.get_page(
                 num_records=limit,
                 vehicle_id=vehicle_id,
                 from_date=from_date,
                 to_date=to_date,
+                cursor=cursor,
             )
         else:
-            data = ctrl.get_data(limit)
-        return JSONResponse({"data": data, "count": len(data)}, status_code=200)
+            data, next_cursor = ctrl.get_data(limit), None
+        return JSONResponse(
+            {"data": data, "count": len(data), "next_cursor": next_cursor},
+            status_code=200,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
     except Exception as exc:
         tsc_logger.exception("History query failed")
         raise HTTPException(status_code=500, detail="Database error") from exc
@@ -55,6 +100,121 @@ def get_history(
                 tsc_logger.debug("Error closing DB connection: %s", exc)
 
 
+# Declared before /history/{num_records}, which would otherwise claim "stats"
+# and "export".
+@router.get("/history/stats")
+def get_history_stats(
+    vehicle_id: Annotated[str, Query(description="Filter by vehicle UUID")] = "",
+    days: Annotated[int, Query(ge=1, le=366, description="Daily buckets")] = 30,
+    weeks: Annotated[int, Query(ge=1, le=104, description="Weekly buckets")] = 12,
+    months: Annotated[int, Query(ge=1, le=120, description="Monthly buckets")] = 12,
+) -> JSONResponse:
+    """Return overload counts and duration percentiles, overall and per vehicle."""
+    ctrl = None
+    try:
+        ctrl = db_controller.create_database_controller(
+            constants.DB_TYPE, constants.DB_NAME, constants.DB_FILE_PATH
+        )
+        ctrl.initialize_db()
+        stats = ctrl.get_stats(
+            vehicle_id=vehicle_id, days=days, weeks=weeks, months=months
+        )
+        return JSONResponse(stats, status_code=200)
+    except Exception as exc:
+        tsc_logger.exception("History stats query failed")
+        raise HTTPException(status_code=500, detail="Database error") from exc
+    finally:
+        if ctrl:
+            try:
+                ctrl.close_connection()
+            except sqlite3.Error as exc:
+                tsc_logger.debug("Error closing DB connection: %s", exc)
+
+
+_EXPORT_COLUMNS = ("id", "start", "end", "duration", "vehicle_id", "start_ts", "end_ts")
+_EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _csv_chunk(rows: list[dict], *, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, _EXPORT_COLUMNS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: list[dict]) -> str:
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+@router.get("/history/export")
+def export_history(
+    export_format: Annotated[
+        Literal["csv", "ndjson"], Query(alias="format", description="csv or ndjson")
+    ] = "csv",
+    vehicle_id: Annotated[str, Query(description="Filter by vehicle UUID")] = "",
+    from_date: Annotated[
+        str, Query(description="Lower bound (YYYY-MM-DD HH:MM:SS)")
+    ] = "",
+    to_date: Annotated[
+        str, Query(description="Upper bound (YYYY-MM-DD HH:MM:SS)")
+    ] = "",
+) -> StreamingResponse:
+    """Stream every matching overload event, newest first, as CSV or NDJSON."""
+    from_date = _date_bound("from_date", from_date)
+    to_date = _date_bound("to_date", to_date)
+    ctrl = None
+    try:
+        ctrl = db_controller.create_database_controller(
+            constants.DB_TYPE, constants.DB_NAME, constants.DB_FILE_PATH
+        )
+        ctrl.initialize_db()
+        pages = ctrl.iter_pages(
+            vehicle_id=vehicle_id, from_date=from_date, to_date=to_date
+        )
+        # Read the first page now, so a database error is still a 500 rather
+        # than a truncated 200.
+        first_page = next(pages, [])
+    except Exception as exc:
+        tsc_logger.exception("History export failed")
+        # On success the stream closes it once sent; here there is no stream.
+        if ctrl:
+            try:
+                ctrl.close_connection()
+            except sqlite3.Error as close_exc:
+                tsc_logger.debug("Error closing DB connection: %s", close_exc)
+        raise HTTPException(status_code=500, detail="Database error") from exc
+
+    def _chunks() -> Iterator[str]:
+        # Sync generator: Starlette runs each step in its threadpool, and only
+        # asks for the next page once the previous chunk has been sent.
+        try:
+            if export_format == "csv":
+                yield _csv_chunk(first_page, header=True)
+                for page in pages:
+                    yield _csv_chunk(page)
+            else:
+                yield _ndjson_chunk(first_page)
+                for page in pages:
+                    yield _ndjson_chunk(page)
+        except sqlite3.Error:
+            # Headers are already sent; the client sees a short download.
+            tsc_logger.exception("History export aborted")
+        finally:
+            ctrl.close_connection()
+
+    return StreamingResponse(
+        _chunks(),
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="overload-history.{export_format}"'
+            )
+        },
+    )
+
+
 # Backward-compatible endpoint kept for legacy em_cron self-calls
 @router.get("/history/{num_records}")
 def get_history_legacy(num_records: int) -> JSONResponse:
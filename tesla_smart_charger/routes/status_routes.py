@@ -1,13 +1,27 @@
-"""GET /api/v1/status — overall system health and live state."""
+"""
+GET /api/v1/status — overall system health and live state.
+
+``GET /api/v1/status/stream`` serves the same status as server-sent events:
+a full snapshot, then deltas as consumption, overload state or a vehicle's
+telemetry change.  Every open dashboard shares one producer; see
+`status_stream`.
+"""
 
 from collections.abc import Callable
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from tesla_smart_charger import logger, security, telemetry_cache
+from tesla_smart_charger import (
+    circuit_breaker,
+    energy_bus,
+    fleet_budget,
+    logger,
+    security,
+    status_stream,
+    telemetry_cache,
+)
 from tesla_smart_charger.app_config import AppConfig
-from tesla_smart_charger.cron import em_cron
 from tesla_smart_charger.models import SystemStatus
 
 tsc_logger = logger.get_logger()
@@ -32,30 +46,69 @@ def init(
     _overload_active_fn = overload_active_fn
 
 
-@router.get("/status", response_model=SystemStatus)
-def get_status() -> JSONResponse:
-    """Return overall system status including live vehicle states."""
+def _build_status() -> SystemStatus | None:
+    """Assemble the current status, or None before init()."""
     if _app_config is None:
-        return JSONResponse({"error": "Not initialised"}, status_code=503)
+        return None
 
     cfg = _app_config.system
     overload_active = _overload_active_fn() if callable(_overload_active_fn) else False
     vehicle_statuses = [
-        telemetry_cache.get(v, overload_active=overload_active)
+        telemetry_cache.get(v, overload_active=overload_active).model_copy(
+            update={
+                "apiBudget": fleet_budget.budget.remaining(v.id),
+                "circuitState": circuit_breaker.breakers.state(v.id),
+            }
+        )
         for v in _app_config.vehicles
     ]
+    # Latest reading on the shared energy bus; None until the first one, so
+    # the dashboard shows "—".
+    sample = energy_bus.bus.latest()
+    consumption_amps = (
+        sample.watts / max(cfg.voltage, 1.0) if sample is not None else None
+    )
 
-    status = SystemStatus(
+    return SystemStatus(
         configured=cfg.configured,
         monitorActive=_monitor_active()
         if callable(_monitor_active)
         else _monitor_active,
         overloadActive=overload_active,
         authEnabled=security.auth_configured(),
-        currentConsumptionAmps=em_cron.LAST_CONSUMPTION_AMPS,
+        currentConsumptionAmps=consumption_amps,
         homeMaxAmps=cfg.homeMaxAmps,
         region=cfg.region.value,
         voltage=cfg.voltage,
         vehicles=vehicle_statuses,
     )
+
+
+def _status_dict() -> dict | None:
+    status = _build_status()
+    return status.model_dump() if status is not None else None
+
+
+_broadcaster = status_stream.StatusBroadcaster(_status_dict)
+
+
+@router.get("/status", response_model=SystemStatus)
+def get_status() -> JSONResponse:
+    """Return overall system status including live vehicle states."""
+    status = _build_status()
+    if status is None:
+        return JSONResponse({"error": "Not initialised"}, status_code=503)
     return JSONResponse(status.model_dump(), status_code=200)
+
+
+@router.get("/status/stream")
+async def stream_status() -> Response:
+    """Stream the status as server-sent ``snapshot`` and ``delta`` events."""
+    if _app_config is None:
+        return JSONResponse({"error": "Not initialised"}, status_code=503)
+    return StreamingResponse(
+        _broadcaster.events(),
+        media_type="text/event-stream",
+        # Proxies must pass events through as they are written.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
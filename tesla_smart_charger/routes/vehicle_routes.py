@@ -4,12 +4,12 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from tesla_smart_charger import logger, telemetry_cache
 from tesla_smart_charger.app_config import AppConfig
-from tesla_smart_charger.models import VehicleConfig
-from tesla_smart_charger.tesla_api import TeslaAPI
+from tesla_smart_charger.async_tesla_api import AsyncTeslaAPI
+from tesla_smart_charger.models import TelemetryPolicy, VehicleConfig
 
 tsc_logger = logger.get_logger()
 
@@ -39,6 +39,7 @@ class VehicleCreate(BaseModel):
     chargerMinAmps: float = 6.0
     priority: int = 1
     enabled: bool = True
+    telemetryPolicy: TelemetryPolicy = Field(default_factory=TelemetryPolicy)
 
 
 class VehicleUpdate(BaseModel):
@@ -51,6 +52,7 @@ class VehicleUpdate(BaseModel):
     enabled: bool | None = None
     teslaHttpProxy: str | None = None
     teslaClientId: str | None = None
+    telemetryPolicy: TelemetryPolicy | None = None
 
 
 def _redact(v: VehicleConfig) -> dict:
@@ -100,11 +102,22 @@ def patch_vehicle(vehicle_id: str, body: VehicleUpdate) -> JSONResponse:
     }
     if not updates:
         raise HTTPException(status_code=400, detail="No fields provided to update.")
+    if body.telemetryPolicy is not None:
+        # Merge only the policy fields sent, and keep it a model, not a dict.
+        current = _app_config.get_vehicle(vehicle_id)
+        if current is None:
+            raise HTTPException(
+                status_code=404, detail=f"Vehicle {vehicle_id} not found"
+            )
+        updates["telemetryPolicy"] = current.telemetryPolicy.model_copy(
+            update=body.telemetryPolicy.model_dump(exclude_unset=True)
+        )
     updated = _app_config.update_vehicle(vehicle_id, updates)
     if updated is None:
         raise HTTPException(status_code=404, detail=f"Vehicle {vehicle_id} not found")
     # Cached statuses embed config fields (name, amp limits, priority, enabled),
-    # so a stale entry would keep serving pre-update values for up to the TTL.
+    # so a stale entry would keep serving pre-update values for up to the TTL —
+    # which may itself have just changed.
     telemetry_cache.invalidate(vehicle_id)
     return JSONResponse(_redact(updated), status_code=200)
 
@@ -122,7 +135,7 @@ def delete_vehicle(vehicle_id: str) -> JSONResponse:
 
 
 @router.get("/{vehicle_id}/tesla-vehicles")
-def list_tesla_vehicles(vehicle_id: str) -> JSONResponse:
+async def list_tesla_vehicles(vehicle_id: str) -> JSONResponse:
     """
     Fetch the list of Tesla vehicles linked to the given vehicle's OAuth token.
 
@@ -136,8 +149,8 @@ def list_tesla_vehicles(vehicle_id: str) -> JSONResponse:
             status_code=404, detail=f"Vehicle config {vehicle_id} not found"
         )
     try:
-        api = TeslaAPI(vehicle)
-        tesla_vehicles = api.get_vehicles()
+        api = AsyncTeslaAPI(vehicle)
+        tesla_vehicles = await api.get_vehicles()
         return JSONResponse({"vehicles": tesla_vehicles}, status_code=200)
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
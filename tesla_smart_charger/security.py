@@ -1,10 +1,14 @@
 """
-Password hashing and the HTTP Basic Auth guard for vehicle command endpoints.
+Password hashing and the guards for endpoints with physical-world effects.
 
 Commands with physical-world effects (waking a car, changing its charge limit)
 are gated behind ``require_auth``.  The guard **fails closed**: when Basic Auth
 has not been configured the commands are refused outright rather than left open,
 so an unprotected deployment cannot be driven by anyone who can reach the port.
+
+Machine-to-machine ingestion (pushed energy readings, streamed telemetry) feeds
+the overload logic just as directly, so ``require_ingest_token`` guards it with
+the ``ingestToken`` shared secret, failing closed the same way.
 """
 
 import secrets
@@ -12,7 +16,12 @@ from typing import Annotated
 
 import bcrypt
 from fastapi import Depends, HTTPException
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBasic,
+    HTTPBasicCredentials,
+    HTTPBearer,
+)
 
 from tesla_smart_charger import logger
 from tesla_smart_charger.app_config import AppConfig
@@ -22,6 +31,7 @@ tsc_logger = logger.get_logger()
 # auto_error=False so a missing header reaches us as None — we return our own
 # 401 with a WWW-Authenticate challenge, and a 403 when auth isn't configured.
 _basic = HTTPBasic(auto_error=False)
+_bearer = HTTPBearer(auto_error=False)
 
 _UNAUTHENTICATED_HEADERS = {"WWW-Authenticate": 'Basic realm="tesla-smart-charger"'}
 
@@ -30,6 +40,11 @@ AUTH_DISABLED_DETAIL = (
     "Enable it under Settings → Security to use them."
 )
 
+INGEST_DISABLED_DETAIL = (
+    "Ingestion is disabled because no ingestToken is configured. "
+    "Set one in the system config and send it as a Bearer token."
+)
+
 _app_config: AppConfig | None = None
 
 
@@ -97,3 +112,30 @@ def require_auth(
         )
 
     return credentials.username
+
+
+def require_ingest_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(_bearer)],
+) -> None:
+    """
+    FastAPI dependency guarding the push / telemetry ingestion endpoints.
+
+    Raises 503 before the app is wired, 403 when no ``ingestToken`` is
+    configured, and 401 when the Bearer token is absent or wrong.
+    """
+    if _app_config is None:
+        raise HTTPException(status_code=503, detail="Not initialised")
+
+    token = _app_config.system.ingestToken
+    if not token:
+        raise HTTPException(status_code=403, detail=INGEST_DISABLED_DETAIL)
+
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), token.encode()
+    ):
+        tsc_logger.warning("Rejected ingestion request: missing or invalid token.")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing ingest token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
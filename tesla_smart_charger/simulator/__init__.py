@@ -0,0 +1,10 @@
+"""
+Offline plant simulator for benchmarking overload strategies.
+
+Runs the real overload engine against a simulated house — household load
+traces, cars with charging ramps, command latency and API failures — in
+virtual time, so a strategy change can be compared in CI without a car or a
+network::
+
+    python -m tesla_smart_charger.simulator
+"""
@@ -0,0 +1,38 @@
+"""Print the strategy benchmark: ``python -m tesla_smart_charger.simulator``."""
+
+import argparse
+import logging
+
+from tesla_smart_charger import logger
+from tesla_smart_charger.models import OverloadStrategy
+from tesla_smart_charger.simulator.runner import SCENARIOS, benchmark, format_report
+
+
+def main() -> None:
+    """Run the built-in scenarios and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark overload strategies")
+    parser.add_argument(
+        "--scenario",
+        choices=[s.name for s in SCENARIOS],
+        action="append",
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=[s.value for s in OverloadStrategy],
+        action="append",
+        help="Strategy to run (repeatable; default: all)",
+    )
+    args = parser.parse_args()
+
+    # The engine logs every iteration and every simulated failure; keep the
+    # report readable.
+    logger.get_logger().setLevel(logging.CRITICAL)
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    strategies = [OverloadStrategy(s) for s in args.strategy or OverloadStrategy]
+    print(format_report(benchmark(scenarios, strategies)))
+
+
+if __name__ == "__main__":
+    main()
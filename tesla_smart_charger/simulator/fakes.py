@@ -0,0 +1,148 @@
+"""Fake energy monitor, Tesla API and Fleet Telemetry producer for a `Plant`."""
+
+import random
+from collections.abc import Callable
+
+from fastapi import HTTPException
+
+from tesla_smart_charger import constants
+from tesla_smart_charger.controllers.em_controller import EnergyMonitorController
+from tesla_smart_charger.models import VehicleConfig
+from tesla_smart_charger.simulator.plant import Plant
+
+
+class FakeEnergyMonitor(EnergyMonitorController):
+    """Reports the plant's whole-house consumption; can be made flaky."""
+
+    def __init__(
+        self, plant: Plant, failure_rate: float = 0.0, rng: random.Random | None = None
+    ) -> None:
+        """Read *plant*; each read fails with probability *failure_rate*."""
+        self.plant = plant
+        self.failure_rate = failure_rate
+        self.rng = rng or random.Random(0)  # noqa: S311
+        self.state = constants.EM_CONTROLLER_STATE_IDLE
+
+    def get_state(self) -> str:
+        """Return the current state of the controller."""
+        return self.state
+
+    def set_state(self, state: str) -> None:
+        """Set the current state of the controller."""
+        self.state = state
+
+    def get_consumption(self) -> float:
+        """Return the plant's consumption in watts."""
+        if self.rng.random() < self.failure_rate:
+            msg = "Simulated energy monitor failure"
+            raise ValueError(msg)
+        return self.plant.house_amps() * self.plant.voltage
+
+
+class FakeTeslaAPI:
+    """
+    Duck-typed `TeslaAPI` for one simulated car.
+
+    Commands take effect after *latency_secs* of virtual time, and any call
+    fails with probability *failure_rate* the way the real client fails — an
+    ``HTTPException`` — so the engine's error handling is exercised too.
+    Unlike the real client there is no retry: each attempt is one command.
+
+    Calls themselves return instantly in virtual time: the round trip of a
+    real request is not modelled, only the delay before a command takes
+    effect.  Vehicle data is fetched from worker threads, so sleeping on the
+    `VirtualClock` here would advance the plant once per concurrent call and
+    make runs depend on thread scheduling.
+    """
+
+    def __init__(
+        self,
+        plant: Plant,
+        vehicle: VehicleConfig,
+        *,
+        latency_secs: float = 2.0,
+        failure_rate: float = 0.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Bind the fake to *vehicle*'s car in *plant*."""
+        self.plant = plant
+        self.vehicle = vehicle
+        self.latency_secs = latency_secs
+        self.failure_rate = failure_rate
+        self.rng = rng or random.Random(0)  # noqa: S311
+
+    def _maybe_fail(self, label: str) -> None:
+        if self.rng.random() < self.failure_rate:
+            raise HTTPException(status_code=502, detail=f"Simulated {label} failure")
+
+    def get_vehicle_data(
+        self,
+        *,
+        deadline_secs: float | None = None,  # noqa: ARG002 — no retries
+    ) -> dict:
+        """Return the slice of vehicle_data the overload engine reads."""
+        with self.plant.lock:
+            self._maybe_fail("get_vehicle_data")
+            car = self.plant.cars[self.vehicle.id]
+            return {
+                "state": "online",
+                "charge_state": {
+                    "charging_state": "Charging",
+                    "charger_actual_current": round(car.amps),
+                    "charge_current_request": int(car.limit),
+                },
+            }
+
+    def set_charge_amp_limit(self, amp_limit: int) -> dict:
+        """Queue a new limit for the car, effective after the latency."""
+        with self.plant.lock:
+            self.plant.metrics.commands_sent += 1
+            try:
+                self._maybe_fail("set_charge_amp_limit")
+            except HTTPException:
+                self.plant.metrics.command_failures += 1
+                raise
+            car = self.plant.cars[self.vehicle.id]
+            car.pending.append((self.plant.now + self.latency_secs, float(amp_limit)))
+            return {"response": {"result": True, "reason": ""}}
+
+
+class FakeTelemetryProducer:
+    """
+    Local stand-in for a car streaming Fleet Telemetry.
+
+    Builds decoded records in the shape Tesla's telemetry server relays to
+    ``POST /api/v1/fleet-telemetry`` from *vehicle*'s car in *plant*, and
+    hands each to *send* — e.g. a test client's ``post`` or ``requests.post``.
+    """
+
+    def __init__(
+        self,
+        plant: Plant,
+        vehicle: VehicleConfig,
+        send: Callable[[dict], object],
+    ) -> None:
+        """Stream *vehicle*'s car in *plant* through *send*."""
+        self.plant = plant
+        self.vehicle = vehicle
+        self.send = send
+
+    def record(self) -> dict:
+        """Return a record with the car's current charging signals."""
+        with self.plant.lock:
+            car = self.plant.cars[self.vehicle.id]
+            signals = {
+                "DetailedChargeState": {
+                    "detailedChargeStateValue": "DetailedChargeStateCharging"
+                },
+                "ChargeAmps": {"doubleValue": round(car.amps, 1)},
+                "ChargeCurrentRequest": {"intValue": int(car.limit)},
+            }
+        return {
+            "vin": self.vehicle.vin,
+            "data": [{"key": key, "value": value} for key, value in signals.items()],
+        }
+
+    def emit(self) -> object:
+        """Send one record and return whatever *send* returned."""
+        return self.send(self.record())
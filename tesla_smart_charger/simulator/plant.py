@@ -0,0 +1,144 @@
+"""
+Simulated house: base-load trace, charging cars and a virtual clock.
+
+Time only moves when the overload engine sleeps.  `VirtualClock.sleep` steps
+the `Plant` forward in one-second increments, applying queued commands once
+their latency has elapsed, ramping each car's current towards its limit and
+accumulating the metrics the benchmark reports.
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass, field
+
+from tesla_smart_charger.models import VehicleConfig
+
+_STEP_SECS = 1.0
+
+
+class LoadTrace:
+    """Step function of household (non-EV) load over session time."""
+
+    def __init__(self, points: list[tuple[float, float]]) -> None:
+        """
+        Build a trace from ``(start_secs, amps)`` points.
+
+        Each level holds until the next point; the first one should start at 0.
+        """
+        ordered = sorted(points)
+        self._starts = [start for start, _ in ordered]
+        self._amps = [amps for _, amps in ordered]
+
+    def amps_at(self, t: float) -> float:
+        """Return the base load at session time *t*."""
+        index = bisect.bisect_right(self._starts, t) - 1
+        return self._amps[max(index, 0)]
+
+
+@dataclass
+class SimCar:
+    """A car charging at whatever limit it was last given, with a ramp."""
+
+    vehicle: VehicleConfig
+    limit: float  # amp limit in effect, initially the driver's request
+    onboard_max_amps: float = 32.0
+    ramp_amps_per_sec: float = 2.0
+    amps: float = field(init=False)
+    # (effective_at, limit) commands still in flight
+    pending: list[tuple[float, float]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """Start already charging at the initial limit."""
+        self.amps = min(self.limit, self.onboard_max_amps)
+
+    def step(self, now: float, dt: float) -> None:
+        """Apply commands due by *now* and ramp towards the limit over *dt*."""
+        while self.pending and self.pending[0][0] <= now:
+            _, self.limit = self.pending.pop(0)
+        target = min(self.limit, self.onboard_max_amps)
+        delta = self.ramp_amps_per_sec * dt
+        self.amps = (
+            min(target, self.amps + delta)
+            if target > self.amps
+            else max(target, self.amps - delta)
+        )
+
+
+@dataclass
+class PlantMetrics:
+    """What one simulated run measured."""
+
+    over_limit_secs: float = 0.0
+    excess_amp_secs: float = 0.0  # integral of amps above homeMaxAmps
+    peak_amps: float = 0.0
+    ev_energy_wh: float = 0.0
+    commands_sent: int = 0
+    command_failures: int = 0
+
+
+class Plant:
+    """The house, its cars and the metrics, advanced by the virtual clock."""
+
+    def __init__(
+        self,
+        base_load: LoadTrace,
+        cars: list[SimCar],
+        home_max_amps: float,
+        voltage: float,
+    ) -> None:
+        """Create a plant at session time 0."""
+        self.base_load = base_load
+        self.cars = {car.vehicle.id: car for car in cars}
+        self.home_max_amps = home_max_amps
+        self.voltage = voltage
+        self.now = 0.0
+        self.metrics = PlantMetrics()
+        # Vehicle data is fetched from worker threads while the engine's
+        # thread may be sleeping, so every read and step takes this lock.
+        self.lock = threading.RLock()
+
+    def house_amps(self) -> float:
+        """Whole-house current right now, cars included."""
+        with self.lock:
+            return self.base_load.amps_at(self.now) + sum(
+                car.amps for car in self.cars.values()
+            )
+
+    def advance(self, until: float) -> None:
+        """Step the plant to session time *until*, recording metrics."""
+        with self.lock:
+            while self.now < until:
+                dt = min(_STEP_SECS, until - self.now)
+                self.now += dt
+                for car in self.cars.values():
+                    car.step(self.now, dt)
+                house = self.house_amps()
+                metrics = self.metrics
+                metrics.peak_amps = max(metrics.peak_amps, house)
+                if house > self.home_max_amps:
+                    metrics.over_limit_secs += dt
+                    metrics.excess_amp_secs += (house - self.home_max_amps) * dt
+                ev_amps = sum(car.amps for car in self.cars.values())
+                metrics.ev_energy_wh += ev_amps * self.voltage * dt / 3600
+
+
+class VirtualClock:
+    """
+    `Clock` driven by the plant.
+
+    ``time()`` is a fixed epoch plus plant time; ``sleep()`` advances the
+    plant instead of blocking, so a ten-minute session runs in milliseconds.
+    """
+
+    def __init__(self, plant: Plant, epoch: float = 1_700_000_000.0) -> None:
+        """Bind the clock to *plant*, with session time 0 at *epoch*."""
+        self._plant = plant
+        self._epoch = epoch
+
+    def time(self) -> float:
+        """Return the current virtual epoch time."""
+        return self._epoch + self._plant.now
+
+    def sleep(self, secs: float) -> None:
+        """Advance virtual time by *secs* without blocking."""
+        self._plant.advance(self._plant.now + max(secs, 0.0))
@@ -0,0 +1,214 @@
+"""
+Run overload sessions against the simulated plant and compare strategies.
+
+`run_scenario` plays one `Scenario` through the real engine — the same first
+response `trigger_overload` applies, then `handle_overload` — with the fakes
+from `fakes` and virtual time, and returns the plant's metrics.  `benchmark`
+does that for every strategy and `format_report` tabulates the results.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.energy_bus import EnergyBus
+from tesla_smart_charger.handlers import amp_commands, overload_handler
+from tesla_smart_charger.models import OverloadStrategy, SystemConfig, VehicleConfig
+from tesla_smart_charger.simulator.fakes import FakeEnergyMonitor, FakeTeslaAPI
+from tesla_smart_charger.simulator.plant import LoadTrace, Plant, SimCar, VirtualClock
+
+
+@dataclass(frozen=True)
+class CarSpec:
+    """One simulated car and its charger."""
+
+    name: str
+    requested_amps: float  # the driver's limit when the overload starts
+    min_amps: float = 6.0
+    max_amps: float = 32.0
+    priority: int = 1
+    ramp_amps_per_sec: float = 2.0
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A household load trace, the cars charging through it and API behaviour."""
+
+    name: str
+    base_load: list[tuple[float, float]]  # (start_secs, amps) steps
+    cars: list[CarSpec]
+    home_max_amps: float = 32.0
+    voltage: float = 230.0
+    duration_secs: float = 900.0
+    command_latency_secs: float = 2.0
+    api_failure_rate: float = 0.0
+    em_failure_rate: float = 0.0
+    seed: int = 0
+    system: dict = field(default_factory=dict)  # extra SystemConfig fields
+
+
+@dataclass(frozen=True)
+class SimResult:
+    """Benchmark figures for one strategy on one scenario."""
+
+    scenario: str
+    strategy: str
+    time_over_limit_secs: float
+    excess_amp_secs: float
+    peak_amps: float
+    commands_sent: int
+    command_failures: int
+    energy_delivered_kwh: float
+    session_secs: float
+
+
+SCENARIOS = [
+    Scenario(
+        name="evening_peak",
+        base_load=[(0, 20.0), (300, 8.0)],
+        cars=[CarSpec("car", requested_amps=16.0)],
+    ),
+    Scenario(
+        name="two_cars",
+        base_load=[(0, 14.0), (200, 22.0), (500, 6.0)],
+        cars=[
+            CarSpec("first", requested_amps=16.0, priority=1),
+            CarSpec("second", requested_amps=11.0, priority=2),
+        ],
+        command_latency_secs=3.0,
+        api_failure_rate=0.05,
+    ),
+    Scenario(
+        name="flaky_api",
+        base_load=[(0, 18.0)],
+        cars=[CarSpec("car", requested_amps=20.0, ramp_amps_per_sec=0.5)],
+        command_latency_secs=5.0,
+        api_failure_rate=0.2,
+    ),
+]
+
+
+def run_scenario(scenario: Scenario, strategy: OverloadStrategy) -> SimResult:
+    """Play *scenario* through the overload engine using *strategy*."""
+    vehicles = [
+        VehicleConfig(
+            id=spec.name,
+            name=spec.name,
+            chargerMinAmps=spec.min_amps,
+            chargerMaxAmps=spec.max_amps,
+            priority=spec.priority,
+        )
+        for spec in scenario.cars
+    ]
+    cars = [
+        SimCar(
+            vehicle=vehicle,
+            limit=spec.requested_amps,
+            ramp_amps_per_sec=spec.ramp_amps_per_sec,
+        )
+        for vehicle, spec in zip(vehicles, scenario.cars, strict=True)
+    ]
+    plant = Plant(
+        LoadTrace(scenario.base_load), cars, scenario.home_max_amps, scenario.voltage
+    )
+    # No monitor cron runs here, so the session's own last reading is the only
+    # one on the bus; a 1 s poll interval makes it stale by the next iteration
+    # and the fake monitor is read every time.
+    system = {"energyMonitorPollSecs": 1, **scenario.system}
+    app_config = AppConfig.in_memory(
+        SystemConfig(
+            homeMaxAmps=scenario.home_max_amps,
+            voltage=scenario.voltage,
+            overloadStrategy=strategy,
+            **system,
+        ),
+        vehicles,
+    )
+    # One generator per car: vehicle data is fetched from worker threads, so a
+    # shared one would make failures depend on thread scheduling.
+    rngs = {
+        v.id: random.Random(f"{scenario.seed}:{v.id}")  # noqa: S311
+        for v in vehicles
+    }
+
+    def api_factory(vehicle: VehicleConfig) -> FakeTeslaAPI:
+        return FakeTeslaAPI(
+            plant,
+            vehicle,
+            latency_secs=scenario.command_latency_secs,
+            failure_rate=scenario.api_failure_rate,
+            rng=rngs[vehicle.id],
+        )
+
+    em_ctrl = FakeEnergyMonitor(
+        plant,
+        failure_rate=scenario.em_failure_rate,
+        rng=random.Random(scenario.seed),  # noqa: S311
+    )
+    clock = VirtualClock(plant)
+    # Every run restarts virtual time, so setpoints acknowledged in a previous
+    # run would look recent; start the command layer empty.
+    amp_commands.reset()
+    apis = [(v, api_factory(v)) for v in vehicles]
+    # The same first response trigger_overload applies; the simulator is part
+    # of the package, so reaching into the engine's helpers is deliberate.
+    _, intended = overload_handler._apply_initial_step(  # noqa: SLF001
+        overload_handler._get_charging_vehicles(apis, clock=clock),  # noqa: SLF001
+        app_config.system,
+        plant.house_amps(),
+        clock,
+    )
+    overload_handler.handle_overload(
+        app_config,
+        intended,
+        em_ctrl=em_ctrl,
+        api_factory=api_factory,
+        persist=False,
+        clock=clock,
+        bus=EnergyBus(clock=clock),
+    )
+    session_secs = plant.now
+    clock.sleep(scenario.duration_secs - plant.now)
+
+    metrics = plant.metrics
+    return SimResult(
+        scenario=scenario.name,
+        strategy=strategy.value,
+        time_over_limit_secs=metrics.over_limit_secs,
+        excess_amp_secs=metrics.excess_amp_secs,
+        peak_amps=metrics.peak_amps,
+        commands_sent=metrics.commands_sent,
+        command_failures=metrics.command_failures,
+        energy_delivered_kwh=metrics.ev_energy_wh / 1000,
+        session_secs=session_secs,
+    )
+
+
+def benchmark(
+    scenarios: list[Scenario] | None = None,
+    strategies: list[OverloadStrategy] | None = None,
+) -> list[SimResult]:
+    """Run every scenario under every strategy (defaults: all of both)."""
+    return [
+        run_scenario(scenario, strategy)
+        for scenario in (SCENARIOS if scenarios is None else scenarios)
+        for strategy in (list(OverloadStrategy) if strategies is None else strategies)
+    ]
+
+
+def format_report(results: list[SimResult]) -> str:
+    """Return *results* as a fixed-width text table."""
+    header = (
+        f"{'scenario':<14} {'strategy':<13} {'over limit s':>12} "
+        f"{'excess A·s':>11} {'peak A':>7} {'commands':>8} {'failed':>6} "
+        f"{'kWh':>6} {'session s':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r.scenario:<14} {r.strategy:<13} {r.time_over_limit_secs:>12.0f} "
+        f"{r.excess_amp_secs:>11.0f} {r.peak_amps:>7.1f} {r.commands_sent:>8d} "
+        f"{r.command_failures:>6d} {r.energy_delivered_kwh:>6.2f} "
+        f"{r.session_secs:>9.0f}"
+        for r in results
+    )
+    return "\n".join(lines)
@@ -0,0 +1,164 @@
+"""
+Server-sent status updates for ``GET /api/v1/status/stream``.
+
+Polling ``GET /api/v1/status`` rebuilds the whole status once per open
+dashboard per poll.  `StatusBroadcaster` instead runs a single producer while
+anyone is subscribed: it rebuilds the status whenever the energy bus publishes
+a reading, and at least every ``STATUS_STREAM_TICK_SECS`` to pick up overload
+and telemetry changes, and fans out only what changed.  A subscriber first
+receives a ``snapshot`` event with the full status, then ``delta`` events
+(see `diff`).  A subscriber that falls ``STATUS_STREAM_QUEUE_SIZE`` events
+behind has its backlog replaced by a fresh snapshot.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Callable
+
+from tesla_smart_charger import constants, energy_bus, logger
+from tesla_smart_charger.energy_bus import EnergyBus
+
+tsc_logger = logger.get_logger()
+
+# Vehicle fields that change on every rebuild without anything happening;
+# they are sent along with a changed vehicle but never make it "changed".
+_VOLATILE_VEHICLE_KEYS = ("telemetryAgeSecs",)
+
+
+def _comparable(vehicle: dict | None) -> dict | None:
+    if vehicle is None:
+        return None
+    return {k: v for k, v in vehicle.items() if k not in _VOLATILE_VEHICLE_KEYS}
+
+
+def diff(old: dict, new: dict) -> dict:
+    """
+    Return what changed between two status dicts.
+
+    Top-level fields are included when their value changed.  ``vehicles``
+    lists each added or changed vehicle in full; ``removedVehicles`` lists the
+    ids of vehicles no longer present.  Empty when nothing changed.
+    """
+    delta = {k: v for k, v in new.items() if k != "vehicles" and old.get(k) != v}
+    old_vehicles = {v["id"]: v for v in old.get("vehicles", [])}
+    new_vehicles = new.get("vehicles", [])
+    changed = [
+        v
+        for v in new_vehicles
+        if _comparable(old_vehicles.get(v["id"])) != _comparable(v)
+    ]
+    new_ids = {v["id"] for v in new_vehicles}
+    removed = [vid for vid in old_vehicles if vid not in new_ids]
+    if changed:
+        delta["vehicles"] = changed
+    if removed:
+        delta["removedVehicles"] = removed
+    return delta
+
+
+def _frame(event: str, data: dict) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class StatusBroadcaster:
+    """Fan one status producer out to any number of event-stream subscribers."""
+
+    def __init__(
+        self,
+        build: Callable[[], dict | None],
+        bus: EnergyBus | None = None,
+        tick_secs: float = constants.STATUS_STREAM_TICK_SECS,
+        keepalive_secs: float = constants.STATUS_STREAM_KEEPALIVE_SECS,
+        queue_size: int = constants.STATUS_STREAM_QUEUE_SIZE,
+    ) -> None:
+        """
+        Broadcast the dicts returned by *build* (None: nothing to send yet).
+
+        *build* runs on a worker thread, as it may touch caches and locks.
+        """
+        self._build = build
+        self._bus = energy_bus.bus if bus is None else bus
+        self._tick_secs = tick_secs
+        self._keepalive_secs = keepalive_secs
+        self._queue_size = queue_size
+        self._subscribers: set[asyncio.Queue] = set()
+        self._latest: dict | None = None
+        self._producer: asyncio.Task | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """Number of open streams."""
+        return len(self._subscribers)
+
+    async def events(self) -> AsyncIterator[str]:
+        """
+        Yield event-stream frames for one subscriber until it disconnects.
+
+        Starts with a ``snapshot``, then ``delta`` events, with a keepalive
+        comment whenever nothing was sent for ``keepalive_secs``.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        if self._producer is None:
+            self._producer = asyncio.create_task(self._produce())
+        try:
+            # Until the producer's first build, the snapshot arrives queued.
+            if self._latest is not None:
+                yield _frame("snapshot", self._latest)
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        queue.get(), self._keepalive_secs
+                    )
+                # Not the builtin TimeoutError on Python 3.10; an alias of it on 3.11+.
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _frame(event, data)
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers and self._producer is not None:
+                self._producer.cancel()
+                self._producer = None
+                self._latest = None
+
+    # ─── Internal helpers ──────────────────────────────────────────────────────
+
+    async def _produce(self) -> None:
+        """Rebuild on every energy reading or tick while anyone subscribes."""
+        seq = self._bus.sequence
+        while True:
+            try:
+                status = await asyncio.to_thread(self._build)
+            # Deliberately broad: a failed rebuild must not end every open
+            # stream; the next reading or tick tries again.
+            except Exception:
+                tsc_logger.exception("Status stream rebuild failed")
+                status = None
+            if status is not None:
+                self._publish(status)
+            sample = await asyncio.to_thread(
+                self._bus.wait_for_sample, seq, self._tick_secs
+            )
+            if sample is not None:
+                seq = sample.seq
+
+    def _publish(self, status: dict) -> None:
+        """Queue what changed since the last build for every subscriber."""
+        previous, self._latest = self._latest, status
+        if previous is None:
+            event = ("snapshot", status)
+        else:
+            delta = diff(previous, status)
+            if not delta:
+                return
+            event = ("delta", delta)
+        for queue in self._subscribers:
+            if queue.full():
+                # Too far behind for deltas to be worth replaying.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", status))
+            else:
+                queue.put_nowait(event)
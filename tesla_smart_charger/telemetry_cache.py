@@ -4,7 +4,19 @@ Per-vehicle telemetry cache.
 Shared by the status route (which reads it) and the command routes (which
 invalidate it after a command changes vehicle state).  Reads never block on
 the network: cached data is served immediately — fresh or stale — while a
-background thread refreshes expired entries.
+background refresh updates expired entries.  Vehicles streaming Fleet
+Telemetry are served from their stream instead and never polled.
+
+How long an entry stays fresh follows the vehicle's `TelemetryPolicy`: short
+while it charges or an overload session runs, longer while it is parked and
+idle, and backing off exponentially while it stays asleep, so a car parked
+overnight is rarely polled and never woken by the dashboard.  Commands
+refetch straight away.
+
+Refreshes are queued on one `RefreshScheduler` with a fixed worker pool, so
+requests for the same vehicle collapse into one fetch and thread count stays
+flat.  A vehicle someone is watching is refreshed ahead of expiry, so its
+entry never goes stale between reads.
 """
 
 import threading
@@ -12,17 +24,17 @@ import time
 
 from fastapi import HTTPException
 
-from tesla_smart_charger import logger
+from tesla_smart_charger import fleet_telemetry, logger
+from tesla_smart_charger.circuit_breaker import CircuitOpenError
+from tesla_smart_charger.fleet_budget import BudgetExceededError, Priority
 from tesla_smart_charger.models import VehicleConfig, VehicleStatus
+from tesla_smart_charger.refresh_scheduler import RefreshScheduler
 from tesla_smart_charger.tesla_api import TeslaAPI
 
 tsc_logger = logger.get_logger()
 
-# Entries are served from cache until they are older than the TTL.  Offline
-# vehicles get a longer TTL so we don't spam the Tesla API waking them up
-# every 30 seconds.
-_CACHE_TTL_ONLINE_SECS = 30
-_CACHE_TTL_OFFLINE_SECS = 300  # 5 min
+# A watched entry is refreshed once it is this far into its TTL.
+_REFRESH_AHEAD_FRACTION = 0.8
 
 _cache: dict[str, tuple] = {}  # vehicle_id → (fetched_at, VehicleStatus)
 # Bumped by invalidate().  A refresh captures the generation it started under
@@ -31,12 +43,13 @@ _cache: dict[str, tuple] = {}  # vehicle_id → (fetched_at, VehicleStatus)
 # repopulate the cache with pre-command telemetry, silently undoing the
 # invalidation for a full TTL.
 _generation: dict[str, int] = {}  # vehicle_id → epoch
-_cache_lock = threading.Lock()  # guards both _cache and _generation
-
-# vehicle ids with a background refresh currently in flight — prevents piling
-# up duplicate Tesla API calls for the same vehicle while one is already running.
-_pending: set = set()
-_pending_lock = threading.Lock()
+# Latest config and last read per vehicle, for refreshes the scheduler starts
+# on its own: vehicle_id → VehicleConfig, and → (read_at, overload_active).
+_vehicles: dict[str, VehicleConfig] = {}
+_last_read: dict[str, tuple[float, bool]] = {}
+# Consecutive fetches that found the vehicle asleep; drives the backoff.
+_asleep_fetches: dict[str, int] = {}
+_cache_lock = threading.Lock()  # guards all of the above
 
 
 def base_status(vehicle: VehicleConfig) -> VehicleStatus:
@@ -55,6 +68,16 @@ def base_status(vehicle: VehicleConfig) -> VehicleStatus:
     )
 
 
+def _apply_vehicle_data(status: VehicleStatus, data: dict) -> None:
+    """Fill *status*'s live fields from a ``vehicle_data``-shaped dict."""
+    status.online = data.get("state") == "online"
+    charge = data.get("charge_state", {})
+    status.chargingState = charge.get("charging_state")
+    status.chargerActualCurrent = charge.get("charger_actual_current")
+    status.batteryLevel = charge.get("battery_level")
+    status.chargeLimitSoc = charge.get("charge_limit_soc")
+
+
 def invalidate(vehicle_id: str) -> None:
     """
     Drop a vehicle's cached telemetry so the next read refetches it.
@@ -65,6 +88,20 @@ def invalidate(vehicle_id: str) -> None:
     with _cache_lock:
         _cache.pop(vehicle_id, None)
         _generation[vehicle_id] = _generation.get(vehicle_id, 0) + 1
+        _asleep_fetches.pop(vehicle_id, None)
+
+
+def after_command(vehicle: VehicleConfig, delay: float = 0.0) -> None:
+    """
+    Invalidate a vehicle's telemetry after a command changed its state.
+
+    Unless its policy says otherwise the refetch starts *delay* seconds later
+    rather than on the next read, so the new state is usually cached by the
+    time the dashboard asks for it.
+    """
+    invalidate(vehicle.id)
+    if vehicle.telemetryPolicy.refreshAfterCommand:
+        schedule_refresh(vehicle, delay)
 
 
 def age(vehicle_id: str) -> float | None:
@@ -77,38 +114,85 @@ def age(vehicle_id: str) -> float | None:
 
 
 def is_refreshing(vehicle_id: str) -> bool:
-    """Whether a background refresh is currently in flight for this vehicle."""
-    with _pending_lock:
-        return vehicle_id in _pending
+    """Whether a background refresh is due or in flight for this vehicle."""
+    return _scheduler.is_pending(vehicle_id)
 
 
 def reset() -> None:
-    """Clear all cached telemetry, generations and pending markers."""
+    """Clear all cached telemetry, generations and queued refreshes."""
     with _cache_lock:
         _cache.clear()
         _generation.clear()
-    with _pending_lock:
-        _pending.clear()
+        _vehicles.clear()
+        _last_read.clear()
+        _asleep_fetches.clear()
+    _scheduler.reset()
+
+
+def _ttl(
+    vehicle: VehicleConfig, status: VehicleStatus, *, overload_active: bool
+) -> float:
+    """
+    Return how long *status* may be served from cache; call with the lock held.
+
+    During an active overload session the charging TTL applies to every
+    vehicle, so the dashboard reflects live charge-limit changes sooner.  An
+    asleep vehicle's TTL grows with each fetch that still finds it asleep.
+    """
+    policy = vehicle.telemetryPolicy
+    if overload_active or (status.online and status.chargingState == "Charging"):
+        return policy.chargingTtlSecs
+    if status.online:
+        return policy.idleTtlSecs
+    backoff = policy.asleepBackoffFactor ** max(
+        _asleep_fetches.get(vehicle.id, 1) - 1, 0
+    )
+    return min(policy.asleepTtlSecs * backoff, policy.asleepMaxTtlSecs)
+
+
+def _store(vehicle: VehicleConfig, status: VehicleStatus, now: float) -> float | None:
+    """
+    Cache a fetched *status*; call with the lock held.
+
+    Returns the delay after which to refresh it ahead of expiry, or None when
+    nobody has read the vehicle within its TTL.
+    """
+    _cache[vehicle.id] = (now, status)
+    if status.online:
+        _asleep_fetches.pop(vehicle.id, None)
+    else:
+        _asleep_fetches[vehicle.id] = _asleep_fetches.get(vehicle.id, 0) + 1
+    read_at, overload_active = _last_read.get(vehicle.id, (None, False))
+    ttl = _ttl(vehicle, status, overload_active=overload_active)
+    if read_at is None or now - read_at >= ttl:
+        return None
+    return ttl * _REFRESH_AHEAD_FRACTION
 
 
 def _refresh(vehicle: VehicleConfig, generation: int) -> None:
     """
     Fetch live telemetry for a vehicle and update the cache.
 
-    Runs on a background thread so it never blocks a request.  *generation* is
-    the epoch this refresh started under; if `invalidate` moved it meanwhile,
-    the result is stale-on-arrival and gets dropped rather than cached.
+    Runs on a scheduler worker so it never blocks a request.  *generation*
+    is the epoch this refresh started under; if `invalidate` moved it
+    meanwhile, the result is stale-on-arrival and gets dropped rather than
+    cached.  Refreshes rank last for the Fleet API budget; when it is too low
+    the cached entry is kept as it is.  A fresh result for a vehicle read
+    within its TTL queues the next refresh ahead of expiry.
     """
-    status = base_status(vehicle)
+    status: VehicleStatus | None = base_status(vehicle)
     try:
-        api = TeslaAPI(vehicle)
-        data = api.get_vehicle_data()
-        status.online = data.get("state") == "online"
-        charge = data.get("charge_state", {})
-        status.chargingState = charge.get("charging_state")
-        status.chargerActualCurrent = charge.get("charger_actual_current")
-        status.batteryLevel = charge.get("battery_level")
-        status.chargeLimitSoc = charge.get("charge_limit_soc")
+        api = TeslaAPI(vehicle, priority=Priority.BACKGROUND)
+        _apply_vehicle_data(status, api.get_vehicle_data())
+    except BudgetExceededError:
+        tsc_logger.debug(
+            "Fleet API budget low; keeping cached telemetry for %s.", vehicle.id
+        )
+        status = None
+    except CircuitOpenError:
+        tsc_logger.debug(
+            "Vehicle %s is unreachable; skipping telemetry update.", vehicle.id
+        )
     except HTTPException as exc:
         # 408 (asleep) is already logged at debug level in TeslaAPI._raise() —
         # re-logging it here at ERROR every 300s per offline vehicle would bury
@@ -126,40 +210,48 @@ def _refresh(vehicle: VehicleConfig, generation: int) -> None:
     except Exception:
         tsc_logger.exception("Live telemetry fetch failed for vehicle %s", vehicle.id)
     finally:
+        now = time.monotonic()
+        refresh_ahead = None
         with _cache_lock:
             superseded = _generation.get(vehicle.id, 0) != generation
-            if not superseded:
-                _cache[vehicle.id] = (time.monotonic(), status)
-        # Cleared before any re-schedule below, which would otherwise dedupe
-        # itself away against this very refresh.
-        with _pending_lock:
-            _pending.discard(vehicle.id)
+            if not superseded and status is not None:
+                refresh_ahead = _store(vehicle, status, now)
         if superseded:
             tsc_logger.debug(
                 "Discarding superseded telemetry for vehicle %s; refetching.",
                 vehicle.id,
             )
             # Bounded: only an explicit invalidate() bumps the generation, so
-            # this can't spin on its own.
+            # this can't spin on its own.  Further invalidations while this
+            # refresh ran collapse into this one refetch.
             schedule_refresh(vehicle)
+        elif refresh_ahead is not None:
+            schedule_refresh(vehicle, delay=refresh_ahead)
+
+
+def _run_scheduled(vehicle_id: str) -> None:
+    """Scheduler callback: refresh *vehicle_id* under the current generation."""
+    with _cache_lock:
+        vehicle = _vehicles.get(vehicle_id)
+        generation = _generation.get(vehicle_id, 0)
+    if vehicle is not None:
+        _refresh(vehicle, generation)
+
+
+_scheduler = RefreshScheduler(_run_scheduled, name="tsc_telemetry_refresh")
 
 
-def schedule_refresh(vehicle: VehicleConfig) -> bool:
+def schedule_refresh(vehicle: VehicleConfig, delay: float = 0.0) -> bool:
     """
-    Start a background telemetry refresh unless one is already in flight.
+    Queue a background telemetry refresh in *delay* seconds.
 
-    Returns True when a new refresh thread was started.
+    Collapses into a refresh already queued for the same time or earlier, or
+    into one re-run after a refresh in flight.  Returns True when this call
+    queued or brought forward a refresh.
     """
-    with _pending_lock:
-        already_pending = vehicle.id in _pending
-        if not already_pending:
-            _pending.add(vehicle.id)
-    if already_pending:
-        return False
     with _cache_lock:
-        generation = _generation.get(vehicle.id, 0)
-    threading.Thread(target=_refresh, args=(vehicle, generation), daemon=True).start()
-    return True
+        _vehicles[vehicle.id] = vehicle
+    return _scheduler.schedule(vehicle.id, delay)
 
 
 def _with_freshness(vehicle_id: str, status: VehicleStatus) -> VehicleStatus:
@@ -183,26 +275,28 @@ def get(vehicle: VehicleConfig, *, overload_active: bool) -> VehicleStatus:
     """
     Return the best currently-known telemetry for a vehicle.
 
-    Never blocks on the network: serves cached data (fresh or stale)
-    immediately, kicking off a background refresh whenever the cache entry
-    is missing or has expired.
+    Never blocks on the network: serves streamed signals when the vehicle
+    is streaming, else cached data (fresh or stale) immediately, kicking off
+    a background refresh whenever the cache entry is missing or has expired.
     """
     base = base_status(vehicle)
     if not vehicle.enabled or not vehicle.teslaVehicleId:
         return base
 
-    # During an active overload session we use the shorter online TTL even for
-    # offline vehicles so the dashboard reflects live charge-limit changes sooner.
+    streamed = fleet_telemetry.stream.vehicle_data(vehicle.id)
+    if streamed is not None:
+        _apply_vehicle_data(base, streamed)
+        base.telemetryAgeSecs = fleet_telemetry.stream.age(vehicle.id)
+        return base
+
     now = time.monotonic()
     with _cache_lock:
+        _vehicles[vehicle.id] = vehicle
+        _last_read[vehicle.id] = (now, overload_active)
         cached = _cache.get(vehicle.id)
         if cached is not None:
             fetched_at, cached_status = cached
-            ttl = (
-                _CACHE_TTL_ONLINE_SECS
-                if (cached_status.online or overload_active)
-                else _CACHE_TTL_OFFLINE_SECS
-            )
+            ttl = _ttl(vehicle, cached_status, overload_active=overload_active)
             is_fresh = now - fetched_at < ttl
         else:
             is_fresh = False
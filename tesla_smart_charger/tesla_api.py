@@ -2,13 +2,24 @@
 
 import os
 import warnings
+from collections.abc import Callable
+from typing import TypedDict, TypeVar
 
 import requests
 from fastapi import HTTPException
-from retrying import retry
 from urllib3.exceptions import InsecureRequestWarning
 
-from tesla_smart_charger import constants, logger
+from tesla_smart_charger import (
+    circuit_breaker,
+    constants,
+    fleet_budget,
+    http_pool,
+    logger,
+    retry_policy,
+    timeseries,
+)
+from tesla_smart_charger.clock import Clock, system_clock
+from tesla_smart_charger.fleet_budget import Priority
 from tesla_smart_charger.models import VehicleConfig
 
 # Suppress "Unverified HTTPS request" warning — the proxy's self-signed cert
@@ -17,32 +28,106 @@ warnings.filterwarnings("ignore", category=InsecureRequestWarning)
 
 tsc_logger = logger.get_logger()
 
+_T = TypeVar("_T")
 
-class TeslaAPI:
+
+# ─── vehicle_data ─────────────────────────────────────────────────────────────
+
+
+class ChargeState(TypedDict, total=False):
+    """The ``charge_state`` keys this app reads."""
+
+    charging_state: str
+    charger_actual_current: float
+    charge_current_request: int
+    charge_amps: int
+    battery_level: int
+    charge_limit_soc: int
+
+
+class DriveState(TypedDict, total=False):
+    """The ``drive_state`` keys ``location_data`` adds."""
+
+    latitude: float
+    longitude: float
+    heading: int
+
+
+class VehicleData(TypedDict, total=False):
+    """A ``vehicle_data`` response reduced by `parse_vehicle_data`."""
+
+    state: str
+    charge_state: ChargeState
+    drive_state: DriveState
+
+
+def parse_vehicle_data(response: dict) -> VehicleData:
     """
-    Tesla Fleet API client for a single vehicle.
+    Keep only the fields this app reads from a ``vehicle_data`` response.
 
-    All vehicle commands are routed through the local ``tesla-http-proxy``
-    container which handles mutual TLS and request signing.
+    Sections and keys missing from *response* are left out rather than
+    defaulted, so callers still tell "not reported" from a value.
+    """
+    data: VehicleData = {}
+    if "state" in response:
+        data["state"] = response["state"]
+    for section, keys in (
+        ("charge_state", ChargeState.__annotations__),
+        ("drive_state", DriveState.__annotations__),
+    ):
+        values = response.get(section)
+        if isinstance(values, dict):
+            data[section] = {k: values[k] for k in keys if k in values}
+    return data
+
+
+class BaseTeslaClient:
+    """
+    Transport-independent parts of the Tesla Fleet API client.
 
-    When the proxy URL is set to a direct Fleet API URL (e.g.
-    ``https://fleet-api.prd.eu.vn.cloud.tesla.com``), TLS certificates
-    are skipped — the request goes directly to the Fleet API with only
-    a Bearer token.
+    URL selection, credentials, mTLS settings and error mapping are shared by
+    the blocking `TeslaAPI` and the asyncio `AsyncTeslaAPI`, so both clients
+    talk to Tesla in exactly the same way.
 
     Parameters
     ----------
     vehicle:
         The vehicle configuration containing credentials and proxy settings.
+    priority:
+        Whose requests these are, for the shared Fleet API budget (see
+        `fleet_budget`): the overload session, a user, or background refresh.
+    clock:
+        Time source for retry waits and call deadlines.
 
     """
 
-    def __init__(self, vehicle: VehicleConfig) -> None:
+    def __init__(
+        self,
+        vehicle: VehicleConfig,
+        priority: Priority = Priority.INTERACTIVE,
+        clock: Clock = system_clock,
+    ) -> None:
         """Build a client bound to a single vehicle's config and credentials."""
         self.vehicle = vehicle
+        self.priority = priority
+        self._clock = clock
 
     # ─── Internal helpers ──────────────────────────────────────────────────────
 
+    def _spend(self, endpoint: str, *, wait: bool = True) -> None:
+        """
+        Admit one request to this vehicle, or raise without sending it.
+
+        Raises `CircuitOpenError` (503) while the vehicle's circuit is open,
+        then takes one request from its *endpoint* budget or raises 429.
+        """
+        circuit_breaker.breakers.allow(self.vehicle.id)
+        fleet_budget.budget.acquire(self.vehicle.id, endpoint, self.priority, wait=wait)
+
+    def _reachable(self) -> None:
+        """Record that this vehicle's endpoint answered a request."""
+        circuit_breaker.breakers.record_success(self.vehicle.id)
+
     @property
     def _proxy(self) -> str:
         return os.environ.get("TESLA_PROXY_URL", self.vehicle.teslaHttpProxy)
@@ -85,23 +170,181 @@ class TeslaAPI:
             "cert": (str(constants.TLS_CERT_PATH), str(constants.TLS_KEY_PATH)),
         }
 
-    def _raise(self, exc: requests.RequestException, label: str) -> None:
-        status = getattr(getattr(exc, "response", None), "status_code", 502)
+    def _raise(self, exc: Exception, label: str) -> None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", 502)
         msg = f"{label} failed for vehicle {self.vehicle.teslaVehicleId}: {exc}"
+        if status >= 500:
+            circuit_breaker.breakers.record_failure(self.vehicle.id)
+        else:
+            self._reachable()
         if status == 408:
             tsc_logger.debug(msg)
         else:
             tsc_logger.error(msg)
-        raise HTTPException(status_code=status, detail=msg) from exc
+        # Kept so retry_policy can honour Tesla's back-off on a 429.
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        headers = {"Retry-After": retry_after} if retry_after else None
+        raise HTTPException(status_code=status, detail=msg, headers=headers) from exc
+
+    def _deadline(self, deadline_secs: float | None) -> float:
+        """Return the clock time by which a call must be done."""
+        if deadline_secs is None:
+            deadline_secs = constants.TESLA_API_DEADLINE_SECS
+        return self._clock.time() + deadline_secs
+
+    def _raise_on_rejection(self, response: dict, command: str) -> None:
+        """
+        Turn a vehicle-level command rejection into an error.
+
+        Tesla answers a refused command with HTTP 200 and
+        ``{"response": {"result": false, "reason": "..."}}`` — typically when
+        the car is asleep or unreachable.  Without this check the caller would
+        report success and the dashboard would show a change that never
+        happened.
+        """
+        result = response.get("response")
+        if not isinstance(result, dict) or result.get("result") is not False:
+            return
+        reason = result.get("reason") or "no reason given"
+        msg = f"Vehicle rejected {command}: {reason}"
+        tsc_logger.error(msg)
+        # 409: the request was well-formed, but the car's current state (asleep,
+        # unreachable) prevents it — a retry after waking may well succeed.
+        raise HTTPException(status_code=409, detail=msg)
+
+    @staticmethod
+    def _vehicle_data_params(*, location: bool) -> dict:
+        """
+        Ask ``vehicle_data`` for the ``charge_state`` section only.
+
+        *location* adds ``location_data``, which Tesla leaves out unless
+        requested explicitly.
+        """
+        endpoints = ["charge_state", "location_data"] if location else ["charge_state"]
+        return {"endpoints": ";".join(endpoints)}
+
+    def _data_vehicle_id(self) -> str:
+        """Return the numeric Fleet API id used by data and wake-up URLs."""
+        vehicle_id = self.vehicle.teslaVehicleId
+        if not vehicle_id:
+            raise HTTPException(
+                status_code=400,
+                detail="teslaVehicleId is not set on this vehicle config",
+            )
+        return vehicle_id
+
+    def _command_vehicle_id(self) -> str:
+        """
+        Return the id used in command URLs.
+
+        Prefers the VIN (17 chars) — the tesla-http-proxy rejects numeric
+        Fleet API IDs in command paths.
+        """
+        vehicle_id = self.vehicle.vin or self.vehicle.teslaVehicleId
+        if not vehicle_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Neither vin nor teslaVehicleId is set on this vehicle config",
+            )
+        return vehicle_id
+
+    def _require_vin(self) -> None:
+        if not self.vehicle.vin:
+            raise HTTPException(
+                status_code=400,
+                detail="VIN is required for charge commands",
+            )
+
+    def _token_request(self, region: str) -> dict:
+        """Return the form body exchanging this vehicle's refresh token."""
+        audience = constants.TESLA_FLEET_API_URLS.get(region, constants.TESLA_AUDIENCE)
+        return {
+            "grant_type": "refresh_token",
+            "client_id": self.vehicle.teslaClientId,
+            "refresh_token": self.vehicle.teslaRefreshToken,
+            "audience": audience,
+        }
+
+    def _store_tokens(self, body: dict) -> tuple[str, str] | None:
+        """Keep the refreshed token pair from *body*, or None if incomplete."""
+        access = body.get("access_token")
+        refresh = body.get("refresh_token")
+        if not access or not refresh:
+            tsc_logger.error("Missing tokens in Tesla refresh response.")
+            return None
+        # Keep local copy in sync
+        self.vehicle = self.vehicle.model_copy(
+            update={"teslaAccessToken": access, "teslaRefreshToken": refresh}
+        )
+        return access, refresh
+
+
+class TeslaAPI(BaseTeslaClient):
+    """
+    Tesla Fleet API client for a single vehicle.
+
+    All vehicle commands are routed through the local ``tesla-http-proxy``
+    container which handles mutual TLS and request signing.
+
+    When the proxy URL is set to a direct Fleet API URL (e.g.
+    ``https://fleet-api.prd.eu.vn.cloud.tesla.com``), TLS certificates
+    are skipped — the request goes directly to the Fleet API with only
+    a Bearer token.
+
+    Blocking: use `AsyncTeslaAPI` from ``async def`` route handlers.
+    """
+
+    def _session(self, url: str, *, mtls: bool = False) -> requests.Session:
+        """
+        Return the pooled keep-alive session for *url*'s host.
+
+        With *mtls* the session carries the proxy client certificate (or none
+        at all when the proxy is really a direct Fleet API URL — see `_tls`).
+        """
+        return http_pool.get_session(url, self._tls() if mtls else None)
+
+    def _retrying(
+        self,
+        call: Callable[[float], _T],
+        timeout: float,
+        deadline_secs: float | None,
+        *,
+        wake: bool = False,
+    ) -> _T:
+        """
+        Run *call* until it succeeds, retrying as `retry_policy` decides.
+
+        *call* is passed the request timeout to use: *timeout*, cut short so
+        the whole call ends within *deadline_secs* (``TESLA_API_DEADLINE_SECS``
+        by default).  With *wake*, a 408 wakes the car before the retry.
+        """
+        deadline = self._deadline(deadline_secs)
+        attempt = 1
+        while True:
+            remaining = deadline - self._clock.time()
+            try:
+                return call(max(min(timeout, remaining), 1.0))
+            except HTTPException as exc:
+                delay = retry_policy.next_delay(exc, attempt)
+                if delay is None or self._clock.time() + delay >= deadline:
+                    raise
+                if wake and exc.status_code == 408:
+                    self._wake_quietly()
+            self._clock.sleep(delay)
+            attempt += 1
+
+    def _wake_quietly(self) -> None:
+        try:
+            self.wake_up()
+        except HTTPException as exc:
+            tsc_logger.debug("Wake before retry failed: %s", exc.detail)
 
     # ─── API methods ───────────────────────────────────────────────────────────
 
-    @retry(
-        wait_exponential_multiplier=constants.REQUEST_DELAY_MS,
-        wait_exponential_max=5000,
-        stop_max_attempt_number=5,
-    )
-    def get_vehicles(self) -> list:
+    def get_vehicles(self, *, deadline_secs: float | None = None) -> list:
         """
         Return the list of Tesla vehicles linked to this OAuth token.
 
@@ -109,75 +352,108 @@ class TeslaAPI:
         when a tesla-http-proxy is configured — listing vehicles does
         not require mutual TLS.
         """
+        return self._retrying(self._get_vehicles, 20, deadline_secs)
+
+    def _get_vehicles(self, timeout: float) -> list:
         tsc_logger.info("Requesting vehicle list from Tesla API.")
+        self._spend(fleet_budget.DATA)
         try:
-            r = requests.get(
-                f"{self._fleet_api_url}{constants.TESLA_API_VEHICLES_URL}",
+            url = f"{self._fleet_api_url}{constants.TESLA_API_VEHICLES_URL}"
+            r = self._session(url).get(
+                url,
                 headers=self._headers(),
-                timeout=20,
+                timeout=timeout,
             )
             r.raise_for_status()
+            self._reachable()
+            response = r.json()
         except requests.RequestException as exc:
             self._raise(exc, "get_vehicles")
-        response = r.json()
         if constants.VERBOSE:
             tsc_logger.debug(response)
         return response.get("response", [])
 
-    @retry(
-        wait_exponential_multiplier=constants.REQUEST_DELAY_MS,
-        wait_exponential_max=5000,
-        stop_max_attempt_number=5,
-    )
-    def get_vehicle_data(self) -> dict:
-        """Return full telemetry for this vehicle."""
-        vehicle_id = self.vehicle.teslaVehicleId
-        if not vehicle_id:
-            raise HTTPException(
-                status_code=400,
-                detail="teslaVehicleId is not set on this vehicle config",
-            )
+    def get_vehicle_data(
+        self,
+        *,
+        location: bool = False,
+        deadline_secs: float | None = None,
+        wake: bool = False,
+    ) -> VehicleData:
+        """
+        Return this vehicle's state and charging telemetry.
+
+        Only the ``charge_state`` section is requested — plus the location
+        with *location* — and the response is cut down to the fields in
+        `VehicleData`.  Gives up after *deadline_secs*; with *wake*, a car
+        found asleep (408) is woken before the one retry a 408 gets.
+        """
+        return self._retrying(
+            lambda timeout: self._get_vehicle_data(timeout, location=location),
+            20,
+            deadline_secs,
+            wake=wake,
+        )
+
+    def _get_vehicle_data(self, timeout: float, *, location: bool) -> VehicleData:
+        vehicle_id = self._data_vehicle_id()
         tsc_logger.info("Requesting data for vehicle %s.", vehicle_id)
+        self._spend(fleet_budget.DATA)
         try:
-            r = requests.get(
-                f"{self._proxy}{constants.TESLA_API_VEHICLE_DATA_URL.format(id=vehicle_id)}",
+            url = (
+                f"{self._proxy}"
+                f"{constants.TESLA_API_VEHICLE_DATA_URL.format(id=vehicle_id)}"
+            )
+            r = self._session(url, mtls=True).get(
+                url,
+                params=self._vehicle_data_params(location=location),
                 headers=self._headers(),
-                **self._tls(),
-                timeout=20,
+                timeout=timeout,
             )
             r.raise_for_status()
+            self._reachable()
+            response = r.json()
         except requests.RequestException as exc:
             self._raise(exc, "get_vehicle_data")
-        response = r.json()
         if constants.VERBOSE:
             tsc_logger.debug(response)
-        return response.get("response", {})
+        return parse_vehicle_data(response.get("response", {}))
 
-    @retry(
-        wait_exponential_multiplier=constants.REQUEST_DELAY_MS,
-        wait_exponential_max=5000,
-        stop_max_attempt_number=5,
-    )
-    def set_charge_amp_limit(self, amp_limit: int) -> dict:
+    def set_charge_amp_limit(
+        self, amp_limit: int, *, deadline_secs: float | None = None
+    ) -> dict:
         """Command this vehicle to set its charging amp limit."""
+        return self._retrying(
+            lambda timeout: self._set_charge_amp_limit(amp_limit, timeout),
+            10,
+            deadline_secs,
+        )
+
+    def _set_charge_amp_limit(self, amp_limit: int, timeout: float) -> dict:
         # Use the VIN (17 chars) for command URLs — the tesla-http-proxy rejects
         # numeric Fleet API IDs in command paths.
         vehicle_id = self.vehicle.vin or self.vehicle.teslaVehicleId
         tsc_logger.info(
             "Setting charge limit → %sA for vehicle %s.", amp_limit, vehicle_id
         )
+        self._spend(fleet_budget.COMMAND)
         try:
-            r = requests.post(
-                f"{self._proxy}{constants.TESLA_API_CHARGE_AMP_LIMIT_URL.format(id=vehicle_id)}",
+            url = (
+                f"{self._proxy}"
+                f"{constants.TESLA_API_CHARGE_AMP_LIMIT_URL.format(id=vehicle_id)}"
+            )
+            r = self._session(url, mtls=True).post(
+                url,
                 headers=self._headers(),
                 json={"charging_amps": amp_limit},
-                **self._tls(),
-                timeout=10,
+                timeout=timeout,
             )
             r.raise_for_status()
+            self._reachable()
+            response = r.json()
         except requests.RequestException as exc:
             self._raise(exc, "set_charge_amp_limit")
-        response = r.json()
+        timeseries.record_setpoint(self.vehicle.id, amp_limit, self._clock)
         if constants.VERBOSE:
             tsc_logger.debug(response)
         return response
@@ -186,29 +462,23 @@ class TeslaAPI:
         """
         Send a signed vehicle command through the proxy.
 
-        Not retried: `retrying` retries on any exception, so a 4xx (expired
-        token, car asleep) would burn five attempts before the caller hears
-        about it — unhelpful for an interactive command.
+        Not retried: these are interactive commands, and the user is better
+        served by an immediate error than by a wait for a car that's asleep.
         """
-        # Use the VIN (17 chars) for command URLs — the tesla-http-proxy rejects
-        # numeric Fleet API IDs in command paths.
-        vehicle_id = self.vehicle.vin or self.vehicle.teslaVehicleId
-        if not vehicle_id:
-            raise HTTPException(
-                status_code=400,
-                detail="Neither vin nor teslaVehicleId is set on this vehicle config",
-            )
+        vehicle_id = self._command_vehicle_id()
         tsc_logger.info("Sending command %s to vehicle %s.", command, vehicle_id)
-        url = constants.TESLA_API_COMMAND_URL.format(id=vehicle_id, command=command)
+        path = constants.TESLA_API_COMMAND_URL.format(id=vehicle_id, command=command)
+        url = f"{self._proxy}{path}"
+        self._spend(fleet_budget.COMMAND)
         try:
-            r = requests.post(
-                f"{self._proxy}{url}",
+            r = self._session(url, mtls=True).post(
+                url,
                 headers=self._headers(),
                 json=payload,
-                **self._tls(),
                 timeout=10,
             )
             r.raise_for_status()
+            self._reachable()
         except requests.RequestException as exc:
             self._raise(exc, command)
         response = r.json()
@@ -217,26 +487,6 @@ class TeslaAPI:
         self._raise_on_rejection(response, command)
         return response
 
-    def _raise_on_rejection(self, response: dict, command: str) -> None:
-        """
-        Turn a vehicle-level command rejection into an error.
-
-        Tesla answers a refused command with HTTP 200 and
-        ``{"response": {"result": false, "reason": "..."}}`` — typically when
-        the car is asleep or unreachable.  Without this check the caller would
-        report success and the dashboard would show a change that never
-        happened.
-        """
-        result = response.get("response")
-        if not isinstance(result, dict) or result.get("result") is not False:
-            return
-        reason = result.get("reason") or "no reason given"
-        msg = f"Vehicle rejected {command}: {reason}"
-        tsc_logger.error(msg)
-        # 409: the request was well-formed, but the car's current state (asleep,
-        # unreachable) prevents it — a retry after waking may well succeed.
-        raise HTTPException(status_code=409, detail=msg)
-
     def set_charge_limit(self, percent: int) -> dict:
         """Command this vehicle to set its target state of charge."""
         return self._send_command("set_charge_limit", {"percent": percent})
@@ -254,21 +504,19 @@ class TeslaAPI:
         Waking is asynchronous — a successful response means Tesla accepted
         the request, not that the car is awake yet.
         """
-        vehicle_id = self.vehicle.teslaVehicleId
-        if not vehicle_id:
-            raise HTTPException(
-                status_code=400,
-                detail="teslaVehicleId is not set on this vehicle config",
-            )
+        vehicle_id = self._data_vehicle_id()
         tsc_logger.info("Waking vehicle %s.", vehicle_id)
-        url = constants.TESLA_API_WAKE_UP_URL.format(id=vehicle_id)
+        path = constants.TESLA_API_WAKE_UP_URL.format(id=vehicle_id)
+        url = f"{self._fleet_api_url}{path}"
+        self._spend(fleet_budget.WAKE)
         try:
-            r = requests.post(
-                f"{self._fleet_api_url}{url}",
+            r = self._session(url).post(
+                url,
                 headers=self._headers(),
                 timeout=15,
             )
             r.raise_for_status()
+            self._reachable()
         except requests.RequestException as exc:
             self._raise(exc, "wake_up")
         response = r.json()
@@ -278,20 +526,12 @@ class TeslaAPI:
 
     def start_charge(self) -> dict:
         """Command this vehicle to start charging. Requires VIN."""
-        if not self.vehicle.vin:
-            raise HTTPException(
-                status_code=400,
-                detail="VIN is required for charge commands",
-            )
+        self._require_vin()
         return self._send_command("charge_start", {})
 
     def stop_charge(self) -> dict:
         """Command this vehicle to stop charging. Requires VIN."""
-        if not self.vehicle.vin:
-            raise HTTPException(
-                status_code=400,
-                detail="VIN is required for charge commands",
-            )
+        self._require_vin()
         return self._send_command("charge_stop", {})
 
     def refresh_token(self, region: str = "eu") -> tuple[str, str] | None:
@@ -300,34 +540,16 @@ class TeslaAPI:
 
         Returns ``(access_token, refresh_token)`` on success, ``None`` on failure.
         """
-        audience = constants.TESLA_FLEET_API_URLS.get(region, constants.TESLA_AUDIENCE)
-        data = {
-            "grant_type": "refresh_token",
-            "client_id": self.vehicle.teslaClientId,
-            "refresh_token": self.vehicle.teslaRefreshToken,
-            "audience": audience,
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
         try:
-            r = requests.post(
+            r = self._session(constants.TESLA_API_TOKEN_URL).post(
                 constants.TESLA_API_TOKEN_URL,
-                data=data,
-                headers=headers,
+                data=self._token_request(region),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
                 timeout=20,
             )
             r.raise_for_status()
             body = r.json()
-            access = body.get("access_token")
-            refresh = body.get("refresh_token")
-            if not access or not refresh:
-                tsc_logger.error("Missing tokens in Tesla refresh response.")
-                return None
-            # Keep local copy in sync
-            self.vehicle = self.vehicle.model_copy(
-                update={"teslaAccessToken": access, "teslaRefreshToken": refresh}
-            )
         except requests.RequestException:
             tsc_logger.exception("Token refresh failed for vehicle %s", self.vehicle.id)
             return None
-        else:
-            return access, refresh
+        return self._store_tokens(body)
@@ -0,0 +1,265 @@
+"""
+Durable time-series store for home consumption and amp setpoints.
+
+Raw points land in ``ts_raw`` as (series, ts, value) rows:
+
+* ``energy.watts`` plus ``energy.emeter<N>`` — every reading on the energy bus
+* ``setpoint.<vehicle id>`` — every successful ``set_charge_amp_limit``
+
+The tables live in the history database and go through its `sqlite_pool`, so
+there is one writer connection per file.  A single writer thread drains the
+energy bus and the setpoint queue every ``TIMESERIES_FLUSH_SECS`` and writes
+the batch in one transaction, so a Raspberry Pi SD card sees one WAL append
+per flush rather than one fsync per sample.  Once a minute it rolls raw points
+up into 1-minute and then 15-minute count / min / max / sum buckets and drops
+whatever is past its retention — raw for days, 1-minute for weeks, 15-minute
+for years — which keeps the file bounded however long the charger runs.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from tesla_smart_charger import constants, energy_bus, logger
+from tesla_smart_charger.clock import Clock, system_clock
+from tesla_smart_charger.controllers import sqlite_pool
+from tesla_smart_charger.energy_bus import EnergySample
+
+tsc_logger = logger.get_logger()
+
+SERIES_WATTS = "energy.watts"
+
+# Expressions for (timestamp, count, min, max, sum) when folding each kind of
+# table into the next coarser one.
+_RAW_COLUMNS = ("ts", "1", "value", "value", "value")
+_ROLLUP_COLUMNS = ("bucket", "count", "min_value", "max_value", "sum_value")
+
+# (table, bucket width in seconds, retention in seconds), finest first.
+_ROLLUP_TABLES = (
+    ("ts_1m", 60, constants.TIMESERIES_1M_RETENTION_SECS),
+    ("ts_15m", 900, constants.TIMESERIES_15M_RETENTION_SECS),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ts_raw (
+    series TEXT NOT NULL,
+    ts     REAL NOT NULL,
+    value  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ts_raw_series_ts ON ts_raw (series, ts);
+CREATE INDEX IF NOT EXISTS idx_ts_raw_ts ON ts_raw (ts);
+CREATE TABLE IF NOT EXISTS ts_1m (
+    series    TEXT    NOT NULL,
+    bucket    INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    min_value REAL    NOT NULL,
+    max_value REAL    NOT NULL,
+    sum_value REAL    NOT NULL,
+    PRIMARY KEY (series, bucket)
+);
+CREATE INDEX IF NOT EXISTS idx_ts_1m_bucket ON ts_1m (bucket);
+CREATE TABLE IF NOT EXISTS ts_15m (
+    series    TEXT    NOT NULL,
+    bucket    INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    min_value REAL    NOT NULL,
+    max_value REAL    NOT NULL,
+    sum_value REAL    NOT NULL,
+    PRIMARY KEY (series, bucket)
+);
+CREATE INDEX IF NOT EXISTS idx_ts_15m_bucket ON ts_15m (bucket);
+"""
+
+
+def _create_schema(connection: sqlite3.Connection) -> None:
+    connection.executescript(_SCHEMA)
+
+
+# Setpoints waiting for the writer: (series, ts, value).  Bounded so a stalled
+# writer can't grow memory without limit — the oldest points are dropped.
+_pending_setpoints: deque[tuple[str, float, float]] = deque(
+    maxlen=constants.TIMESERIES_MAX_PENDING
+)
+
+
+def emeter_series(channel: int) -> str:
+    """Return the series name for one emeter channel."""
+    return f"energy.emeter{channel}"
+
+
+def setpoint_series(vehicle_id: str) -> str:
+    """Return the series name for a vehicle's amp setpoints."""
+    return f"setpoint.{vehicle_id}"
+
+
+def record_setpoint(vehicle_id: str, amps: float, clock: Clock = system_clock) -> None:
+    """
+    Queue an amp setpoint for the writer thread — never blocks on disk.
+
+    Stamped by *clock*, the same clock the energy bus stamps readings with.
+    """
+    _pending_setpoints.append((setpoint_series(vehicle_id), clock.time(), amps))
+
+
+def _energy_rows(samples: list[EnergySample]) -> list[tuple[str, float, float]]:
+    rows = []
+    for sample in samples:
+        rows.append((SERIES_WATTS, sample.timestamp, sample.watts))
+        rows.extend(
+            (emeter_series(channel), sample.timestamp, watts)
+            for channel, watts in enumerate(sample.emeters)
+        )
+    return rows
+
+
+class TimeSeriesStore:
+    """SQLite (WAL) storage with rollups on the file's shared `sqlite_pool`."""
+
+    def __init__(self, file_path: str) -> None:
+        """Bind the store to a SQLite file (not opened until `open`)."""
+        self.file_path = file_path
+        self.pool: sqlite_pool.SqlitePool | None = None
+
+    def open(self) -> None:
+        """Attach to the file's shared connections and create the schema."""
+        self.pool = sqlite_pool.get(self.file_path, setup=_create_schema)
+
+    def close(self) -> None:
+        """Detach; the pool itself is closed with `sqlite_pool.close_all`."""
+        self.pool = None
+
+    def write(self, rows: list[tuple[str, float, float]]) -> None:
+        """Insert a batch of (series, ts, value) points in one transaction."""
+        if not rows:
+            return
+        with self.pool.writer() as conn:
+            conn.executemany(
+                "INSERT INTO ts_raw (series, ts, value) VALUES (?, ?, ?)", rows
+            )
+
+    def rollup(self, now: float | None = None) -> None:
+        """
+        Fold raw points into the 1-minute and 15-minute tables, then prune.
+
+        Each pass recomputes buckets from one bucket before the newest one
+        already rolled, so partial buckets and late writes are corrected and
+        re-running is harmless.
+        """
+        now = time.time() if now is None else now
+        with self.pool.writer() as conn:
+            source, columns = "ts_raw", _RAW_COLUMNS
+            for table, width, retention in _ROLLUP_TABLES:
+                (newest,) = conn.execute(
+                    f"SELECT COALESCE(MAX(bucket), 0) FROM {table}"  # noqa: S608
+                ).fetchone()
+                ts_col, count, low, high, total = columns
+                # Table and column names come from the constants above, never
+                # from input; the watermark is bound as a parameter.
+                conn.execute(
+                    f"""
+                    INSERT INTO {table}
+                        (series, bucket, count, min_value, max_value, sum_value)
+                    SELECT series, CAST({ts_col} / {width} AS INTEGER) * {width} AS b,
+                           SUM({count}), MIN({low}), MAX({high}), SUM({total})
+                    FROM {source}
+                    WHERE {ts_col} >= ?
+                    GROUP BY series, b
+                    ON CONFLICT (series, bucket) DO UPDATE SET
+                        count = excluded.count,
+                        min_value = excluded.min_value,
+                        max_value = excluded.max_value,
+                        sum_value = excluded.sum_value
+                    """,  # noqa: S608
+                    (newest - width,),
+                )
+                conn.execute(
+                    f"DELETE FROM {table} WHERE bucket < ?",  # noqa: S608
+                    (now - retention,),
+                )
+                # Each coarser table is folded from the one before it.
+                source, columns = table, _ROLLUP_COLUMNS
+            conn.execute(
+                "DELETE FROM ts_raw WHERE ts < ?",
+                (now - constants.TIMESERIES_RAW_RETENTION_SECS,),
+            )
+
+    def query(
+        self, series: str, since: float, until: float | None = None
+    ) -> list[dict]:
+        """
+        Return the points of *series* between *since* and *until*, oldest first.
+
+        Reads the finest table whose retention still covers *since*; rows
+        carry ``timestamp``, ``count``, ``min``, ``max`` and ``mean``.
+        """
+        now = time.time()
+        until = now if until is None else until
+        if since >= now - constants.TIMESERIES_RAW_RETENTION_SECS:
+            sql = """
+                SELECT ts, 1, value, value, value FROM ts_raw
+                WHERE series = ? AND ts >= ? AND ts <= ? ORDER BY ts
+            """
+        else:
+            table = next(
+                (
+                    name
+                    for name, _, retention in _ROLLUP_TABLES
+                    if since >= now - retention
+                ),
+                _ROLLUP_TABLES[-1][0],
+            )
+            sql = f"""
+                SELECT bucket, count, min_value, max_value, sum_value * 1.0 / count
+                FROM {table}
+                WHERE series = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket
+            """  # noqa: S608
+        with self.pool.reader() as conn:
+            rows = conn.execute(sql, (series, since, until)).fetchall()
+        return [
+            {"timestamp": ts, "count": count, "min": low, "max": high, "mean": mean}
+            for ts, count, low, high, mean in rows
+        ]
+
+
+def start_writer(
+    stop_event: threading.Event, file_path: str, clock: Clock = system_clock
+) -> None:
+    """
+    Writer thread: batch energy samples and setpoints into the store.
+
+    Energy samples are read back from the bus's ring buffer by timestamp, so
+    nothing on the reading path waits for disk.  Retention is judged by
+    *clock*, which stamps the points.  A final flush runs on stop.
+    """
+    store = TimeSeriesStore(file_path)
+    try:
+        store.open()
+    except sqlite3.Error:
+        tsc_logger.exception("Could not open time-series store — writer exiting.")
+        return
+    tsc_logger.info("Time-series writer started (%s).", file_path)
+
+    last_ts = 0.0
+    next_rollup = time.monotonic()
+    try:
+        while True:
+            stopping = stop_event.wait(constants.TIMESERIES_FLUSH_SECS)
+            try:
+                samples = energy_bus.bus.samples(since=last_ts)
+                if samples:
+                    last_ts = samples[-1].timestamp
+                rows = _energy_rows(samples)
+                while _pending_setpoints:
+                    rows.append(_pending_setpoints.popleft())
+                store.write(rows)
+                if stopping or time.monotonic() >= next_rollup:
+                    store.rollup(clock.time())
+                    next_rollup = time.monotonic() + constants.TIMESERIES_ROLLUP_SECS
+            except sqlite3.Error:
+                tsc_logger.exception("Time-series flush failed")
+            if stopping:
+                break
+    finally:
+        store.close()
+        tsc_logger.info("Time-series writer stopped.")
@@ -0,0 +1,135 @@
+"""Tests for the per-vehicle amp command layer."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from tesla_smart_charger import constants
+from tesla_smart_charger.handlers import amp_commands
+from tesla_smart_charger.handlers.charge_snapshot import ChargeSnapshot
+from tesla_smart_charger.models import VehicleConfig
+
+VEHICLE = VehicleConfig(id="v1", chargerMinAmps=6.0, chargerMaxAmps=32.0)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.now += secs
+
+
+@pytest.fixture(autouse=True)
+def _reset_amp_commands() -> None:
+    """Start every test without remembered setpoints."""
+    amp_commands.reset()
+
+
+def _snapshot(request: int) -> ChargeSnapshot:
+    return ChargeSnapshot("online", "Charging", 10.0, requested_current=request)
+
+
+def test_repeated_setpoint_is_suppressed_until_the_hold_expires() -> None:
+    """An acknowledged setpoint isn't re-sent while the car ramps towards it."""
+    api = MagicMock()
+    clock = _FakeClock()
+
+    assert amp_commands.send(VEHICLE, api, 10, clock=clock)
+    clock.sleep(30)
+    assert not amp_commands.send(VEHICLE, api, 10, clock=clock)
+    clock.sleep(constants.AMP_COMMAND_HOLD_SECS)
+    assert amp_commands.send(VEHICLE, api, 10, clock=clock)
+
+    assert api.set_charge_amp_limit.call_count == 2
+
+
+def test_fresh_snapshot_that_disagrees_overrides_the_hold() -> None:
+    """A limit changed after the acknowledgement is overwritten at once."""
+    api = MagicMock()
+    clock = _FakeClock()
+
+    assert amp_commands.send(VEHICLE, api, 8, clock=clock)
+    acked_at = clock.now
+    clock.sleep(30)
+    stale = ChargeSnapshot(
+        "online", "Charging", 8.0, requested_current=32, fetched_at=acked_at - 1
+    )
+    assert not amp_commands.send(VEHICLE, api, 8, stale, clock=clock)
+    fresh = ChargeSnapshot(
+        "online", "Charging", 8.0, requested_current=32, fetched_at=clock.now
+    )
+    assert amp_commands.send(VEHICLE, api, 8, fresh, clock=clock)
+
+    assert api.set_charge_amp_limit.call_count == 2
+
+
+def test_new_setpoint_is_always_sent() -> None:
+    """Only the same value is suppressed — a different one goes straight out."""
+    api = MagicMock()
+
+    amp_commands.send(VEHICLE, api, 10)
+    amp_commands.send(VEHICLE, api, 12)
+
+    assert [c.args for c in api.set_charge_amp_limit.call_args_list] == [(10,), (12,)]
+
+
+def test_setpoint_the_car_already_reports_is_suppressed() -> None:
+    """A snapshot showing the limit as requested makes the command redundant."""
+    api = MagicMock()
+
+    assert not amp_commands.send(VEHICLE, api, 16, _snapshot(16))
+    assert amp_commands.send(VEHICLE, api, 12, _snapshot(16))
+
+    api.set_charge_amp_limit.assert_called_once_with(12)
+
+
+def test_failed_command_is_not_remembered() -> None:
+    """A rejected setpoint raises and is retried on the next call."""
+    api = MagicMock()
+    api.set_charge_amp_limit.side_effect = [HTTPException(status_code=502), {}]
+
+    with pytest.raises(HTTPException):
+        amp_commands.send(VEHICLE, api, 10)
+    assert amp_commands.send(VEHICLE, api, 10)
+
+
+def test_sent_command_invalidates_telemetry() -> None:
+    """Only an issued command drops the vehicle's cached telemetry."""
+    with patch(
+        "tesla_smart_charger.handlers.amp_commands.telemetry_cache.invalidate"
+    ) as mock_invalidate:
+        amp_commands.send(VEHICLE, MagicMock(), 10)
+        amp_commands.send(VEHICLE, MagicMock(), 10)
+
+    mock_invalidate.assert_called_once_with(VEHICLE.id)
+
+
+def test_setpoints_arriving_mid_flight_coalesce_into_the_latest() -> None:
+    """Values superseded while a command is in flight are never sent."""
+    entered, release = threading.Event(), threading.Event()
+    sent: list[int] = []
+
+    def _slow_set(amp_limit: int) -> dict:
+        sent.append(amp_limit)
+        entered.set()
+        release.wait(2)
+        return {}
+
+    api = MagicMock()
+    api.set_charge_amp_limit.side_effect = _slow_set
+    sender = threading.Thread(target=amp_commands.send, args=(VEHICLE, api, 10))
+    sender.start()
+    assert entered.wait(2)
+
+    assert not amp_commands.send(VEHICLE, api, 11)
+    assert not amp_commands.send(VEHICLE, api, 12)
+    release.set()
+    sender.join(2)
+
+    assert sent == [10, 12]
@@ -0,0 +1,155 @@
+"""Tests for the closed-loop amp controller and the closed_loop strategy."""
+
+from dataclasses import dataclass
+
+import pytest
+
+from tesla_smart_charger import energy_bus
+from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.handlers import amp_commands, amp_controller, overload_handler
+from tesla_smart_charger.handlers.charge_snapshot import ChargeSnapshot
+from tesla_smart_charger.models import OverloadStrategy, SystemConfig, VehicleConfig
+
+
+@pytest.fixture(autouse=True)
+def _reset_amp_commands() -> None:
+    """Start every test without setpoints remembered from another."""
+    amp_commands.reset()
+
+
+# ─── AmpController / allocate ─────────────────────────────────────────────────
+
+
+def test_controller_absorbs_a_load_step_in_one_iteration() -> None:
+    """Feed-forward from vehicle current moves straight to the target."""
+    controller = amp_controller.AmpController(target_amps=31.0)
+
+    setpoint = controller.update(
+        house_amps=36.0, vehicle_amps=16.0, min_amps=6.0, max_amps=32.0
+    )
+
+    assert setpoint == pytest.approx(16.0 - amp_controller.KP * 5.0)
+    assert controller.integral == 0.0  # large errors don't integrate
+
+
+def test_integral_trims_steady_offset_and_is_clamped() -> None:
+    """Small persistent errors accumulate, up to the anti-windup limit."""
+    controller = amp_controller.AmpController(target_amps=31.0)
+    for _ in range(100):
+        controller.update(house_amps=30.0, vehicle_amps=10.0, min_amps=6, max_amps=32)
+
+    assert controller.integral == amp_controller.INTEGRAL_LIMIT_AMPS
+
+
+def test_integral_freezes_while_saturated() -> None:
+    """Pinned at the vehicles' minimum, an overload doesn't wind the integral."""
+    controller = amp_controller.AmpController(target_amps=31.0)
+    for _ in range(10):
+        setpoint = controller.update(
+            house_amps=32.0, vehicle_amps=6.0, min_amps=6.0, max_amps=32.0
+        )
+
+    assert setpoint == 6.0
+    assert controller.integral == 0.0
+
+
+def test_allocate_water_fills_within_limits() -> None:
+    """Minimums first, then an even share, with capped shares passed on."""
+    assert amp_controller.allocate(30.0, [(6.0, 8.0), (6.0, 32.0)]) == [8, 22]
+    assert amp_controller.allocate(10.0, [(6.0, 16.0), (6.0, 16.0)]) == [6, 6]
+
+
+# ─── Simulated convergence ────────────────────────────────────────────────────
+
+
+@dataclass
+class _SimCar:
+    """A charging car that draws whatever limit it was last given."""
+
+    amps: float
+    max_amps: float
+
+    def set_charge_amp_limit(self, amp_limit: int) -> dict:
+        self.amps = min(float(amp_limit), self.max_amps)
+        return {}
+
+    def snapshot(self) -> ChargeSnapshot:
+        return ChargeSnapshot("online", "Charging", self.amps)
+
+
+def _settle_iterations(strategy: OverloadStrategy, iterations: int = 20) -> int:
+    """
+    Simulate an overload and count iterations until consumption settles.
+
+    House: 20 A of base load on a 32 A breaker, one car charging at 16 A
+    (its driver's limit).  Settled means from that iteration on consumption
+    stays within the breaker limit and within 2 A of it.
+    """
+    cfg = AppConfig.__new__(AppConfig)
+    cfg._system = SystemConfig(homeMaxAmps=32.0, overloadStrategy=strategy)
+    system = cfg.system
+    vehicle = VehicleConfig(id="v1", chargerMaxAmps=32.0, chargerMinAmps=6.0)
+    car = _SimCar(amps=16.0, max_amps=32.0)
+    base_load = 20.0
+    state = overload_handler._AdjustmentState(intended_amperage={"v1": 16.0})
+
+    # Iteration 0 mirrors trigger_overload's first response.
+    if strategy == OverloadStrategy.CLOSED_LOOP:
+        charging = [(vehicle, car, car.snapshot())]
+        overload_handler._apply_closed_loop(
+            charging, base_load + car.amps, system, state
+        )
+    else:
+        car.set_charge_amp_limit(round(car.amps * system.downStepPercentage))
+
+    history = []
+    for _ in range(iterations):
+        em_amps = base_load + car.amps
+        history.append(em_amps)
+        charging = [(vehicle, car, car.snapshot())]
+        if overload_handler._apply_iteration(charging, em_amps, system, state):
+            break
+
+    settled_from = len(history)
+    for i in range(len(history) - 1, -1, -1):
+        if not system.homeMaxAmps - 2.0 <= history[i] <= system.homeMaxAmps:
+            break
+        settled_from = i
+    return settled_from if settled_from < len(history) else iterations + 1
+
+
+def test_closed_loop_settles_faster_than_step_heuristics() -> None:
+    """The PI controller settles in a couple of iterations; the steps don't."""
+    closed_loop = _settle_iterations(OverloadStrategy.CLOSED_LOOP)
+    proportional = _settle_iterations(OverloadStrategy.PROPORTIONAL)
+    priority = _settle_iterations(OverloadStrategy.PRIORITY)
+
+    assert closed_loop <= 2
+    assert proportional > closed_loop
+    assert priority > closed_loop
+
+
+def test_trigger_overload_starts_closed_loop_from_bus_reading(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The first closed-loop cut uses the triggering reading, not the downstep."""
+    cfg = AppConfig.__new__(AppConfig)
+    cfg._system = SystemConfig(
+        homeMaxAmps=32.0, overloadStrategy=OverloadStrategy.CLOSED_LOOP
+    )
+    vehicle = VehicleConfig(id="v1", chargerMaxAmps=32.0, chargerMinAmps=6.0)
+    cfg._vehicles = [vehicle]
+    car = _SimCar(amps=16.0, max_amps=32.0)
+    monkeypatch.setattr(
+        overload_handler,
+        "_get_charging_vehicles",
+        lambda _apis: [(vehicle, car, car.snapshot())],
+    )
+    monkeypatch.setattr(overload_handler, "handle_overload", lambda *_args: None)
+    energy_bus.bus.reset()
+    energy_bus.bus.publish(36.0 * 230.0, energy_bus.SOURCE_POLL)
+
+    started, _ = overload_handler.trigger_overload(cfg)
+
+    assert started
+    assert car.amps == 11.0  # 20 A base load + 11 A ≈ 31 A target
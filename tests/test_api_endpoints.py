@@ -6,13 +6,19 @@ injects it directly into the route modules (bypassing __main__.py startup), and
 uses FastAPI's TestClient for HTTP calls.  No real Tesla API or DB calls are made.
 """
 
+import json
+import sqlite3
 from pathlib import Path
+from unittest.mock import MagicMock
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from tesla_smart_charger import constants, security
+from tesla_smart_charger import circuit_breaker, constants, fleet_budget, security
 from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.controllers import db_controller, sqlite_pool
+from tesla_smart_charger.models import VehicleConfig
 from tesla_smart_charger.routes import (
     auth_routes,
     config_routes,
@@ -69,6 +75,32 @@ def test_status_returns_200(tmp_path: Path) -> None:
     assert isinstance(body["vehicles"], list)
 
 
+def test_status_reports_fleet_api_budget(tmp_path: Path) -> None:
+    """Each vehicle carries the Fleet API requests it has left per class."""
+    app, app_cfg = _make_app(tmp_path)
+    fleet_budget.budget.reset()
+    vehicle = app_cfg.add_vehicle(VehicleConfig(name="car", teslaVehicleId=""))
+    fleet_budget.budget.acquire(vehicle.id, fleet_budget.COMMAND)
+
+    (status,) = TestClient(app).get("/api/v1/status").json()["vehicles"]
+
+    assert status["apiBudget"] == {"data": 60, "command": 29, "wake": 3}
+
+
+def test_status_reports_circuit_state(tmp_path: Path) -> None:
+    """A vehicle whose circuit is open is reported as such."""
+    app, app_cfg = _make_app(tmp_path)
+    circuit_breaker.breakers.reset()
+    vehicle = app_cfg.add_vehicle(VehicleConfig(name="car", teslaVehicleId=""))
+    for _ in range(constants.CIRCUIT_FAILURE_THRESHOLD):
+        circuit_breaker.breakers.record_failure(vehicle.id)
+
+    (status,) = TestClient(app).get("/api/v1/status").json()["vehicles"]
+    circuit_breaker.breakers.reset()
+
+    assert status["circuitState"] == "open"
+
+
 def test_status_configured_false_by_default(tmp_path: Path) -> None:
     """A freshly created AppConfig reports configured=False."""
     app, _ = _make_app(tmp_path)
@@ -139,7 +171,7 @@ def test_status_monitor_and_overload_flags(tmp_path: Path) -> None:
 
 
 def test_get_config_returns_200(tmp_path: Path) -> None:
-    """GET /api/v1/config returns 200 and never leaks the password hash."""
+    """GET /api/v1/config returns 200 and never leaks secrets."""
     app, _ = _make_app(tmp_path)
     client = TestClient(app)
 
@@ -151,6 +183,7 @@ def test_get_config_returns_200(tmp_path: Path) -> None:
     # Password hash must NOT be in the response
     auth = body.get("auth", {})
     assert "passwordHash" not in auth
+    assert "ingestToken" not in body
 
 
 def test_post_config_updates_field(tmp_path: Path) -> None:
@@ -410,11 +443,91 @@ def test_history_returns_200_with_in_memory_db(tmp_path: Path) -> None:
         assert "data" in body
         assert "count" in body
         assert body["data"] == []
+        assert body["next_cursor"] is None
+
+        r = client.get("/api/v1/history?cursor=bogus")
+        assert r.status_code == 400
+        r = client.get("/api/v1/history?cursor=99999999999999999999999:1")
+        assert r.status_code == 400
+        r = client.get("/api/v1/history?from_date=yesterday")
+        assert r.status_code == 400
+        assert "from_date" in r.json()["detail"]
+        for unpadded in ("2024-1-1", "2024-01-01 1:2:3"):
+            r = client.get(f"/api/v1/history?to_date={unpadded}")
+            assert r.status_code == 400
+
+        r = client.get("/api/v1/history/stats")
+        assert r.status_code == 200
+        assert r.json()["totals"]["events"] == 0
     finally:
         constants.DB_TYPE = original_db_type
         constants.DB_FILE_PATH = original_db_path
 
 
+def test_history_export_streams_filtered_csv_and_ndjson(tmp_path: Path) -> None:
+    """Export honours the history filters and picks the format's media type."""
+    db_path = str(tmp_path / "test.db")
+    original_db_type = constants.DB_TYPE
+    original_db_path = constants.DB_FILE_PATH
+
+    constants.DB_TYPE = "sqlite"
+    constants.DB_FILE_PATH = db_path
+
+    try:
+        ctrl = db_controller.create_database_controller(
+            "sqlite", constants.DB_NAME, db_path
+        )
+        for day in range(1, 6):
+            ctrl.insert_data(
+                {
+                    "start": f"2024-01-0{day} 10:00:00",
+                    "end": f"2024-01-0{day} 10:01:00",
+                    "duration": 60,
+                    "vehicle_id": "v1" if day != 3 else "v2",
+                }
+            )
+        app, _ = _make_app(tmp_path)
+        client = TestClient(app)
+
+        r = client.get("/api/v1/history/export?vehicle_id=v1&from_date=2024-01-02")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/csv")
+        lines = r.text.splitlines()
+        assert lines[0] == "id,start,end,duration,vehicle_id,start_ts,end_ts"
+        assert [line.split(",")[0] for line in lines[1:]] == ["5", "4", "2"]
+
+        r = client.get("/api/v1/history/export?format=ndjson")
+        assert r.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in r.text.splitlines()]
+        assert [row["id"] for row in rows] == [5, 4, 3, 2, 1]
+
+        assert client.get("/api/v1/history/export?format=xml").status_code == 422
+        r = client.get("/api/v1/history/export?to_date=2024-13-01")
+        assert r.status_code == 400
+    finally:
+        constants.DB_TYPE = original_db_type
+        constants.DB_FILE_PATH = original_db_path
+        sqlite_pool.close_all()
+
+
+def test_history_export_closes_controller_when_first_page_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A 500 before streaming starts must still release the DB connection."""
+    ctrl = MagicMock()
+    ctrl.iter_pages.side_effect = sqlite3.OperationalError("disk I/O error")
+    monkeypatch.setattr(
+        db_controller, "create_database_controller", lambda *_args: ctrl
+    )
+    app, _ = _make_app(tmp_path)
+    client = TestClient(app)
+
+    r = client.get("/api/v1/history/export")
+
+    assert r.status_code == 500
+    ctrl.close_connection.assert_called_once_with()
+
+
 # ─── OAuth callback HTML ─────────────────────────────────────────────────────
 
 
@@ -0,0 +1,142 @@
+"""Tests for the per-vehicle circuit breaker."""
+
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from fastapi import HTTPException
+
+from tesla_smart_charger import circuit_breaker, fleet_budget
+from tesla_smart_charger.circuit_breaker import CircuitBreakers, CircuitOpenError
+from tesla_smart_charger.models import CircuitState, VehicleConfig
+from tesla_smart_charger.tesla_api import TeslaAPI
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.sleeps.append(secs)
+        self.now += secs
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_state() -> None:
+    """Start every test with closed circuits and a full request budget."""
+    circuit_breaker.breakers.reset()
+    fleet_budget.budget.reset()
+
+
+def _open(breakers: CircuitBreakers) -> None:
+    for _ in range(3):
+        breakers.record_failure("v1")
+
+
+def test_consecutive_failures_open_the_circuit() -> None:
+    """Requests are refused with a 503 once the threshold is reached."""
+    breakers = CircuitBreakers(failure_threshold=3, open_secs=60, clock=_FakeClock())
+    breakers.record_failure("v1")
+    breakers.record_failure("v1")
+    breakers.allow("v1")
+
+    breakers.record_failure("v1")
+
+    assert breakers.state("v1") == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breakers.allow("v1")
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers == {"Retry-After": "60"}
+    breakers.allow("v2")  # other vehicles are unaffected
+
+
+def test_success_resets_the_failure_count() -> None:
+    """Only consecutive failures count towards opening."""
+    breakers = CircuitBreakers(failure_threshold=3, open_secs=60, clock=_FakeClock())
+    breakers.record_failure("v1")
+    breakers.record_failure("v1")
+    breakers.record_success("v1")
+    breakers.record_failure("v1")
+
+    assert breakers.state("v1") == CircuitState.CLOSED
+
+
+def test_half_open_trial_closes_the_circuit_on_success() -> None:
+    """After the cool-down one request is let through; success closes it."""
+    clock = _FakeClock()
+    breakers = CircuitBreakers(failure_threshold=3, open_secs=60, clock=clock)
+    _open(breakers)
+    clock.sleep(60)
+
+    breakers.allow("v1")
+    assert breakers.state("v1") == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breakers.allow("v1")  # only one trial at a time
+
+    breakers.record_success("v1")
+    assert breakers.state("v1") == CircuitState.CLOSED
+    breakers.allow("v1")
+
+
+def test_failed_trial_reopens_the_circuit() -> None:
+    """A failing trial starts another full cool-down."""
+    clock = _FakeClock()
+    breakers = CircuitBreakers(failure_threshold=3, open_secs=60, clock=clock)
+    _open(breakers)
+    clock.sleep(60)
+    breakers.allow("v1")
+
+    breakers.record_failure("v1")
+    clock.sleep(59)
+
+    assert breakers.state("v1") == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breakers.allow("v1")
+
+
+def test_dead_car_is_skipped_without_touching_the_network(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Retries stop once the circuit opens, and later calls fail instantly."""
+    breakers = CircuitBreakers(failure_threshold=3, open_secs=60, clock=_FakeClock())
+    monkeypatch.setattr(circuit_breaker, "breakers", breakers)
+    clock = _FakeClock()
+    api = TeslaAPI(VehicleConfig(id="v1", teslaVehicleId="777"), clock=clock)
+    session = MagicMock()
+    session.get.side_effect = requests.ConnectionError("proxy down")
+    monkeypatch.setattr(api, "_session", lambda *_args, **_kwargs: session)
+
+    with pytest.raises(CircuitOpenError):
+        api.get_vehicle_data()
+    assert session.get.call_count == 3
+    assert len(clock.sleeps) == 3
+
+    with pytest.raises(CircuitOpenError):
+        api.get_vehicle_data()
+    assert session.get.call_count == 3
+    assert len(clock.sleeps) == 3
+
+
+def test_client_errors_do_not_trip_the_circuit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A 4xx proves the endpoint is reachable, so it counts as an answer."""
+    breakers = CircuitBreakers(failure_threshold=1, open_secs=60, clock=_FakeClock())
+    monkeypatch.setattr(circuit_breaker, "breakers", breakers)
+    api = TeslaAPI(VehicleConfig(id="v1", teslaVehicleId="777"))
+    response = requests.Response()
+    response.status_code = 401
+    session = MagicMock()
+    session.get.return_value = response
+    monkeypatch.setattr(api, "_session", lambda *_args, **_kwargs: session)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as excinfo:
+            api.get_vehicle_data()
+        assert excinfo.value.status_code == 401
+
+    assert breakers.state("v1") == CircuitState.CLOSED
@@ -2,8 +2,9 @@
 Integration-level tests for the vehicle command endpoints.
 
 Each test builds an isolated AppConfig in a temporary directory and injects it
-into the route modules directly.  TeslaAPI is always monkeypatched — no real
-Tesla calls are made, and no background telemetry threads are allowed to start.
+into the route modules directly.  AsyncTeslaAPI is always monkeypatched — no real
+Tesla calls are made, and background telemetry refreshes are recorded rather
+than started.
 
 Every command route sits behind `security.require_auth`, so tests either send
 `auth=CREDS` or assert the guard rejects them.
@@ -17,8 +18,8 @@ from fastapi.testclient import TestClient
 
 from tesla_smart_charger import security, telemetry_cache
 from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.async_tesla_api import AsyncTeslaAPI
 from tesla_smart_charger.routes import command_routes, vehicle_routes
-from tesla_smart_charger.tesla_api import TeslaAPI
 
 VEHICLE_PAYLOAD = {
     "name": "Model Y",
@@ -46,6 +47,18 @@ def _clear_module_state() -> None:
     security._app_config = None
 
 
+@pytest.fixture(autouse=True)
+def scheduled(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, float]]:
+    """Record the background refreshes commands queue instead of running them."""
+    calls: list[tuple[str, float]] = []
+    monkeypatch.setattr(
+        telemetry_cache,
+        "schedule_refresh",
+        lambda vehicle, delay=0.0: bool(calls.append((vehicle.id, delay))) or True,
+    )
+    return calls
+
+
 def _make_app(
     tmp_path: Path, *, auth_enabled: bool = True
 ) -> tuple[FastAPI, AppConfig]:
@@ -193,16 +206,18 @@ def test_charge_limit_rejects_out_of_range(tmp_path: Path, percent: int) -> None
 
 
 def test_wake_calls_tesla_and_returns_202(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    scheduled: list[tuple[str, float]],
 ) -> None:
-    """POST /wake forwards to TeslaAPI.wake_up and reports the returned state."""
+    """POST /wake forwards to AsyncTeslaAPI.wake_up and reports the returned state."""
     calls: list[str] = []
 
-    def _fake_wake(self: TeslaAPI) -> dict:
+    async def _fake_wake(self: AsyncTeslaAPI) -> dict:
         calls.append(self.vehicle.teslaVehicleId)
         return {"state": "online"}
 
-    monkeypatch.setattr(TeslaAPI, "wake_up", _fake_wake)
+    monkeypatch.setattr(AsyncTeslaAPI, "wake_up", _fake_wake)
     client, vid = _client_with_vehicle(tmp_path)
 
     r = client.post(f"/api/v1/vehicles/{vid}/wake", auth=CREDS)
@@ -210,19 +225,23 @@ def test_wake_calls_tesla_and_returns_202(
     assert r.status_code == 202
     assert r.json()["state"] == "online"
     assert calls == ["777"]
+    # Refetched once the car has had time to come online.
+    assert scheduled == [(vid, command_routes._WAKE_SETTLE_SECS)]
 
 
 def test_charge_limit_calls_tesla_and_invalidates_cache(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    scheduled: list[tuple[str, float]],
 ) -> None:
     """POST /charge-limit forwards the percent and drops the cached telemetry."""
     received: list[int] = []
 
-    def _fake_set(self: TeslaAPI, percent: int) -> dict:  # noqa: ARG001
+    async def _fake_set(self: AsyncTeslaAPI, percent: int) -> dict:  # noqa: ARG001
         received.append(percent)
         return {"response": {"result": True}}
 
-    monkeypatch.setattr(TeslaAPI, "set_charge_limit", _fake_set)
+    monkeypatch.setattr(AsyncTeslaAPI, "set_charge_limit", _fake_set)
     client, vid = _client_with_vehicle(tmp_path)
     vehicle = next(v for v in command_routes._app_config.vehicles if v.id == vid)
     telemetry_cache._cache[vid] = (0.0, telemetry_cache.base_status(vehicle))
@@ -234,10 +253,36 @@ def test_charge_limit_calls_tesla_and_invalidates_cache(
     assert r.status_code == 200
     assert received == [80]
     assert telemetry_cache.age(vid) is None
+    assert scheduled == [(vid, 0.0)]
+
+
+def test_command_refetch_follows_vehicle_policy(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    scheduled: list[tuple[str, float]],
+) -> None:
+    """With refreshAfterCommand off, a command only invalidates the cache."""
+
+    async def _fake_start(_self: AsyncTeslaAPI) -> dict:
+        return {"response": {"result": True}}
+
+    monkeypatch.setattr(AsyncTeslaAPI, "start_charge", _fake_start)
+    client, vid = _client_with_vehicle(tmp_path)
+    r = client.patch(
+        f"/api/v1/vehicles/{vid}",
+        json={"telemetryPolicy": {"refreshAfterCommand": False}},
+    )
+    assert r.json()["telemetryPolicy"]["refreshAfterCommand"] is False
+    assert r.json()["telemetryPolicy"]["idleTtlSecs"] == 120.0  # others kept
+
+    r = client.post(f"/api/v1/vehicles/{vid}/charge/start", auth=CREDS)
+
+    assert r.status_code == 200
+    assert scheduled == []
 
 
 class _FakeResponse:
-    """Minimal stand-in for a requests.Response carrying a JSON body."""
+    """Minimal stand-in for an httpx2.Response carrying a JSON body."""
 
     def __init__(self, payload: dict) -> None:
         self._payload = payload
@@ -251,9 +296,13 @@ class _FakeResponse:
 
 def _patch_tesla_post(monkeypatch: pytest.MonkeyPatch, payload: dict) -> None:
     """Make every outbound Tesla command POST return *payload* with HTTP 200."""
+
+    async def _fake_request(*_args: object, **_kwargs: object) -> _FakeResponse:
+        return _FakeResponse(payload)
+
     monkeypatch.setattr(
-        "tesla_smart_charger.tesla_api.requests.post",
-        lambda *args, **kwargs: _FakeResponse(payload),  # noqa: ARG005
+        "tesla_smart_charger.async_tesla_api.httpx2.AsyncClient.request",
+        _fake_request,
     )
 
 
@@ -320,16 +369,18 @@ def test_refresh_evicts_cache_and_schedules(
 
 
 def test_start_charge_calls_tesla_and_invalidates_cache(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    scheduled: list[tuple[str, float]],
 ) -> None:
     """POST /charge/start forwards to start_charge and drops the cached telemetry."""
     received: list[str] = []
 
-    def _fake_start(_self: TeslaAPI) -> dict:
+    async def _fake_start(_self: AsyncTeslaAPI) -> dict:
         received.append("start")
         return {"response": {"result": True}}
 
-    monkeypatch.setattr(TeslaAPI, "start_charge", _fake_start)
+    monkeypatch.setattr(AsyncTeslaAPI, "start_charge", _fake_start)
     client, vid = _client_with_vehicle(tmp_path)
     vehicle = next(v for v in command_routes._app_config.vehicles if v.id == vid)
     telemetry_cache._cache[vid] = (0.0, telemetry_cache.base_status(vehicle))
@@ -339,19 +390,22 @@ def test_start_charge_calls_tesla_and_invalidates_cache(
     assert r.status_code == 200
     assert received == ["start"]
     assert telemetry_cache.age(vid) is None
+    assert scheduled == [(vid, 0.0)]
 
 
 def test_stop_charge_calls_tesla_and_invalidates_cache(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    scheduled: list[tuple[str, float]],
 ) -> None:
     """POST /charge/stop forwards to stop_charge and drops the cached telemetry."""
     received: list[str] = []
 
-    def _fake_stop(_self: TeslaAPI) -> dict:
+    async def _fake_stop(_self: AsyncTeslaAPI) -> dict:
         received.append("stop")
         return {"response": {"result": True}}
 
-    monkeypatch.setattr(TeslaAPI, "stop_charge", _fake_stop)
+    monkeypatch.setattr(AsyncTeslaAPI, "stop_charge", _fake_stop)
     client, vid = _client_with_vehicle(tmp_path)
     vehicle = next(v for v in command_routes._app_config.vehicles if v.id == vid)
     telemetry_cache._cache[vid] = (0.0, telemetry_cache.base_status(vehicle))
@@ -361,6 +415,7 @@ def test_stop_charge_calls_tesla_and_invalidates_cache(
     assert r.status_code == 200
     assert received == ["stop"]
     assert telemetry_cache.age(vid) is None
+    assert scheduled == [(vid, 0.0)]
 
 
 def test_start_charge_surfaces_vehicle_rejection(
@@ -0,0 +1,113 @@
+"""Tests for the in-memory consumption history and /api/v1/consumption."""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tesla_smart_charger import consumption_history, energy_bus
+from tesla_smart_charger.consumption_history import ConsumptionHistory
+from tesla_smart_charger.routes import consumption_routes
+
+
+@pytest.fixture(autouse=True)
+def _clear_state() -> None:
+    """Keep the process-wide bus and history from leaking between tests."""
+    energy_bus.bus.reset()
+
+
+def test_ring_wraps_and_keeps_newest() -> None:
+    """Past capacity, the oldest samples are overwritten."""
+    history = ConsumptionHistory(capacity=3, channels=1)
+    for second in range(5):
+        history.append(1000.0 + second, 100.0 * second, (100.0 * second,))
+
+    buckets = history.buckets(since=0, resolution=1)
+
+    assert len(history) == 3
+    assert [b["timestamp"] for b in buckets] == [1002.0, 1003.0, 1004.0]
+    assert [b["emeters"] for b in buckets] == [[200.0], [300.0], [400.0]]
+    assert [b["mean"] for b in history.buckets(since=1002.5, resolution=1)] == [
+        300.0,
+        400.0,
+    ]
+
+
+def test_readings_within_one_second_are_coalesced() -> None:
+    """A burst of pushes in the same second keeps only the latest reading."""
+    history = ConsumptionHistory(capacity=10, channels=1)
+    history.append(1000.1, 100.0, ())
+    history.append(1000.9, 300.0, ())
+
+    assert len(history) == 1
+    assert history.buckets(since=0, resolution=1)[0]["max"] == 300.0
+
+
+def test_buckets_min_max_mean_and_emeters() -> None:
+    """Samples are grouped into aligned buckets with per-emeter means."""
+    history = ConsumptionHistory(capacity=100, channels=2)
+    history.append(1200.0, 300.0, (200.0, 100.0))
+    history.append(1210.0, 900.0, (600.0, 300.0))
+    history.append(1230.0, 600.0, (600.0,))
+    history.append(1260.0, 50.0, (50.0, 0.0))
+
+    first, second = history.buckets(since=1000.0, resolution=60)
+
+    assert first["timestamp"] == 1200.0
+    assert first["count"] == 3
+    assert (first["min"], first["max"], first["mean"]) == (300.0, 900.0, 600.0)
+    assert first["emeters"] == [pytest.approx(1400.0 / 3), 200.0]
+    assert second == {
+        "timestamp": 1260.0,
+        "count": 1,
+        "min": 50.0,
+        "max": 50.0,
+        "mean": 50.0,
+        "emeters": [50.0, 0.0],
+    }
+    assert history.buckets(since=1230.0, resolution=60) == [second]
+
+
+def test_consumption_route_serves_bus_readings() -> None:
+    """Readings published on the energy bus show up in the endpoint."""
+    app = FastAPI()
+    app.include_router(consumption_routes.router)
+    client = TestClient(app)
+    energy_bus.bus.publish(1500.0, energy_bus.SOURCE_PUSH, (1000.0, 500.0))
+
+    r = client.get("/api/v1/consumption", params={"resolution": 3600})
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["channels"] == consumption_history.history.channels
+    assert len(body["buckets"]) == 1
+    assert body["buckets"][0]["mean"] == 1500.0
+    assert body["buckets"][0]["emeters"] == [1000.0, 500.0]
+
+
+def test_consumption_route_coarsens_resolution() -> None:
+    """A 24 h window at 1 s would exceed the bucket cap, so it's coarsened."""
+    app = FastAPI()
+    app.include_router(consumption_routes.router)
+    client = TestClient(app)
+
+    r = client.get(
+        "/api/v1/consumption",
+        params={"since": time.time() - 86400, "resolution": 1},
+    )
+
+    assert r.status_code == 200
+    assert r.json()["resolution"] >= 86400 / 2000
+
+
+@pytest.mark.parametrize("since", ["nan", "inf", "-inf"])
+def test_consumption_route_rejects_non_finite_since(since: str) -> None:
+    """A non-finite since is a client error, not a 500."""
+    app = FastAPI()
+    app.include_router(consumption_routes.router)
+    client = TestClient(app)
+
+    r = client.get("/api/v1/consumption", params={"since": since})
+
+    assert r.status_code == 400
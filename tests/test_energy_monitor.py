@@ -0,0 +1,230 @@
+"""Tests for energy-monitor ingestion: the reading bus, the cron and push."""
+
+import math
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tesla_smart_charger import energy_bus, security
+from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.cron import em_cron
+from tesla_smart_charger.models import EnergyMonitorMode, SystemConfig
+from tesla_smart_charger.routes import energy_routes
+
+
+@pytest.fixture(autouse=True)
+def _clear_state() -> None:
+    """Keep the process-wide bus and overload flag from leaking between tests."""
+    energy_bus.bus.reset()
+    em_cron.OVERLOAD = False
+    em_cron._retrigger_after = -math.inf
+
+
+def _make_app_config(**system: object) -> AppConfig:
+    cfg = AppConfig.__new__(AppConfig)
+    cfg._system = SystemConfig(homeMaxAmps=32.0, voltage=230.0, **system)
+    cfg._vehicles = []
+    return cfg
+
+
+# ─── EnergyBus ────────────────────────────────────────────────────────────────
+
+
+def test_bus_wait_returns_newer_sample() -> None:
+    """A waiter is woken by the next publish and sees the latest reading."""
+    bus = energy_bus.EnergyBus()
+    threading.Timer(0.05, bus.publish, args=(1200.0, energy_bus.SOURCE_PUSH)).start()
+
+    sample = bus.wait_for_sample(bus.sequence, timeout=2)
+
+    assert sample is not None
+    assert sample.watts == 1200.0
+    assert sample.source == energy_bus.SOURCE_PUSH
+
+
+def test_bus_keeps_a_bounded_history() -> None:
+    """The ring buffer drops the oldest samples and filters by timestamp."""
+    bus = energy_bus.EnergyBus(capacity=3)
+    for watts in (1.0, 2.0, 3.0, 4.0):
+        bus.publish(watts, energy_bus.SOURCE_POLL)
+
+    assert [s.watts for s in bus.samples()] == [2.0, 3.0, 4.0]
+    assert bus.samples(since=bus.latest().timestamp) == []
+    assert bus.fresh(max_age=60).watts == 4.0
+
+
+def test_bus_wait_times_out_without_new_sample() -> None:
+    """Already-seen samples don't satisfy a wait."""
+    bus = energy_bus.EnergyBus()
+    seen = bus.publish(100.0, energy_bus.SOURCE_POLL)
+
+    assert bus.wait_for_sample(seen.seq, timeout=0.05) is None
+
+
+# ─── em_cron ──────────────────────────────────────────────────────────────────
+
+
+def test_check_power_consumption_triggers_on_overload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A reading above homeMaxAmps starts an overload session once."""
+    trigger = MagicMock(return_value=(True, "started"))
+    monkeypatch.setattr(em_cron.overload_handler, "trigger_overload", trigger)
+    app_config = _make_app_config()
+
+    sample = energy_bus.bus.publish(230.0 * 40, energy_bus.SOURCE_PUSH)
+    em_cron._check_power_consumption(sample, app_config)
+    em_cron._check_power_consumption(sample, app_config)
+
+    trigger.assert_called_once_with(app_config)
+
+
+def test_failed_trigger_is_not_retried_on_every_reading(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A trigger that starts nothing cools down instead of refetching each sample."""
+    trigger = MagicMock(return_value=(False, "no vehicles are currently charging"))
+    monkeypatch.setattr(em_cron.overload_handler, "trigger_overload", trigger)
+    app_config = _make_app_config(energyMonitorPollSecs=15)
+
+    sample = energy_bus.bus.publish(230.0 * 40, energy_bus.SOURCE_PUSH)
+    em_cron._check_power_consumption(sample, app_config)
+    em_cron._check_power_consumption(sample, app_config)
+    assert trigger.call_count == 1
+    assert not em_cron.OVERLOAD
+
+    em_cron._retrigger_after = -math.inf  # the cooldown has elapsed
+    em_cron._check_power_consumption(sample, app_config)
+    assert trigger.call_count == 2
+
+
+def _run_cron(
+    monkeypatch: pytest.MonkeyPatch, app_config: AppConfig, em_ctrl: MagicMock
+) -> threading.Event:
+    stop = threading.Event()
+    monkeypatch.setattr(em_cron, "_get_em_controller", lambda _cfg: em_ctrl)
+    threading.Thread(
+        target=em_cron.start_cron_monitor, args=(stop, app_config), daemon=True
+    ).start()
+    return stop
+
+
+def test_push_mode_evaluates_every_pushed_sample(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Pushed readings are evaluated as they arrive, without polling the device."""
+    triggered = threading.Event()
+    monkeypatch.setattr(
+        em_cron.overload_handler,
+        "trigger_overload",
+        lambda _cfg: triggered.set() or (True, "started"),
+    )
+    # The cron polls once on start-up; push only after that has happened.
+    polled = threading.Event()
+    em_ctrl = MagicMock()
+    em_ctrl.get_emeter_powers.side_effect = lambda: polled.set() or (230.0,)
+    app_config = _make_app_config(
+        energyMonitorMode=EnergyMonitorMode.PUSH, energyMonitorPollSecs=60
+    )
+
+    stop = _run_cron(monkeypatch, app_config, em_ctrl)
+    try:
+        assert polled.wait(3)
+        energy_bus.bus.publish(230.0 * 40, energy_bus.SOURCE_PUSH)
+        assert triggered.wait(3)
+    finally:
+        stop.set()
+    assert em_ctrl.get_emeter_powers.call_count == 1
+
+
+def test_push_mode_falls_back_to_polling(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With no pushes the cron keeps polling the device itself."""
+    polled = threading.Semaphore(0)
+    em_ctrl = MagicMock()
+    em_ctrl.get_emeter_powers.side_effect = lambda: polled.release() or (230.0,)
+    app_config = _make_app_config(
+        energyMonitorMode=EnergyMonitorMode.PUSH, energyMonitorPollSecs=1
+    )
+
+    stop = _run_cron(monkeypatch, app_config, em_ctrl)
+    try:
+        assert polled.acquire(timeout=3)
+        assert polled.acquire(timeout=3)
+    finally:
+        stop.set()
+    assert energy_bus.bus.latest().source == energy_bus.SOURCE_POLL
+
+
+# ─── Push endpoint ────────────────────────────────────────────────────────────
+
+
+_TOKEN = "push-secret"
+
+
+def _client(tmp_path: Path, mode: EnergyMonitorMode, token: str = _TOKEN) -> TestClient:
+    app_cfg = AppConfig(str(tmp_path / "config"))
+    app_cfg._legacy_file = tmp_path / "no_legacy.json"
+    app_cfg.load()
+    app_cfg.update_system({"energyMonitorMode": mode, "ingestToken": token})
+    energy_routes.init(app_cfg)
+    security.init(app_cfg)
+    app = FastAPI()
+    app.include_router(energy_routes.router)
+    return TestClient(app, headers={"Authorization": f"Bearer {_TOKEN}"})
+
+
+def test_push_json_sums_emeters(tmp_path: Path) -> None:
+    """A Shelly-style status body is summed across channels onto the bus."""
+    client = _client(tmp_path, EnergyMonitorMode.PUSH)
+
+    r = client.post(
+        "/api/v1/energy-monitor/push",
+        json={"emeters": [{"power": 1000.0}, {"power": 500.0}]},
+    )
+
+    assert r.status_code == 202
+    assert energy_bus.bus.latest().watts == 1500.0
+
+
+def test_push_cannot_be_sent_with_get(tmp_path: Path) -> None:
+    """A GET must not change state, so a page can't push via an <img> tag."""
+    client = _client(tmp_path, EnergyMonitorMode.PUSH)
+
+    r = client.get("/api/v1/energy-monitor/push?power=0")
+
+    assert r.status_code == 405
+    assert energy_bus.bus.latest() is None
+
+
+@pytest.mark.parametrize(
+    ("token", "headers", "status"),
+    [
+        (_TOKEN, {"Authorization": ""}, 401),
+        (_TOKEN, {"Authorization": "Bearer wrong"}, 401),
+        ("", {}, 403),
+    ],
+)
+def test_push_requires_ingest_token(
+    tmp_path: Path, token: str, headers: dict[str, str], status: int
+) -> None:
+    """Pushes without the shared token are refused, and fail closed without one."""
+    client = _client(tmp_path, EnergyMonitorMode.PUSH, token=token)
+
+    r = client.post("/api/v1/energy-monitor/push", json={"power": 0.0}, headers=headers)
+
+    assert r.status_code == status
+    assert energy_bus.bus.latest() is None
+
+
+def test_push_rejected_in_poll_mode(tmp_path: Path) -> None:
+    """Pushes are refused unless push mode is configured."""
+    client = _client(tmp_path, EnergyMonitorMode.POLL)
+
+    r = client.post("/api/v1/energy-monitor/push", json={"power": 100.0})
+
+    assert r.status_code == 409
+    assert energy_bus.bus.latest() is None
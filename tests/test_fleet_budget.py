@@ -0,0 +1,112 @@
+"""Tests for the per-vehicle Fleet API budget."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from tesla_smart_charger import fleet_budget
+from tesla_smart_charger.fleet_budget import BudgetExceededError, FleetBudget, Priority
+from tesla_smart_charger.models import VehicleConfig
+from tesla_smart_charger.tesla_api import TeslaAPI
+
+BUDGETS = {"data": (10, 60.0), "command": (4, 60.0)}
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.sleeps.append(secs)
+        self.now += secs
+
+
+def _drain(budget: FleetBudget, priority: Priority, endpoint: str = "data") -> int:
+    """Spend tokens at *priority* until refused; return how many were granted."""
+    granted = 0
+    while True:
+        try:
+            budget.acquire("v1", endpoint, priority, wait=False)
+        except BudgetExceededError:
+            return granted
+        granted += 1
+
+
+def test_lower_priorities_leave_a_reserve() -> None:
+    """Background stops at half, interactive at a quarter, overload drains it."""
+    budget = FleetBudget(BUDGETS, clock=_FakeClock())
+
+    assert _drain(budget, Priority.BACKGROUND) == 5
+    assert _drain(budget, Priority.INTERACTIVE) == 2
+    assert _drain(budget, Priority.OVERLOAD) == 3
+    assert budget.remaining("v1") == {"data": 0, "command": 4}
+
+
+def test_budget_refills_over_time_per_vehicle_and_endpoint() -> None:
+    """Buckets refill at their rate and are independent of each other."""
+    clock = _FakeClock()
+    budget = FleetBudget(BUDGETS, clock=clock)
+    _drain(budget, Priority.OVERLOAD)
+
+    assert budget.remaining("v2") == {"data": 10, "command": 4}
+    clock.sleep(30)
+    assert budget.remaining("v1")["data"] == 5
+
+
+def test_rejection_is_a_429_with_retry_after() -> None:
+    """A refused request says when a token will be available."""
+    budget = FleetBudget(BUDGETS, clock=_FakeClock())
+    _drain(budget, Priority.OVERLOAD, "command")
+
+    with pytest.raises(BudgetExceededError) as excinfo:
+        budget.acquire("v1", "command", Priority.INTERACTIVE)
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers == {"Retry-After": "30"}  # 2 tokens at 4/min
+
+
+def test_overload_requests_queue_for_a_token() -> None:
+    """Overload waits for the next token when that is soon enough."""
+    clock = _FakeClock()
+    budget = FleetBudget({"command": (60, 60.0)}, clock=clock)
+    _drain(budget, Priority.OVERLOAD, "command")
+
+    budget.acquire("v1", "command", Priority.OVERLOAD)
+
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_overload_is_rejected_when_the_wait_is_too_long() -> None:
+    """A token further off than the queueing limit is not waited for."""
+    clock = _FakeClock()
+    budget = FleetBudget(BUDGETS, clock=clock)
+    _drain(budget, Priority.OVERLOAD, "command")
+
+    with pytest.raises(BudgetExceededError):
+        budget.acquire("v1", "command", Priority.OVERLOAD)
+    assert clock.sleeps == []
+
+
+def test_tesla_api_spends_budget_and_never_retries_a_rejection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A refused request reaches neither the network nor the retry loop."""
+    budget = FleetBudget(BUDGETS, clock=_FakeClock())
+    monkeypatch.setattr(fleet_budget, "budget", budget)
+    api = TeslaAPI(
+        VehicleConfig(id="v1", teslaVehicleId="777"), priority=Priority.BACKGROUND
+    )
+    session = MagicMock()
+    session.get.return_value.json.return_value = {"response": {"state": "online"}}
+    monkeypatch.setattr(api, "_session", lambda *_args, **_kwargs: session)
+
+    for _ in range(5):
+        api.get_vehicle_data()
+    with pytest.raises(BudgetExceededError):
+        api.get_vehicle_data()
+
+    assert session.get.call_count == 5
@@ -0,0 +1,204 @@
+"""Tests for Fleet Telemetry ingestion and its use in place of polling."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from tesla_smart_charger import fleet_telemetry, security, telemetry_cache
+from tesla_smart_charger.app_config import AppConfig
+from tesla_smart_charger.fleet_telemetry import TelemetryStream
+from tesla_smart_charger.handlers import overload_handler
+from tesla_smart_charger.models import VehicleConfig
+from tesla_smart_charger.routes import fleet_telemetry_routes
+from tesla_smart_charger.simulator.fakes import FakeTelemetryProducer
+from tesla_smart_charger.simulator.plant import LoadTrace, Plant, SimCar
+
+VIN = "5YJYGDEE1MF000001"
+TOKEN = "relay-secret"
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.now += secs
+
+
+@pytest.fixture(autouse=True)
+def _reset_stream() -> None:
+    """Start every test with no streamed signals and an empty cache."""
+    fleet_telemetry.stream.reset()
+    telemetry_cache.reset()
+
+
+def _vehicle(**overrides: object) -> VehicleConfig:
+    defaults: dict[str, object] = {
+        "id": "veh-1",
+        "vin": VIN,
+        "teslaVehicleId": "777",
+        "chargerMinAmps": 6.0,
+        "chargerMaxAmps": 32.0,
+    }
+    return VehicleConfig(**{**defaults, **overrides})
+
+
+def _client(tmp_path: Path, vehicle: VehicleConfig) -> TestClient:
+    app_cfg = AppConfig(str(tmp_path / "config"))
+    app_cfg._legacy_file = tmp_path / "no_legacy.json"
+    app_cfg.load()
+    app_cfg.add_vehicle(vehicle)
+    app_cfg.update_system({"ingestToken": TOKEN})
+    fleet_telemetry_routes.init(app_cfg)
+    security.init(app_cfg)
+    app = FastAPI()
+    app.include_router(fleet_telemetry_routes.router)
+    return TestClient(app, headers={"Authorization": f"Bearer {TOKEN}"})
+
+
+def test_decode_maps_typed_values_to_vehicle_data_keys() -> None:
+    """Each value type is unwrapped; invalid and unknown signals are dropped."""
+    decoded = fleet_telemetry.decode(
+        [
+            {
+                "key": "DetailedChargeState",
+                "value": {"detailedChargeStateValue": "DetailedChargeStateCharging"},
+            },
+            {"key": "ChargeAmps", "value": {"doubleValue": 15.6}},
+            {"key": "BatteryLevel", "value": {"stringValue": "79.6"}},
+            {"key": "ChargeLimitSoc", "value": {"invalid": True}},
+            {"key": "Odometer", "value": {"doubleValue": 12000.0}},
+        ]
+    )
+
+    assert decoded == {
+        "charging_state": "Charging",
+        "charger_actual_current": 15.6,
+        "battery_level": 80,
+    }
+
+
+def test_stream_merges_partial_records_until_stale() -> None:
+    """Records carry only changes; the merged state expires with the stream."""
+    clock = _FakeClock()
+    stream = TelemetryStream(stale_secs=30, clock=clock)
+
+    stream.ingest("v1", {"charging_state": "Charging"})
+    assert stream.vehicle_data("v1") is None  # no current reported yet
+
+    stream.ingest("v1", {"charger_actual_current": 16.0})
+    assert stream.vehicle_data("v1") == {
+        "state": "online",
+        "charge_state": {"charging_state": "Charging", "charger_actual_current": 16.0},
+    }
+
+    clock.sleep(31)
+    assert stream.vehicle_data("v1") is None
+
+
+def test_producer_records_feed_the_stream(tmp_path: Path) -> None:
+    """Records posted by the stand-in producer land on the vehicle's signals."""
+    vehicle = _vehicle()
+    client = _client(tmp_path, vehicle)
+    plant = Plant(
+        LoadTrace([(0, 10.0)]),
+        [SimCar(vehicle=vehicle, limit=16.0)],
+        home_max_amps=32.0,
+        voltage=230.0,
+    )
+    producer = FakeTelemetryProducer(
+        plant,
+        vehicle,
+        lambda record: client.post("/api/v1/fleet-telemetry", json=record),
+    )
+
+    r = producer.emit()
+
+    assert r.status_code == 202
+    assert fleet_telemetry.stream.vehicle_data(vehicle.id)["charge_state"] == {
+        "charging_state": "Charging",
+        "charger_actual_current": 16.0,
+        "charge_current_request": 16,
+    }
+
+
+def test_record_for_unknown_vin_is_rejected(tmp_path: Path) -> None:
+    """Records are only accepted for configured vehicles."""
+    client = _client(tmp_path, _vehicle())
+
+    r = client.post("/api/v1/fleet-telemetry", json={"vin": "OTHER", "data": []})
+
+    assert r.status_code == 404
+
+
+def test_record_without_ingest_token_is_rejected(tmp_path: Path) -> None:
+    """Only the relay holding the shared token may feed a vehicle's signals."""
+    client = _client(tmp_path, _vehicle())
+    record = {
+        "vin": VIN,
+        "data": [{"key": "ChargeAmps", "value": {"doubleValue": 0.0}}],
+    }
+
+    missing = client.post(
+        "/api/v1/fleet-telemetry", json=record, headers={"Authorization": ""}
+    )
+    wrong = client.post(
+        "/api/v1/fleet-telemetry",
+        json=record,
+        headers={"Authorization": "Bearer wrong"},
+    )
+
+    assert (missing.status_code, wrong.status_code) == (401, 401)
+    assert fleet_telemetry.stream.vehicle_data("veh-1") is None
+
+
+def test_telemetry_cache_serves_streamed_vehicles_without_polling() -> None:
+    """A streaming vehicle's status comes from the stream, not vehicle_data."""
+    vehicle = _vehicle()
+    fleet_telemetry.stream.ingest(
+        vehicle.id,
+        {
+            "charging_state": "Charging",
+            "charger_actual_current": 12.0,
+            "battery_level": 55,
+        },
+    )
+
+    with patch.object(telemetry_cache, "schedule_refresh") as mock_schedule:
+        status = telemetry_cache.get(vehicle, overload_active=False)
+
+    mock_schedule.assert_not_called()
+    assert status.online
+    assert status.chargingState == "Charging"
+    assert status.chargerActualCurrent == 12.0
+    assert status.batteryLevel == 55
+
+
+def test_overload_polls_only_vehicles_that_are_not_streaming() -> None:
+    """Streamed vehicles skip the vehicle_data call; order is preserved."""
+    streaming, polled = _vehicle(id="streaming"), _vehicle(id="polled", vin="")
+    fleet_telemetry.stream.ingest(
+        streaming.id, {"charging_state": "Charging", "charger_actual_current": 10.0}
+    )
+    streaming_api, polled_api = MagicMock(), MagicMock()
+    polled_api.get_vehicle_data.return_value = {
+        "state": "online",
+        "charge_state": {"charging_state": "Charging", "charger_actual_current": 8.0},
+    }
+
+    charging = overload_handler._get_charging_vehicles(
+        [(streaming, streaming_api), (polled, polled_api)], deadline_secs=5
+    )
+
+    streaming_api.get_vehicle_data.assert_not_called()
+    polled_api.get_vehicle_data.assert_called_once()
+    assert [(v.id, s.actual_current) for v, _, s in charging] == [
+        ("streaming", 10.0),
+        ("polled", 8.0),
+    ]
@@ -1,16 +1,29 @@
 """Tests for the overload handler — updated for v2 multi-vehicle architecture."""
 
+import threading
+import time
+from collections.abc import Callable
 from unittest.mock import MagicMock, patch
 
 import pytest
+from fastapi import HTTPException
 
+from tesla_smart_charger import energy_bus, fleet_telemetry
 from tesla_smart_charger.app_config import AppConfig
-from tesla_smart_charger.handlers import overload_handler
+from tesla_smart_charger.handlers import amp_commands, overload_handler
+from tesla_smart_charger.handlers.charge_snapshot import ChargeSnapshot
 from tesla_smart_charger.models import SystemConfig, VehicleConfig
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 
+@pytest.fixture(autouse=True)
+def _reset_energy_bus() -> None:
+    """Start every test without shared energy readings or sent setpoints."""
+    energy_bus.bus.reset()
+    amp_commands.reset()
+
+
 def _make_app_config(voltage: float = 230.0, home_max_amps: float = 32.0) -> AppConfig:
     """Return a minimal AppConfig with the given system settings."""
     cfg = AppConfig.__new__(AppConfig)
@@ -31,6 +44,21 @@ def _make_vehicle(**overrides: object) -> VehicleConfig:
     return VehicleConfig(**defaults)
 
 
+class _FakeClock:
+    """`Clock` whose sleeps only move its own time forward."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.sleeps.append(secs)
+        self.now += secs
+
+
 # ─── _calculate_new_charge_limit ──────────────────────────────────────────────
 
 
@@ -78,7 +106,7 @@ def test_get_consumption_returns_amps() -> None:
     """230 W / 230 V = 1.0 A."""
     app_config = _make_app_config(voltage=230.0)
     mock_em = MagicMock()
-    mock_em.get_consumption.return_value = 230.0
+    mock_em.get_emeter_powers.return_value = (230.0,)
 
     result = overload_handler._get_consumption(mock_em, app_config)
     assert result == pytest.approx(1.0)
@@ -88,12 +116,39 @@ def test_get_consumption_returns_zero_on_error() -> None:
     """ValueError from em controller → return 0.0."""
     app_config = _make_app_config(voltage=230.0)
     mock_em = MagicMock()
-    mock_em.get_consumption.side_effect = ValueError("EM offline")
+    mock_em.get_emeter_powers.side_effect = ValueError("EM offline")
 
     result = overload_handler._get_consumption(mock_em, app_config)
     assert result == 0.0
 
 
+def test_get_consumption_reuses_fresh_bus_sample() -> None:
+    """A recent cron reading is reused instead of polling the device again."""
+    app_config = _make_app_config(voltage=230.0)
+    energy_bus.bus.publish(460.0, energy_bus.SOURCE_POLL)
+    mock_em = MagicMock()
+
+    result = overload_handler._get_consumption(mock_em, app_config)
+
+    assert result == pytest.approx(2.0)
+    mock_em.get_emeter_powers.assert_not_called()
+
+
+def test_get_consumption_polls_and_publishes_when_bus_is_stale() -> None:
+    """A stale bus falls back to the device and shares the fresh reading."""
+    app_config = _make_app_config(voltage=230.0)
+    energy_bus.bus.publish(460.0, energy_bus.SOURCE_POLL)
+    mock_em = MagicMock()
+    mock_em.get_emeter_powers.return_value = (490.0, 200.0)
+
+    with patch.object(overload_handler, "_sample_max_age", return_value=-1.0):
+        result = overload_handler._get_consumption(mock_em, app_config)
+
+    assert result == pytest.approx(3.0)
+    assert energy_bus.bus.latest().watts == 690.0
+    assert energy_bus.bus.latest().emeters == (490.0, 200.0)
+
+
 # ─── _save_event ──────────────────────────────────────────────────────────────
 
 
@@ -132,6 +187,10 @@ def test_session_flag_toggle() -> None:
     assert overload_handler.is_session_active() is False
 
 
+def _snapshot(current: float) -> ChargeSnapshot:
+    return ChargeSnapshot("online", "Charging", current)
+
+
 # ─── _intended_amp_limit ──────────────────────────────────────────────────────
 
 
@@ -140,7 +199,12 @@ def test_intended_amp_limit_prefers_current_request() -> None:
     vehicle = _make_vehicle()
     data = {"charge_state": {"charge_amps": 20, "charge_current_request": 22}}
 
-    assert overload_handler._intended_amp_limit(data, vehicle) == 22
+    assert (
+        overload_handler._intended_amp_limit(
+            ChargeSnapshot.from_vehicle_data(data), vehicle
+        )
+        == 22
+    )
 
 
 def test_intended_amp_limit_falls_back_to_charge_amps() -> None:
@@ -148,7 +212,12 @@ def test_intended_amp_limit_falls_back_to_charge_amps() -> None:
     vehicle = _make_vehicle()
     data = {"charge_state": {"charge_amps": 20}}
 
-    assert overload_handler._intended_amp_limit(data, vehicle) == 20
+    assert (
+        overload_handler._intended_amp_limit(
+            ChargeSnapshot.from_vehicle_data(data), vehicle
+        )
+        == 20
+    )
 
 
 def test_intended_amp_limit_falls_back_to_current_request() -> None:
@@ -156,7 +225,12 @@ def test_intended_amp_limit_falls_back_to_current_request() -> None:
     vehicle = _make_vehicle()
     data = {"charge_state": {"charge_current_request": 22}}
 
-    assert overload_handler._intended_amp_limit(data, vehicle) == 22
+    assert (
+        overload_handler._intended_amp_limit(
+            ChargeSnapshot.from_vehicle_data(data), vehicle
+        )
+        == 22
+    )
 
 
 def test_intended_amp_limit_falls_back_to_configured_max() -> None:
@@ -164,7 +238,12 @@ def test_intended_amp_limit_falls_back_to_configured_max() -> None:
     vehicle = _make_vehicle(chargerMaxAmps=32.0)
     data = {"charge_state": {}}
 
-    assert overload_handler._intended_amp_limit(data, vehicle) == 32
+    assert (
+        overload_handler._intended_amp_limit(
+            ChargeSnapshot.from_vehicle_data(data), vehicle
+        )
+        == 32
+    )
 
 
 # ─── _ramp_up_ceiling ─────────────────────────────────────────────────────────
@@ -199,15 +278,12 @@ def test_ramp_up_caps_set_limit_at_intended() -> None:
     vehicle = _make_vehicle()
 
     api = MagicMock()
-    charging = [(vehicle, api, {"charge_state": {"charger_actual_current": 18.0}})]
+    charging = [(vehicle, api, _snapshot(18.0))]
     state = overload_handler._AdjustmentState(intended_amperage={vehicle.id: 20.0})
 
-    with patch(
-        "tesla_smart_charger.handlers.overload_handler.time.time", return_value=1000.0
-    ):
-        result = overload_handler._apply_ramp_up(
-            charging, em_amps=25.0, cfg=SystemConfig(), state=state
-        )
+    result = overload_handler._apply_ramp_up(
+        charging, em_amps=25.0, cfg=SystemConfig(), state=state, clock=_FakeClock()
+    )
 
     # step = 0.25 * (25-6) = 4.75 → 18 + 4.75 caps at 20, not 22+
     api.set_charge_amp_limit.assert_called_once_with(20)
@@ -218,16 +294,251 @@ def test_ramp_up_invalidates_telemetry_cache() -> None:
     """A successful ramp-up drops cached telemetry so the UI refreshes."""
     vehicle = _make_vehicle()
     api = MagicMock()
-    charging = [(vehicle, api, {"charge_state": {"charger_actual_current": 18.0}})]
+    charging = [(vehicle, api, _snapshot(18.0))]
     state = overload_handler._AdjustmentState(intended_amperage={vehicle.id: 20.0})
 
     with patch(
-        "tesla_smart_charger.handlers.overload_handler.time.time", return_value=1000.0
-    ), patch(
-        "tesla_smart_charger.handlers.overload_handler.telemetry_cache.invalidate"
+        "tesla_smart_charger.handlers.amp_commands.telemetry_cache.invalidate"
     ) as mock_invalidate:
         overload_handler._apply_ramp_up(
-            charging, em_amps=25.0, cfg=SystemConfig(), state=state
+            charging, em_amps=25.0, cfg=SystemConfig(), state=state, clock=_FakeClock()
         )
 
     mock_invalidate.assert_called_once_with(vehicle.id)
+
+
+def test_ramp_up_phase_ends_after_max_session_duration() -> None:
+    """The ramp-up guard measures elapsed time on the injected clock."""
+    vehicle = _make_vehicle()
+    charging = [(vehicle, MagicMock(), _snapshot(6.0))]
+    state = overload_handler._AdjustmentState()
+    clock = _FakeClock()
+    cfg = SystemConfig(maxSessionDuration=600)
+
+    assert not overload_handler._apply_ramp_up(charging, 25.0, cfg, state, clock)
+    clock.sleep(601)
+
+    assert overload_handler._apply_ramp_up(charging, 25.0, cfg, state, clock)
+
+
+# ─── Reduction strategies ─────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "apply", [overload_handler._apply_proportional, overload_handler._apply_priority]
+)
+def test_suppressed_cut_still_counts_as_in_effect(
+    apply: Callable[..., bool],
+) -> None:
+    """A cut the car already requests is in effect; only failed commands aren't."""
+    vehicle = _make_vehicle()
+    api = MagicMock()
+    snapshot = ChargeSnapshot("online", "Charging", 20.0, requested_current=16)
+
+    assert apply([(vehicle, api, snapshot)], 36.0, 32.0, _FakeClock())
+    api.set_charge_amp_limit.assert_not_called()
+
+    api.set_charge_amp_limit.side_effect = HTTPException(status_code=502)
+    fresh = ChargeSnapshot("online", "Charging", 20.0, requested_current=20)
+    assert not apply([(vehicle, api, fresh)], 36.0, 32.0, _FakeClock())
+
+
+def test_priority_subtracts_a_suppressed_cut_from_the_excess() -> None:
+    """A lower-priority car already ramping down spares the higher-priority one."""
+    low = _make_vehicle(id="a", priority=2, chargerMaxAmps=32.0)
+    high = _make_vehicle(id="b", priority=1, chargerMaxAmps=32.0)
+    low_api, high_api = MagicMock(), MagicMock()
+    charging = [
+        (
+            low,
+            low_api,
+            ChargeSnapshot("online", "Charging", 20.0, requested_current=16),
+        ),
+        (
+            high,
+            high_api,
+            ChargeSnapshot("online", "Charging", 20.0, requested_current=32),
+        ),
+    ]
+
+    assert overload_handler._apply_priority(charging, 36.0, 32.0, _FakeClock())
+    low_api.set_charge_amp_limit.assert_not_called()
+    high_api.set_charge_amp_limit.assert_not_called()
+
+
+# ─── handle_overload ──────────────────────────────────────────────────────────
+
+
+def test_handle_overload_runs_a_session_on_a_virtual_clock() -> None:
+    """A whole session sleeps on the injected clock, never in real time."""
+    vehicle = _make_vehicle(chargerMaxAmps=16.0)
+    app_config = _make_app_config()
+    app_config._vehicles = [vehicle]
+    api = MagicMock()
+    api.get_vehicle_data.return_value = _charging_data(16.0)
+    em_ctrl = MagicMock()
+    em_ctrl.get_emeter_powers.return_value = (20.0 * 230.0,)
+    clock = _FakeClock()
+    bus = energy_bus.EnergyBus(clock=clock)
+
+    started = time.monotonic()
+    overload_handler.handle_overload(
+        app_config,
+        {vehicle.id: 16.0},
+        em_ctrl=em_ctrl,
+        api_factory=lambda _vehicle: api,
+        persist=False,
+        clock=clock,
+        bus=bus,
+    )
+
+    assert time.monotonic() - started < 5
+    assert clock.sleeps
+    assert set(clock.sleeps) == {app_config.system.sleepTimeSecs}
+    assert not overload_handler.is_session_active()
+    assert bus.latest() is not None
+    assert energy_bus.bus.latest() is None  # the shared bus was never touched
+
+
+# ─── _get_charging_vehicles ───────────────────────────────────────────────────
+
+
+def _charging_data(current: float = 16.0) -> dict:
+    return {
+        "state": "online",
+        "charge_state": {
+            "charging_state": "Charging",
+            "charger_actual_current": current,
+        },
+    }
+
+
+def test_get_charging_vehicles_fetches_in_parallel() -> None:
+    """Every car is fetched at once, so one iteration waits for the slowest only."""
+    barrier = threading.Barrier(3, timeout=2)
+
+    def _fetch(**_kwargs: object) -> dict:
+        # Only passes if all three fetches are in flight together.
+        barrier.wait()
+        return _charging_data()
+
+    apis = []
+    for i in range(3):
+        api = MagicMock()
+        api.get_vehicle_data.side_effect = _fetch
+        apis.append((_make_vehicle(id=f"vehicle-{i}"), api))
+
+    charging = overload_handler._get_charging_vehicles(apis, deadline_secs=5)
+
+    assert [v.id for v, _, _ in charging] == ["vehicle-0", "vehicle-1", "vehicle-2"]
+
+
+def test_get_charging_vehicles_drops_vehicles_past_deadline() -> None:
+    """A car that misses the deadline is skipped; the others are still returned."""
+    release = threading.Event()
+
+    def _hang(**_kwargs: object) -> dict:
+        release.wait(2)
+        return _charging_data()
+
+    fast, slow = MagicMock(), MagicMock()
+    fast.get_vehicle_data.return_value = _charging_data()
+    slow.get_vehicle_data.side_effect = _hang
+    apis = [
+        (_make_vehicle(id="slow"), slow),
+        (_make_vehicle(id="fast"), fast),
+    ]
+
+    try:
+        charging = overload_handler._get_charging_vehicles(apis, deadline_secs=0.2)
+    finally:
+        release.set()
+
+    assert [v.id for v, _, _ in charging] == ["fast"]
+
+
+def test_get_charging_vehicles_skips_failures_and_idle_cars() -> None:
+    """Fetch errors, disabled cars and cars not charging are all left out."""
+    failing, idle, disabled, charging_api = (MagicMock() for _ in range(4))
+    failing.get_vehicle_data.side_effect = HTTPException(status_code=408)
+    idle.get_vehicle_data.return_value = {
+        "state": "online",
+        "charge_state": {"charging_state": "Stopped"},
+    }
+    charging_api.get_vehicle_data.return_value = _charging_data()
+    apis = [
+        (_make_vehicle(id="failing"), failing),
+        (_make_vehicle(id="idle"), idle),
+        (_make_vehicle(id="disabled", enabled=False), disabled),
+        (_make_vehicle(id="charging"), charging_api),
+    ]
+
+    charging = overload_handler._get_charging_vehicles(apis, deadline_secs=5)
+
+    assert [v.id for v, _, _ in charging] == ["charging"]
+    disabled.get_vehicle_data.assert_not_called()
+
+
+def test_get_charging_vehicles_rejects_malformed_data_once() -> None:
+    """A payload without a usable current is dropped at fetch, not mid-strategy."""
+    broken, good = MagicMock(), MagicMock()
+    broken.get_vehicle_data.return_value = {
+        "state": "online",
+        "charge_state": {"charging_state": "Charging", "charger_actual_current": "?"},
+    }
+    good.get_vehicle_data.return_value = {
+        "state": "online",
+        "charge_state": {
+            "charging_state": "Charging",
+            "charger_actual_current": "12",
+            "charge_current_request": 16,
+        },
+    }
+    apis = [(_make_vehicle(id="broken"), broken), (_make_vehicle(id="good"), good)]
+
+    charging = overload_handler._get_charging_vehicles(
+        apis, deadline_secs=5, clock=_FakeClock(now=50.0)
+    )
+
+    ((vehicle, _, snapshot),) = charging
+    assert vehicle.id == "good"
+    assert (snapshot.actual_current, snapshot.requested_current) == (12.0, 16.0)
+    assert snapshot.fetched_at == 50.0
+
+
+def test_snapshots_are_dated_by_receipt_not_batch_end(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A slow poll or an old streamed record must not look fresher than it is."""
+    clock = _FakeClock(now=5000.0)
+    stream_clock = _FakeClock(now=100.0)
+    stream = fleet_telemetry.TelemetryStream(stale_secs=30, clock=stream_clock)
+    stream.ingest(
+        "streamed", {"charging_state": "Charging", "charger_actual_current": 16.0}
+    )
+    stream_clock.now += 20
+    monkeypatch.setattr(fleet_telemetry, "stream", stream)
+    polled = MagicMock()
+
+    def slow_fetch(**_kwargs: object) -> dict:
+        clock.now += 3
+        return {
+            "state": "online",
+            "charge_state": {
+                "charging_state": "Charging",
+                "charger_actual_current": 10,
+            },
+        }
+
+    polled.get_vehicle_data.side_effect = slow_fetch
+    apis = [
+        (_make_vehicle(id="streamed"), MagicMock()),
+        (_make_vehicle(id="polled"), polled),
+    ]
+
+    charging = overload_handler._get_charging_vehicles(apis, 5, clock)
+
+    assert {v.id: s.fetched_at for v, _, s in charging} == {
+        "streamed": 4980.0,
+        "polled": 5000.0,
+    }
@@ -0,0 +1,104 @@
+"""Tests for the due-time ordered refresh scheduler."""
+
+import threading
+
+from tesla_smart_charger.refresh_scheduler import RefreshScheduler
+
+
+class _Recorder:
+    """Scheduler callback that records keys and can hold a run open."""
+
+    def __init__(self) -> None:
+        self.ran: list[str] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+        self.done = threading.Semaphore(0)
+
+    def __call__(self, key: str) -> None:
+        self.started.set()
+        self.release.wait(5)
+        self.ran.append(key)
+        self.done.release()
+
+    def wait(self, runs: int) -> None:
+        for _ in range(runs):
+            assert self.done.acquire(timeout=5)
+
+
+def test_due_keys_run_in_due_order() -> None:
+    """With one worker, keys run in the order they fall due."""
+    run = _Recorder()
+    scheduler = RefreshScheduler(run, workers=1)
+
+    scheduler.schedule("late", delay=0.2)
+    scheduler.schedule("soon", delay=0.05)
+    run.wait(2)
+
+    assert run.ran == ["soon", "late"]
+
+
+def test_burst_collapses_into_one_run() -> None:
+    """Repeat requests for a queued key run it once, at the earliest due time."""
+    run = _Recorder()
+    scheduler = RefreshScheduler(run, workers=2)
+
+    assert scheduler.schedule("v1", delay=0.1) is True
+    for _ in range(20):
+        assert scheduler.schedule("v1", delay=0.1) is False
+    assert scheduler.schedule("v1", delay=0.05) is True
+    run.wait(1)
+
+    assert not run.done.acquire(timeout=0.2)
+    assert run.ran == ["v1"]
+
+
+def test_request_while_running_queues_one_rerun() -> None:
+    """Requests arriving during a run collapse into one run after it."""
+    run = _Recorder()
+    run.release.clear()
+    scheduler = RefreshScheduler(run, workers=2)
+
+    scheduler.schedule("v1")
+    assert run.started.wait(5)
+    assert scheduler.is_pending("v1")
+    assert scheduler.schedule("v1") is True
+    assert scheduler.schedule("v1") is False
+    run.release.set()
+    run.wait(2)
+
+    assert not run.done.acquire(timeout=0.2)
+    assert run.ran == ["v1", "v1"]
+
+
+def test_thread_count_is_bounded_by_workers() -> None:
+    """Many due keys share the fixed pool instead of a thread each."""
+    run = _Recorder()
+    scheduler = RefreshScheduler(run, workers=3, name="tsc_test_pool")
+
+    for i in range(50):
+        scheduler.schedule(f"v{i}")
+    run.wait(50)
+
+    pool = [t for t in threading.enumerate() if t.name.startswith("tsc_test_pool")]
+    assert len(pool) == 3
+    assert sorted(run.ran) == sorted(f"v{i}" for i in range(50))
+
+
+def test_failed_run_does_not_stop_the_worker() -> None:
+    """An exception from one run is logged and the worker keeps serving."""
+    ran: list[str] = []
+    done = threading.Event()
+
+    def _run(key: str) -> None:
+        ran.append(key)
+        if key == "bad":
+            raise RuntimeError(key)
+        done.set()
+
+    scheduler = RefreshScheduler(_run, workers=1)
+    scheduler.schedule("bad")
+    scheduler.schedule("good", delay=0.05)
+
+    assert done.wait(5)
+    assert ran == ["bad", "good"]
@@ -0,0 +1,90 @@
+"""Tests for the offline plant simulator and strategy benchmark."""
+
+import time
+
+from tesla_smart_charger import energy_bus
+from tesla_smart_charger.models import OverloadStrategy, VehicleConfig
+from tesla_smart_charger.simulator import runner
+from tesla_smart_charger.simulator.plant import LoadTrace, Plant, SimCar
+
+
+def _vehicle() -> VehicleConfig:
+    return VehicleConfig(id="car", name="car", chargerMinAmps=6, chargerMaxAmps=32)
+
+
+def _scenario(name: str) -> runner.Scenario:
+    return next(s for s in runner.SCENARIOS if s.name == name)
+
+
+# ─── Plant ────────────────────────────────────────────────────────────────────
+
+
+def test_plant_applies_commands_after_latency_and_ramps() -> None:
+    """A queued limit takes effect when due; the car then ramps towards it."""
+    car = SimCar(vehicle=_vehicle(), limit=16.0, ramp_amps_per_sec=2.0)
+    plant = Plant(LoadTrace([(0, 10.0)]), [car], home_max_amps=32.0, voltage=230.0)
+    car.pending.append((2.0, 10.0))
+
+    plant.advance(2.0)
+    assert car.limit == 10.0
+    assert car.amps == 14.0  # one ramp step since the command landed
+
+    plant.advance(10.0)
+    assert car.amps == 10.0
+    assert plant.house_amps() == 20.0
+
+
+def test_plant_records_time_and_excess_over_limit() -> None:
+    """Metrics integrate how long and by how much the house was over its limit."""
+    car = SimCar(vehicle=_vehicle(), limit=16.0)
+    plant = Plant(LoadTrace([(0, 20.0)]), [car], home_max_amps=32.0, voltage=230.0)
+
+    plant.advance(10.0)
+
+    assert plant.metrics.over_limit_secs == 10.0
+    assert plant.metrics.excess_amp_secs == 40.0
+    assert plant.metrics.peak_amps == 36.0
+
+
+# ─── Runner / benchmark ───────────────────────────────────────────────────────
+
+
+def test_benchmark_runs_every_strategy_in_virtual_time() -> None:
+    """A full scenario runs for each strategy without real sleeping."""
+    started = time.monotonic()
+    results = runner.benchmark([_scenario("evening_peak")])
+    elapsed = time.monotonic() - started
+
+    assert {r.strategy for r in results} == {s.value for s in OverloadStrategy}
+    assert all(r.commands_sent > 0 for r in results)
+    assert elapsed < 10
+    assert "evening_peak" in runner.format_report(results)
+
+
+def test_closed_loop_spends_least_time_over_limit() -> None:
+    """On a load step the controller resolves the overload fastest."""
+    by_strategy = {r.strategy: r for r in runner.benchmark([_scenario("evening_peak")])}
+
+    closed = by_strategy[OverloadStrategy.CLOSED_LOOP.value]
+    assert all(
+        closed.time_over_limit_secs <= r.time_over_limit_secs
+        for r in by_strategy.values()
+    )
+
+
+def test_runs_are_deterministic_with_failures() -> None:
+    """The same seed produces the same result, even with a flaky API."""
+    scenario = _scenario("flaky_api")
+    first = runner.run_scenario(scenario, OverloadStrategy.PROPORTIONAL)
+    second = runner.run_scenario(scenario, OverloadStrategy.PROPORTIONAL)
+
+    assert first == second
+
+
+def test_run_leaves_the_shared_energy_bus_alone() -> None:
+    """A run uses its own clock and bus; nothing reaches the process-wide bus."""
+    energy_bus.bus.reset()
+
+    runner.run_scenario(_scenario("evening_peak"), OverloadStrategy.CLOSED_LOOP)
+
+    assert energy_bus.bus.latest() is None
@@ -0,0 +1,369 @@
+"""Tests for the SQLite history controller and its shared connection pool."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from tesla_smart_charger.controllers import sqlite_migrations, sqlite_pool
+from tesla_smart_charger.controllers.sqlite_db_controller import (
+    SqliteDatabaseController,
+)
+
+
+@pytest.fixture(autouse=True)
+def _close_pools() -> Iterator[None]:
+    """Don't carry open connections from one test into the next."""
+    yield
+    sqlite_pool.close_all()
+
+
+def _controller(path: Path) -> SqliteDatabaseController:
+    ctrl = SqliteDatabaseController(str(path), "tesla_smart_charger")
+    ctrl.initialize_db()
+    return ctrl
+
+
+def test_controllers_share_connections_and_set_up_once(tmp_path: Path) -> None:
+    """Schema setup runs when the file is first opened, not per controller."""
+    path = tmp_path / "history.db"
+    setups: list[int] = []
+    pool = sqlite_pool.get(str(path), setup=lambda _conn: setups.append(1))
+
+    first, second = _controller(path), _controller(path)
+
+    assert first.pool is pool
+    assert second.pool is pool
+    assert setups == [1]
+
+
+def test_rows_written_by_one_controller_are_read_by_another(tmp_path: Path) -> None:
+    """Writes are committed, and readers see them in WAL mode."""
+    path = tmp_path / "history.db"
+    writer = _controller(path)
+    writer.insert_data(
+        {
+            "start": "2024-01-01 12:00:00",
+            "end": "2024-01-01 12:01:00",
+            "duration": 60,
+            "vehicle_id": "v1",
+        }
+    )
+    writer.close_connection()
+
+    rows = _controller(path).get_data_filtered(vehicle_id="v1")
+
+    assert [(r["start"], r["vehicle_id"]) for r in rows] == [
+        ("2024-01-01 12:00:00", "v1")
+    ]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_pre_v2_database_gains_vehicle_id(tmp_path: Path) -> None:
+    """Databases created before vehicle_id existed are migrated on open."""
+    path = tmp_path / "history.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE overloads (id INTEGER PRIMARY KEY, start TEXT, "
+            "end TEXT, duration INTEGER)"
+        )
+        conn.execute("INSERT INTO overloads (start) VALUES ('2023-05-01 08:00:00')")
+    conn.close()
+
+    rows = _controller(path).get_data()
+
+    assert rows == [
+        {
+            "id": 1,
+            "start": "2023-05-01 08:00:00",
+            "end": None,
+            "duration": None,
+            "vehicle_id": "",
+        }
+    ]
+
+
+def test_reader_pool_is_bounded(tmp_path: Path) -> None:
+    """Concurrent reads never open more connections than the pool allows."""
+    pool = sqlite_pool.SqlitePool(str(tmp_path / "history.db"), readers=2)
+    held: list[sqlite3.Connection] = []
+    release = threading.Event()
+
+    def _read() -> None:
+        with pool.reader() as conn:
+            held.append(conn)
+            release.wait(5)
+
+    threads = [threading.Thread(target=_read) for _ in range(2)]
+    for t in threads:
+        t.start()
+    while len(held) < 2:
+        release.wait(0.01)
+    third: list[sqlite3.Connection] = []
+    waiter = threading.Thread(target=lambda: third.extend(_take(pool)))
+    waiter.start()
+    waiter.join(0.1)
+    assert third == []  # waiting for a reader to come back
+
+    release.set()
+    for t in [*threads, waiter]:
+        t.join(5)
+    assert third[0] in held
+    pool.close()
+
+
+def _take(pool: sqlite_pool.SqlitePool) -> list[sqlite3.Connection]:
+    with pool.reader() as conn:
+        return [conn]
+
+
+# ─── Migrations ───────────────────────────────────────────────────────────────
+
+
+def test_migrate_records_version_and_is_idempotent(tmp_path: Path) -> None:
+    """A fresh database ends at the latest step; a second run does nothing."""
+    with sqlite3.connect(tmp_path / "history.db") as conn:
+        sqlite_migrations.migrate(conn, sqlite_migrations.MIGRATIONS[:6])
+        # No throwaway index on the text start column is built along the way.
+        explicit = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql NOTNULL"
+        )
+        assert explicit.fetchall() == []
+        latest = sqlite_migrations.MIGRATIONS[-1].version
+        assert sqlite_migrations.migrate(conn) == latest
+        assert sqlite_migrations.migrate(conn) == latest
+        assert conn.execute("SELECT COUNT(*) FROM schema_version").fetchone() == (1,)
+        indexes = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+    conn.close()
+    assert {"idx_overloads_vehicle_start_ts", "idx_overloads_start_ts"} <= indexes
+    assert "idx_overloads_vehicle_start" not in indexes
+
+
+def test_duration_backfill_runs_in_batches(tmp_path: Path) -> None:
+    """Text durations become integer seconds, a few rows per transaction."""
+    with sqlite3.connect(tmp_path / "history.db") as conn:
+        sqlite_migrations.migrate(conn, sqlite_migrations.MIGRATIONS[:3])
+        conn.executemany(
+            "INSERT INTO overloads (start, duration) VALUES ('s', ?)",
+            [("90.0",), (12.6,), ("oops",), (None,), (30,)],
+        )
+        conn.commit()
+        batches: list[int | None] = []
+
+        def _recording(
+            connection: sqlite3.Connection, after_id: int, batch_size: int
+        ) -> int | None:
+            batches.append(
+                sqlite_migrations._duration_to_seconds(connection, after_id, batch_size)
+            )
+            return batches[-1]
+
+        step = sqlite_migrations.Migration(4, "durations", backfill=_recording)
+        sqlite_migrations.migrate(conn, (step,), batch_size=2)
+
+        durations = [
+            (row[0], row[1])
+            for row in conn.execute(
+                "SELECT duration, typeof(duration) FROM overloads ORDER BY id"
+            )
+        ]
+    conn.close()
+    assert batches == [2, 4, 5, None]
+    assert durations == [
+        (90, "integer"),
+        (13, "integer"),
+        (0, "integer"),
+        (None, "null"),
+        (30, "integer"),
+    ]
+
+
+def test_epoch_backfill_converts_local_timestamps(tmp_path: Path) -> None:
+    """Existing rows gain start_ts / end_ts; an unfinished event keeps a null end."""
+    with sqlite3.connect(tmp_path / "history.db") as conn:
+        sqlite_migrations.migrate(conn, sqlite_migrations.MIGRATIONS[:4])
+        conn.executemany(
+            "INSERT INTO overloads (start, end) VALUES (?, ?)",
+            [("2024-01-01 12:00:00", "2024-01-01 12:01:30"), ("2024-01-02", "")],
+        )
+        conn.commit()
+        sqlite_migrations.migrate(conn, batch_size=1)
+        epochs = conn.execute(
+            "SELECT start_ts, end_ts FROM overloads ORDER BY id"
+        ).fetchall()
+    conn.close()
+    noon = int(time.mktime((2024, 1, 1, 12, 0, 0, 0, 0, -1)))
+    midnight = int(time.mktime((2024, 1, 2, 0, 0, 0, 0, 0, -1)))
+    assert epochs == [(noon, noon + 90), (midnight, None)]
+
+
+# ─── Keyset pagination ────────────────────────────────────────────────────────
+
+
+def _insert_events(ctrl: SqliteDatabaseController, starts: list[str]) -> None:
+    for i, start in enumerate(starts):
+        ctrl.insert_data(
+            {
+                "start": start,
+                "end": "",
+                "duration": 0,
+                "vehicle_id": "v1" if i % 2 == 0 else "v2",
+            }
+        )
+
+
+def test_pages_follow_the_cursor_without_gaps(tmp_path: Path) -> None:
+    """Pages are newest first; ties on start are broken by id."""
+    ctrl = _controller(tmp_path / "history.db")
+    _insert_events(
+        ctrl,
+        [
+            "2024-01-01 10:00:00",
+            "2024-01-03 10:00:00",
+            "2024-01-02 10:00:00",
+            "2024-01-02 10:00:00",
+            "2024-01-04 10:00:00",
+        ],
+    )
+
+    seen: list[int] = []
+    cursors: list[str | None] = []
+    cursor = ""
+    while True:
+        rows, next_cursor = ctrl.get_page(num_records=2, cursor=cursor)
+        seen.extend(row["id"] for row in rows)
+        cursors.append(next_cursor)
+        if next_cursor is None:
+            break
+        cursor = next_cursor
+
+    assert seen == [5, 2, 4, 3, 1]
+    assert cursors[-1] is None
+    assert len(cursors) == 3
+
+
+def test_page_filters_by_vehicle_and_start(tmp_path: Path) -> None:
+    """Date-only and full timestamp bounds both compare on start_ts."""
+    ctrl = _controller(tmp_path / "history.db")
+    _insert_events(
+        ctrl,
+        [
+            "2024-01-01 10:00:00",
+            "2024-01-02 10:00:00",
+            "2024-01-03 10:00:00",
+            "2024-01-05 10:00:00",
+            "2024-01-07 10:00:00",
+        ],
+    )
+
+    rows, next_cursor = ctrl.get_page(
+        vehicle_id="v1", from_date="2024-01-02", to_date="2024-01-07 10:00:00"
+    )
+
+    assert [row["start"] for row in rows] == [
+        "2024-01-07 10:00:00",
+        "2024-01-03 10:00:00",
+    ]
+    assert next_cursor is None
+
+
+def test_malformed_cursor_is_rejected(tmp_path: Path) -> None:
+    """A cursor not produced by get_page raises ValueError (HTTP 400)."""
+    ctrl = _controller(tmp_path / "history.db")
+    for cursor in (
+        "nonsense",
+        "12:abc",
+        "99999999999999999999999:1",
+        "1:-9" + "9" * 19,
+    ):
+        with pytest.raises(ValueError, match=r"cursor|invalid literal"):
+            ctrl.get_page(cursor=cursor)
+
+
+# ─── Summary statistics ───────────────────────────────────────────────────────
+
+
+def test_stats_follow_inserts_updates_and_deletes(tmp_path: Path) -> None:
+    """Triggers keep the summaries current; emptied buckets drop out."""
+    ctrl = _controller(tmp_path / "history.db")
+    for start, duration, vehicle in [
+        ("2024-01-01 10:00:00", 60, "v1"),  # Monday
+        ("2024-01-02 10:00:00", 125, "v1"),
+        ("2024-02-05 10:00:00", None, "v2"),  # still running
+    ]:
+        ctrl.insert_data(
+            {"start": start, "end": "", "duration": duration, "vehicle_id": vehicle}
+        )
+    ctrl.update_data({"id": 3, "end": "2024-02-05 10:00:10", "duration": 10})
+
+    stats = ctrl.get_stats()
+
+    assert stats["totals"] == {
+        "events": 3,
+        "total_duration_secs": 195,
+        "p50_duration_secs": 60,
+        "p95_duration_secs": 120,  # 125 s, to two significant figures
+    }
+    assert [(b["period"], b["events"]) for b in stats["by_week"]] == [
+        ("2024-01-01", 2),
+        ("2024-02-05", 1),
+    ]
+    assert [(b["period"], b["total_duration_secs"]) for b in stats["by_month"]] == [
+        ("2024-01", 185),
+        ("2024-02", 10),
+    ]
+    assert [(v["vehicle_id"], v["p50_duration_secs"]) for v in stats["by_vehicle"]] == [
+        ("v1", 60),
+        ("v2", 10),
+    ]
+    assert [b["period"] for b in ctrl.get_stats(days=1)["by_day"]] == ["2024-02-05"]
+
+    ctrl.delete_data()
+    assert ctrl.get_stats()["by_vehicle"] == []
+    assert ctrl.get_stats()["totals"]["p50_duration_secs"] is None
+
+
+def test_stats_backfill_matches_trigger_maintained_stats(tmp_path: Path) -> None:
+    """Summarising an existing history gives what the triggers would have."""
+    rows = [
+        (f"2024-03-{day:02d} 08:00:00", day * 37, f"v{day % 3}") for day in range(1, 29)
+    ]
+    live = _controller(tmp_path / "live.db")
+    for start, duration, vehicle in rows:
+        live.insert_data(
+            {"start": start, "end": "", "duration": duration, "vehicle_id": vehicle}
+        )
+
+    path = tmp_path / "upgraded.db"
+    with sqlite3.connect(path) as conn:
+        sqlite_migrations.migrate(conn, sqlite_migrations.MIGRATIONS[:7])
+        conn.executemany(
+            "INSERT INTO overloads (start, duration, vehicle_id, start_ts) "
+            "VALUES (?, ?, ?, CAST(strftime('%s', ?, 'utc') AS INTEGER))",
+            [(start, duration, vehicle, start) for start, duration, vehicle in rows],
+        )
+        conn.commit()
+        sqlite_migrations.migrate(conn, batch_size=5)
+    conn.close()
+
+    assert _controller(path).get_stats() == live.get_stats()
+
+
+def test_iter_pages_yields_every_row_in_bounded_pages(tmp_path: Path) -> None:
+    """The export walks the whole history without a page over the batch size."""
+    ctrl = _controller(tmp_path / "history.db")
+    _insert_events(ctrl, [f"2024-01-0{day} 10:00:00" for day in range(1, 6)])
+
+    pages = list(ctrl.iter_pages(batch_size=2))
+
+    assert [[row["id"] for row in page] for page in pages] == [[5, 4], [3, 2], [1]]
+    assert list(ctrl.iter_pages(vehicle_id="nobody")) == []
@@ -0,0 +1,115 @@
+"""Tests for the server-sent status stream."""
+
+import asyncio
+import json
+
+from tesla_smart_charger.energy_bus import EnergyBus
+from tesla_smart_charger.status_stream import StatusBroadcaster, diff
+
+
+def _status(amps: float | None = None, **vehicle: object) -> dict:
+    return {
+        "overloadActive": False,
+        "currentConsumptionAmps": amps,
+        "vehicles": [{"id": "v1", "online": True, "telemetryAgeSecs": 1.0, **vehicle}],
+    }
+
+
+def _parse(frame: str) -> tuple[str, dict]:
+    event, data = frame.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_diff_reports_only_changes() -> None:
+    """Changed fields and vehicles are sent; telemetry age alone is not a change."""
+    old = _status(amps=10.0)
+    aged = _status(amps=10.0, telemetryAgeSecs=5.0)
+    changed = _status(amps=12.0, online=False)
+
+    assert diff(old, aged) == {}
+    assert diff(old, changed) == {
+        "currentConsumptionAmps": 12.0,
+        "vehicles": changed["vehicles"],
+    }
+    assert diff(old, {**old, "vehicles": []}) == {"removedVehicles": ["v1"]}
+
+
+def test_subscribers_get_a_snapshot_then_deltas() -> None:
+    """Each energy reading triggers one rebuild, fanned out to every stream."""
+    bus = EnergyBus()
+    current = {"status": _status(amps=10.0)}
+    builds: list[int] = []
+
+    def _build() -> dict:
+        builds.append(1)
+        return current["status"]
+
+    broadcaster = StatusBroadcaster(_build, bus=bus, tick_secs=5.0)
+
+    async def _run() -> tuple[list, list]:
+        first, second = broadcaster.events(), broadcaster.events()
+        snapshots = [_parse(await first.__anext__())]
+        snapshots.append(_parse(await second.__anext__()))
+
+        current["status"] = _status(amps=20.0)
+        bus.publish(4600.0, "push")
+        deltas = [_parse(await first.__anext__()), _parse(await second.__anext__())]
+
+        await first.aclose()
+        assert broadcaster.subscribers == 1
+        await second.aclose()
+        assert broadcaster.subscribers == 0
+        bus.publish(0.0, "push")  # release the cancelled producer's wait
+        return snapshots, deltas
+
+    snapshots, deltas = asyncio.run(_run())
+
+    assert snapshots == [("snapshot", _status(amps=10.0))] * 2
+    assert deltas == [("delta", {"currentConsumptionAmps": 20.0})] * 2
+    assert len(builds) == 2  # one per change, not one per subscriber
+
+
+def test_lagging_subscriber_is_resynced_with_a_snapshot() -> None:
+    """A full queue is replaced by the latest snapshot instead of growing."""
+    broadcaster = StatusBroadcaster(
+        lambda: None, bus=EnergyBus(), tick_secs=0.05, queue_size=2
+    )
+
+    async def _run() -> list[tuple[str, dict]]:
+        stream = broadcaster.events()
+        reader = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)  # subscribe without consuming anything yet
+        broadcaster._publish(_status(amps=1.0))
+        frames = [_parse(await reader)]
+        for amps in (2.0, 3.0, 4.0):
+            broadcaster._publish(_status(amps=amps))
+        frames.append(_parse(await stream.__anext__()))
+        await stream.aclose()
+        return frames
+
+    frames = asyncio.run(_run())
+
+    assert frames == [
+        ("snapshot", _status(amps=1.0)),
+        ("snapshot", _status(amps=4.0)),
+    ]
+
+
+def test_idle_stream_gets_keepalives() -> None:
+    """With nothing to send, the stream stays open with keepalive comments."""
+    bus = EnergyBus()
+    broadcaster = StatusBroadcaster(
+        lambda: _status(amps=10.0), bus=bus, tick_secs=0.2, keepalive_secs=0.05
+    )
+
+    async def _run() -> list[str]:
+        stream = broadcaster.events()
+        frames = [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+        bus.publish(0.0, "push")  # release the cancelled producer's wait
+        return frames
+
+    frames = asyncio.run(_run())
+
+    assert _parse(frames[0]) == ("snapshot", _status(amps=10.0))
+    assert frames[1:] == [": keepalive\n\n"] * 2
@@ -110,7 +110,9 @@ def test_superseded_refresh_is_discarded_and_refetched(
     )
     refetched: list[str] = []
     monkeypatch.setattr(
-        telemetry_cache, "schedule_refresh", lambda v: refetched.append(v.id)
+        telemetry_cache,
+        "schedule_refresh",
+        lambda v, **_kwargs: refetched.append(v.id),
     )
 
     generation = telemetry_cache._generation.get(vehicle.id, 0)
@@ -141,39 +143,131 @@ def test_current_generation_refresh_is_cached(monkeypatch: pytest.MonkeyPatch) -
     assert status.online is True
 
 
-def test_schedule_refresh_captures_current_generation(
+def test_scheduled_refresh_uses_generation_at_start(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    """The generation is read at schedule time, not when the fetch completes."""
+    """A queued refresh fetches under the generation current when it runs."""
     captured: list[int] = []
-
-    class _FakeThread:
-        def __init__(self, **kwargs: object) -> None:
-            captured.append(kwargs["args"][1])
-
-        def start(self) -> None:
-            pass
-
-    monkeypatch.setattr(telemetry_cache.threading, "Thread", _FakeThread)
+    monkeypatch.setattr(
+        telemetry_cache, "_refresh", lambda _v, generation: captured.append(generation)
+    )
 
     vehicle = _vehicle()
+    with monkeypatch.context() as m:
+        m.setattr(telemetry_cache._scheduler, "schedule", lambda *_args: True)
+        telemetry_cache.schedule_refresh(vehicle)
     telemetry_cache.invalidate(vehicle.id)
     telemetry_cache.invalidate(vehicle.id)
-    telemetry_cache.schedule_refresh(vehicle)
+    telemetry_cache._run_scheduled(vehicle.id)
 
     assert captured == [2]
 
 
-def test_schedule_refresh_dedupes(monkeypatch: pytest.MonkeyPatch) -> None:
-    """A second schedule_refresh is a no-op while one is already in flight."""
-    started: list[str] = []
+def test_schedule_refresh_collapses_repeat_requests() -> None:
+    """Scheduling again only counts when it brings the refresh forward."""
+    vehicle = _vehicle()
+
+    assert telemetry_cache.schedule_refresh(vehicle, delay=60) is True
+    assert telemetry_cache.schedule_refresh(vehicle, delay=60) is False
+    assert telemetry_cache.schedule_refresh(vehicle, delay=90) is False
+    assert telemetry_cache.schedule_refresh(vehicle, delay=30) is True
+    assert telemetry_cache.is_refreshing(vehicle.id) is False  # not yet due
+
+
+def test_watched_vehicle_is_refreshed_ahead_of_expiry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A fresh result for a vehicle read within its TTL queues the next one."""
+    vehicle = _vehicle()
+    monkeypatch.setattr(
+        TeslaAPI,
+        "get_vehicle_data",
+        lambda self: {"state": "online", "charge_state": {}},  # noqa: ARG005
+    )
+    scheduled: list[tuple[str, float]] = []
+    monkeypatch.setattr(
+        telemetry_cache,
+        "schedule_refresh",
+        lambda v, delay=0.0: scheduled.append((v.id, delay)),
+    )
+
+    telemetry_cache._refresh(vehicle, 0)  # nobody has read it yet
+    assert scheduled == []
+
+    telemetry_cache.get(vehicle, overload_active=False)
+    telemetry_cache._refresh(vehicle, 0)
+    assert scheduled == [
+        (
+            vehicle.id,
+            vehicle.telemetryPolicy.idleTtlSecs
+            * telemetry_cache._REFRESH_AHEAD_FRACTION,
+        )
+    ]
+
+
+def _status(*, online: bool, charging_state: str | None = None) -> object:
+    status = telemetry_cache.base_status(_vehicle())
+    status.online = online
+    status.chargingState = charging_state
+    return status
+
 
-    def _fake_thread_start(self: object) -> None:  # noqa: ARG001
-        started.append("started")
+def test_ttl_follows_charging_state() -> None:
+    """Charging and overload sessions get the short TTL, idle a longer one."""
+    vehicle = _vehicle()
+    policy = vehicle.telemetryPolicy
+    charging = _status(online=True, charging_state="Charging")
+    idle = _status(online=True, charging_state="Stopped")
+
+    assert (
+        telemetry_cache._ttl(vehicle, charging, overload_active=False)
+        == policy.chargingTtlSecs
+    )
+    assert telemetry_cache._ttl(vehicle, idle, overload_active=False) == (
+        policy.idleTtlSecs
+    )
+    assert telemetry_cache._ttl(vehicle, idle, overload_active=True) == (
+        policy.chargingTtlSecs
+    )
 
-    monkeypatch.setattr("threading.Thread.start", _fake_thread_start)
 
+def test_asleep_ttl_backs_off_until_woken(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each fetch finding the car asleep doubles its TTL, up to the cap."""
+    vehicle = _vehicle()
+    vehicle.telemetryPolicy.asleepTtlSecs = 300
+    vehicle.telemetryPolicy.asleepMaxTtlSecs = 1000
+    state = {"state": "asleep"}
+    monkeypatch.setattr(TeslaAPI, "get_vehicle_data", lambda _self: state)
+    asleep = _status(online=False)
+
+    ttls = []
+    for _ in range(4):
+        telemetry_cache._refresh(vehicle, 0)
+        with telemetry_cache._cache_lock:
+            ttls.append(telemetry_cache._ttl(vehicle, asleep, overload_active=False))
+    assert ttls == [300, 600, 1000, 1000]
+
+    state["state"] = "online"
+    telemetry_cache._refresh(vehicle, 0)
+    with telemetry_cache._cache_lock:
+        assert telemetry_cache._ttl(vehicle, asleep, overload_active=False) == 300
+
+
+def test_invalidate_resets_asleep_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A command may have woken the car, so its backoff starts over."""
     vehicle = _vehicle()
-    assert telemetry_cache.schedule_refresh(vehicle) is True
-    assert telemetry_cache.schedule_refresh(vehicle) is False
-    assert len(started) == 1
+    monkeypatch.setattr(
+        TeslaAPI,
+        "get_vehicle_data",
+        lambda self: {"state": "asleep"},  # noqa: ARG005
+    )
+    telemetry_cache._refresh(vehicle, 0)
+    telemetry_cache._refresh(vehicle, 0)
+
+    telemetry_cache.invalidate(vehicle.id)
+
+    with telemetry_cache._cache_lock:
+        ttl = telemetry_cache._ttl(
+            vehicle, _status(online=False), overload_active=False
+        )
+    assert ttl == vehicle.telemetryPolicy.asleepTtlSecs
@@ -0,0 +1,376 @@
+"""Unit tests for the Tesla Fleet API client and its HTTP session pool."""
+
+import asyncio
+import email.utils
+import json
+import time
+from unittest.mock import MagicMock
+
+import httpx2
+import pytest
+import requests
+from fastapi import HTTPException
+
+from tesla_smart_charger import (
+    circuit_breaker,
+    constants,
+    fleet_budget,
+    http_pool,
+    retry_policy,
+    timeseries,
+)
+from tesla_smart_charger.async_tesla_api import AsyncTeslaAPI
+from tesla_smart_charger.models import VehicleConfig
+from tesla_smart_charger.tesla_api import TeslaAPI
+
+
+@pytest.fixture(autouse=True)
+def _clear_pool() -> None:
+    """Keep pools, spent request budget and open circuits from leaking between tests."""
+    http_pool.close_all()
+    fleet_budget.budget.reset()
+    circuit_breaker.breakers.reset()
+
+
+def _vehicle(**overrides: object) -> VehicleConfig:
+    defaults: dict[str, object] = {
+        "id": "veh-1",
+        "vin": "5YJYGDEE1MF000001",
+        "teslaVehicleId": "777",
+        "teslaAccessToken": "at_test",
+        "teslaHttpProxy": "https://tesla-http-proxy:4443",
+    }
+    defaults.update(overrides)
+    return VehicleConfig(**defaults)
+
+
+# ─── http_pool ────────────────────────────────────────────────────────────────
+
+
+def test_sessions_are_shared_across_clients() -> None:
+    """Two TeslaAPI instances for the same proxy reuse one keep-alive session."""
+    first = TeslaAPI(_vehicle())._session("https://tesla-http-proxy:4443/a", mtls=True)
+    second = TeslaAPI(_vehicle(id="veh-2"))._session(
+        "https://tesla-http-proxy:4443/b", mtls=True
+    )
+
+    assert first is second
+    assert first.cert == (str(constants.TLS_CERT_PATH), str(constants.TLS_KEY_PATH))
+    assert first.verify is False
+
+
+def test_unverified_session_ignores_ca_bundle_env(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """REQUESTS_CA_BUNDLE must not turn verification back on for the proxy."""
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", "/etc/ssl/certs/ca-certificates.crt")
+    url = "https://tesla-http-proxy:4443/a"
+    proxy = TeslaAPI(_vehicle())._session(url, mtls=True)
+    fleet = TeslaAPI(_vehicle())._session(f"{constants.TESLA_AUDIENCE}/x")
+
+    settings = proxy.merge_environment_settings(url, {}, None, None, None)
+    assert settings["verify"] is False
+    assert fleet.trust_env is True
+
+
+def test_sessions_are_keyed_by_host_and_cert() -> None:
+    """The Fleet API (no client cert) and the proxy (mTLS) get separate sessions."""
+    api = TeslaAPI(_vehicle())
+
+    proxy = api._session("https://tesla-http-proxy:4443/x", mtls=True)
+    fleet = api._session(f"{constants.TESLA_AUDIENCE}/x")
+
+    assert proxy is not fleet
+    assert fleet.cert is None
+    assert fleet.verify is True
+
+
+def test_idle_sessions_are_evicted(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A session unused past the idle limit is closed and replaced."""
+    clock = [1000.0]
+    monkeypatch.setattr(http_pool.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(constants, "HTTP_POOL_IDLE_SECS", 60)
+
+    first = http_pool.get_session("https://example.test/a")
+    clock[0] += 30
+    assert http_pool.get_session("https://example.test/b") is first
+
+    clock[0] += 61
+    assert http_pool.get_session("https://example.test/c") is not first
+
+
+def test_idle_async_clients_are_closed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Evicted async clients and, at shutdown, the rest are closed."""
+    clock = [1000.0]
+    monkeypatch.setattr(http_pool.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(constants, "HTTP_POOL_IDLE_SECS", 60)
+
+    async def _run() -> tuple[httpx2.AsyncClient, httpx2.AsyncClient]:
+        first = http_pool.get_async_client("http://example.test/a")
+        clock[0] += 61
+        second = http_pool.get_async_client("http://example.test/b")
+        await asyncio.sleep(0)  # let the eviction's close task run
+        assert first.is_closed
+        assert not second.is_closed
+        await http_pool.aclose_all()
+        return first, second
+
+    _, second = asyncio.run(_run())
+
+    assert second.is_closed
+
+
+# ─── Retry policy ─────────────────────────────────────────────────────────────
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.sleeps.append(secs)
+        self.now += secs
+
+
+def _response(status: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = json.dumps({"response": {"state": "online"}}).encode()
+    response.url = "https://tesla-http-proxy:4443/api"
+    return response
+
+
+def _api_answering(
+    monkeypatch: pytest.MonkeyPatch, *statuses: tuple[int, dict]
+) -> tuple[TeslaAPI, MagicMock, _FakeClock]:
+    """Return a TeslaAPI whose GETs answer *statuses* in turn, on a fake clock."""
+    clock = _FakeClock()
+    api = TeslaAPI(_vehicle(), clock=clock)
+    session = MagicMock()
+    session.get.side_effect = [_response(code, headers) for code, headers in statuses]
+    monkeypatch.setattr(api, "_session", lambda *_a, **_k: session)
+    return api, session, clock
+
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404])
+def test_client_errors_are_not_retried(
+    monkeypatch: pytest.MonkeyPatch, status: int
+) -> None:
+    """A wrong token, scope or id fails at once instead of backing off."""
+    api, session, clock = _api_answering(monkeypatch, (status, {}))
+
+    with pytest.raises(HTTPException) as excinfo:
+        api.get_vehicle_data()
+
+    assert excinfo.value.status_code == status
+    assert session.get.call_count == 1
+    assert clock.sleeps == []
+
+
+def test_server_errors_back_off_exponentially(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """5xx answers are retried with a doubling, capped wait."""
+    api, _, clock = _api_answering(monkeypatch, (503, {}), (502, {}), (200, {}))
+
+    assert api.get_vehicle_data() == {"state": "online"}
+    assert clock.sleeps == [3.0, 5.0]
+
+
+def test_rate_limit_honours_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A 429 waits exactly as long as Tesla asks."""
+    api, _, clock = _api_answering(monkeypatch, (429, {"Retry-After": "7"}), (200, {}))
+
+    api.get_vehicle_data()
+
+    assert clock.sleeps == [7.0]
+
+
+def test_asleep_car_gets_one_quick_retry_and_an_optional_wake(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A 408 is retried once, after waking the car when asked to."""
+    api, session, clock = _api_answering(monkeypatch, (408, {}), (408, {}))
+    wake = MagicMock()
+    monkeypatch.setattr(api, "wake_up", wake)
+
+    with pytest.raises(HTTPException):
+        api.get_vehicle_data(wake=True)
+
+    assert session.get.call_count == 2
+    assert clock.sleeps == [1.0]
+    wake.assert_called_once()
+
+
+def test_retry_after_may_be_an_http_date() -> None:
+    """Retry-After in HTTP-date form is turned into seconds from now."""
+    when = email.utils.formatdate(time.time() + 60, usegmt=True)
+    exc = HTTPException(status_code=429, headers={"Retry-After": when})
+
+    assert 55 <= retry_policy.next_delay(exc, 1) <= 60
+
+
+def test_retries_stop_at_the_callers_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """No retry is attempted when its wait would overrun the deadline."""
+    api, session, _ = _api_answering(
+        monkeypatch, (429, {"Retry-After": "30"}), (200, {})
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        api.get_vehicle_data(deadline_secs=10)
+
+    assert excinfo.value.status_code == 429
+    assert session.get.call_count == 1
+
+
+# ─── vehicle_data filtering ───────────────────────────────────────────────────
+
+
+def test_vehicle_data_requests_charge_state_only_and_slims_the_response(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only charge_state is asked for, and unread fields are dropped."""
+    api = TeslaAPI(_vehicle())
+    session = MagicMock()
+    session.get.return_value.json.return_value = {
+        "response": {
+            "id": 1,
+            "state": "online",
+            "charge_state": {"charging_state": "Charging", "charge_port_latch": "x"},
+            "vehicle_config": {"car_type": "modely"},
+        }
+    }
+    monkeypatch.setattr(api, "_session", lambda *_a, **_k: session)
+
+    data = api.get_vehicle_data()
+
+    assert session.get.call_args.kwargs["params"] == {"endpoints": "charge_state"}
+    assert data == {"state": "online", "charge_state": {"charging_state": "Charging"}}
+
+
+def test_vehicle_data_location_is_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    """location=True adds location_data and keeps the coordinates."""
+    api = TeslaAPI(_vehicle())
+    session = MagicMock()
+    session.get.return_value.json.return_value = {
+        "response": {"drive_state": {"latitude": 52.1, "longitude": 4.3, "speed": 0}}
+    }
+    monkeypatch.setattr(api, "_session", lambda *_a, **_k: session)
+
+    data = api.get_vehicle_data(location=True)
+
+    assert session.get.call_args.kwargs["params"] == {
+        "endpoints": "charge_state;location_data"
+    }
+    assert data == {"drive_state": {"latitude": 52.1, "longitude": 4.3}}
+
+
+# ─── AsyncTeslaAPI ────────────────────────────────────────────────────────────
+
+
+def _mock_async_transport(
+    monkeypatch: pytest.MonkeyPatch, handler: object
+) -> list[httpx2.Request]:
+    """Route every AsyncTeslaAPI request through *handler*; return the log."""
+    seen: list[httpx2.Request] = []
+
+    def _record(request: httpx2.Request) -> httpx2.Response:
+        seen.append(request)
+        return handler(request)
+
+    client = httpx2.AsyncClient(transport=httpx2.MockTransport(_record))
+    monkeypatch.setattr(http_pool, "get_async_client", lambda *_a, **_k: client)
+    return seen
+
+
+def test_async_get_vehicle_data_matches_sync_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The async client hits the same proxy URL with the same bearer token."""
+    seen = _mock_async_transport(
+        monkeypatch,
+        lambda _r: httpx2.Response(200, json={"response": {"state": "online"}}),
+    )
+
+    data = asyncio.run(AsyncTeslaAPI(_vehicle()).get_vehicle_data())
+
+    assert data == {"state": "online"}
+    assert str(seen[0].url) == (
+        "https://tesla-http-proxy:4443/api/1/vehicles/777/vehicle_data"
+        "?endpoints=charge_state"
+    )
+    assert seen[0].headers["Authorization"] == "Bearer at_test"
+
+
+def test_async_refresh_token_updates_local_copy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A successful async refresh returns and keeps the new token pair."""
+    _mock_async_transport(
+        monkeypatch,
+        lambda _r: httpx2.Response(
+            200, json={"access_token": "at_new", "refresh_token": "rt_new"}
+        ),
+    )
+    api = AsyncTeslaAPI(_vehicle(teslaRefreshToken="rt_old"))
+
+    assert asyncio.run(api.refresh_token()) == ("at_new", "rt_new")
+    assert api.vehicle.teslaAccessToken == "at_new"
+
+
+def test_async_refresh_token_returns_none_on_failure(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A rejected refresh is reported as None, like the blocking client."""
+    _mock_async_transport(monkeypatch, lambda _r: httpx2.Response(401, json={}))
+
+    assert asyncio.run(AsyncTeslaAPI(_vehicle()).refresh_token()) is None
+
+
+def test_async_set_charge_amp_limit_records_setpoint(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Accepted amp commands are queued for the time-series store."""
+    _mock_async_transport(
+        monkeypatch, lambda _r: httpx2.Response(200, json={"response": {}})
+    )
+    recorded: list[tuple[str, float]] = []
+    monkeypatch.setattr(
+        timeseries,
+        "record_setpoint",
+        lambda vid, amps, _clock: recorded.append((vid, amps)),
+    )
+
+    asyncio.run(AsyncTeslaAPI(_vehicle()).set_charge_amp_limit(13))
+
+    assert recorded == [("veh-1", 13)]
+
+
+def test_async_client_retries_by_status(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The async client classifies failures like the blocking one."""
+    answers = iter([503, 200, 401])
+    seen = _mock_async_transport(
+        monkeypatch,
+        lambda _r: httpx2.Response(next(answers), json={"response": {}}),
+    )
+    sleeps: list[float] = []
+
+    async def _no_sleep(secs: float) -> None:
+        sleeps.append(secs)
+
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+    api = AsyncTeslaAPI(_vehicle())
+
+    assert asyncio.run(api.get_vehicle_data()) == {}
+    with pytest.raises(HTTPException):
+        asyncio.run(api.get_vehicle_data())
+
+    assert len(seen) == 3
+    assert sleeps == [3.0]
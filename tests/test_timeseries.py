@@ -0,0 +1,170 @@
+"""Tests for the durable time-series store and its writer thread."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from tesla_smart_charger import constants, energy_bus, timeseries
+from tesla_smart_charger.controllers import db_controller, sqlite_pool
+from tesla_smart_charger.timeseries import TimeSeriesStore
+
+
+@pytest.fixture(autouse=True)
+def _clear_state() -> Iterator[None]:
+    """Keep the process-wide bus, setpoints and pools from leaking between tests."""
+    energy_bus.bus.reset()
+    timeseries._pending_setpoints.clear()
+    yield
+    sqlite_pool.close_all()
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[TimeSeriesStore]:
+    """Return an open store on a temporary file."""
+    ts_store = TimeSeriesStore(str(tmp_path / "ts.db"))
+    ts_store.open()
+    yield ts_store
+    ts_store.close()
+
+
+def _rows(db_path: str, sql: str) -> list[tuple]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_store_uses_wal(store: TimeSeriesStore) -> None:
+    """The store switches the database into write-ahead logging."""
+    with store.pool.reader() as conn:
+        (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
+
+
+def test_store_shares_the_history_writer(store: TimeSeriesStore) -> None:
+    """History opened after the store still migrates, on the same single writer."""
+    ctrl = db_controller.create_database_controller(
+        "sqlite", constants.DB_NAME, store.file_path
+    )
+    ctrl.initialize_db()
+
+    assert ctrl.pool is store.pool
+    ctrl.insert_data(
+        {"start": "2024-01-01 10:00:00", "end": None, "duration": 0, "vehicle_id": ""}
+    )
+    store.write([("energy.watts", 1.0, 100.0)])
+    assert _rows(store.file_path, "SELECT COUNT(*) FROM overloads") == [(1,)]
+
+
+def test_rollup_builds_minute_and_quarter_hour_buckets(
+    store: TimeSeriesStore,
+) -> None:
+    """Raw points fold into 1 min buckets, which fold into 15 min buckets."""
+    now = time.time()
+    base = (int(now) // 900) * 900 - 900  # start of the previous quarter hour
+    store.write(
+        [
+            ("energy.watts", base + 5, 100.0),
+            ("energy.watts", base + 30, 300.0),
+            ("energy.watts", base + 70, 800.0),
+            ("setpoint.v1", base + 10, 16.0),
+        ]
+    )
+
+    store.rollup(now)
+    store.rollup(now)  # idempotent
+
+    assert _rows(
+        store.file_path,
+        "SELECT bucket, count, min_value, max_value, sum_value FROM ts_1m "
+        "WHERE series = 'energy.watts' ORDER BY bucket",
+    ) == [(base, 2, 100.0, 300.0, 400.0), (base + 60, 1, 800.0, 800.0, 800.0)]
+    assert _rows(
+        store.file_path,
+        "SELECT series, bucket, count, min_value, max_value, sum_value "
+        "FROM ts_15m ORDER BY series",
+    ) == [
+        ("energy.watts", base, 3, 100.0, 800.0, 1200.0),
+        ("setpoint.v1", base, 1, 16.0, 16.0, 16.0),
+    ]
+
+
+def test_rollup_prunes_past_retention(store: TimeSeriesStore) -> None:
+    """Raw points past their retention are dropped once rolled up."""
+    now = time.time()
+    old = now - constants.TIMESERIES_RAW_RETENTION_SECS - 3600
+    store.write([("energy.watts", old, 100.0), ("energy.watts", now, 200.0)])
+
+    store.rollup(now)
+
+    assert _rows(store.file_path, "SELECT value FROM ts_raw") == [(200.0,)]
+    minute = store.query("energy.watts", since=now - 10 * 24 * 3600)
+    assert [p["mean"] for p in minute] == [100.0, 200.0]
+
+
+def test_rollup_watermark_and_pruning_use_bucket_indexes(
+    store: TimeSeriesStore,
+) -> None:
+    """The per-minute rollup never scans the rollup tables whole."""
+    for table in ("ts_1m", "ts_15m"):
+        with store.pool.reader() as conn:
+            plans = [
+                conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()[0][3]
+                for sql in (
+                    f"SELECT MAX(bucket) FROM {table}",  # noqa: S608
+                    f"DELETE FROM {table} WHERE bucket < 0",  # noqa: S608
+                )
+            ]
+        assert all(f"idx_{table}_bucket" in plan for plan in plans)
+
+
+def test_query_reads_raw_points(store: TimeSeriesStore) -> None:
+    """Recent windows are answered from the raw table."""
+    now = time.time()
+    store.write([("setpoint.v1", now - 30, 12.0), ("setpoint.v1", now - 10, 10.0)])
+
+    points = store.query("setpoint.v1", since=now - 60)
+
+    assert [(p["count"], p["mean"]) for p in points] == [(1, 12.0), (1, 10.0)]
+
+
+def test_writer_batches_bus_samples_and_setpoints(tmp_path: Path) -> None:
+    """The writer persists bus readings with their emeters, and setpoints."""
+    db_path = str(tmp_path / "ts.db")
+    energy_bus.bus.publish(1500.0, energy_bus.SOURCE_PUSH, (1000.0, 500.0))
+    timeseries.record_setpoint("v1", 16)
+    stop = threading.Event()
+    stop.set()  # one flush, then exit
+
+    timeseries.start_writer(stop, db_path)
+
+    assert _rows(db_path, "SELECT series, value FROM ts_raw ORDER BY series") == [
+        ("energy.emeter0", 1000.0),
+        ("energy.emeter1", 500.0),
+        ("energy.watts", 1500.0),
+        ("setpoint.v1", 16.0),
+    ]
+    assert not timeseries._pending_setpoints
+
+
+def test_setpoints_and_rollups_follow_the_injected_clock(tmp_path: Path) -> None:
+    """Under a virtual clock, setpoints line up with the bus's readings."""
+
+    class _Clock:
+        def time(self) -> float:
+            return 1_000_000.0
+
+        def sleep(self, secs: float) -> None:
+            pass
+
+    db_path = str(tmp_path / "ts.db")
+    timeseries.record_setpoint("v1", 16, _Clock())
+    stop = threading.Event()
+    stop.set()
+
+    timeseries.start_writer(stop, db_path, _Clock())
+
+    assert _rows(db_path, "SELECT ts FROM ts_raw") == [(1_000_000.0,)]
+    assert _rows(db_path, "SELECT bucket FROM ts_1m") == [(999_960,)]